@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import os
 import warnings
+import weakref
+from typing import Callable
 
 import flet as ft
 
@@ -16,10 +18,10 @@ from screens.eras.eras_view import eras_view
 from screens.incursion_detail.incursion_detail_view import incursion_detail_view
 from screens.incursions.incursions_view import incursions_view
 from screens.periods.periods_view import periods_view
-from services.firestore_service import FirestoreService
-from services.service_registry import set_firestore_service
+from services.offline_service import OfflineFirstService, SyncConflict
+from services.service_registry import attach_session_services, get_firestore_service
 from utils.logger import configure_logging, get_logger
-from utils.router import build_route_stack, get_router
+from utils.router import build_route_stack, get_router, resolve_route_target
 
 debug_mode = os.getenv("SPIRITPLANNER_DEBUG") == "1"
 configure_logging(debug=debug_mode)
@@ -69,6 +71,39 @@ def build_view(route: str) -> ft.View:
     return ft.View(route=route, controls=[_with_global_background(control)])
 
 
+def _conflict_message(conflict: SyncConflict) -> str:
+    return (
+        f"No se pudo guardar un cambio en la Era {conflict.era_id}: {conflict.message} "
+        "Se ha recuperado el estado del servidor."
+    )
+
+
+def _watch_sync_conflicts(page: ft.Page) -> Callable[[], None] | None:
+    service = get_firestore_service(page.session)
+    if not isinstance(service, OfflineFirstService):
+        return None
+    # The service is shared by every session: hold the page weakly and only
+    # report conflicts for the era this session is looking at.
+    page_ref = weakref.ref(page)
+
+    def on_conflict(conflict: SyncConflict) -> None:
+        current = page_ref()
+        if current is None:
+            remove()
+            return
+        _, params = resolve_route_target(get_router(current).route)
+        if params.get("era_id") != conflict.era_id:
+            return
+
+        async def show() -> None:
+            current.show_dialog(ft.SnackBar(ft.Text(_conflict_message(conflict))))
+
+        current.run_task(show)
+
+    remove = service.add_conflict_listener(on_conflict)
+    return remove
+
+
 @ft.component
 def App() -> list[ft.View]:
     router, _ = ft.use_state(get_router(ft.context.page))
@@ -76,6 +111,8 @@ def App() -> list[ft.View]:
     page.on_route_change = router.on_route_change
     page.on_view_pop = router.on_view_pop
 
+    ft.use_effect(lambda: _watch_sync_conflicts(page), [])
+
     stack = build_route_stack(router.route)
     return [build_view(route) for route in stack]
 
@@ -86,9 +123,8 @@ async def main(page: ft.Page) -> None:
     page.theme_mode = ft.ThemeMode.LIGHT
     page.scroll = ft.ScrollMode.AUTO
 
-    logger.debug("Initializing FirestoreService")
-    service = FirestoreService()
-    set_firestore_service(page.session, service)
+    logger.debug("Attaching shared services to session")
+    attach_session_services(page.session)
 
     page.render_views(App)
     logger.debug("Exiting main")
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 
 import flet as ft
 
+from services.firestore_records import EraDoc, IncursionDoc
 from services.firestore_service import ActiveIncursion
 
 
@@ -21,12 +22,11 @@ class EraCardModel:
     active_incursion: ActiveIncursion | None
 
 
-def get_era_status(era: dict) -> tuple[str, str]:
-    is_active = bool(era.get("is_active"))
+def get_era_status(era: EraDoc) -> tuple[str, str]:
     return (
         "Activa",
         ft.Colors.GREEN_600,
-    ) if is_active else ("Inactiva", ft.Colors.GREY_500)
+    ) if era.is_active else ("Inactiva", ft.Colors.GREY_500)
 
 
 def get_incursion_status(has_active_incursion: bool) -> tuple[str, str]:
@@ -36,17 +36,14 @@ def get_incursion_status(has_active_incursion: bool) -> tuple[str, str]:
 
 
 def compute_era_score_summary(
-    incursions_by_period: dict[str, list[dict]],
+    incursions_by_period: dict[str, list[IncursionDoc]],
 ) -> tuple[int, int, float | None]:
     score_total = 0
     completed_incursions = 0
     for incursions in incursions_by_period.values():
         for incursion in incursions:
-            score = incursion.get("score")
-            if isinstance(score, bool):
-                continue
-            if isinstance(score, (int, float)):
-                score_total += int(score)
+            if incursion.score is not None:
+                score_total += incursion.score
                 completed_incursions += 1
     score_average = (
         score_total / completed_incursions if completed_incursions else None
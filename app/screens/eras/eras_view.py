@@ -2,13 +2,17 @@ from __future__ import annotations
 
 import asyncio
 import re
+from typing import Callable
 
 import flet as ft
 
 from screens.eras.eras_model import EraCardModel, format_score_average
 from screens.eras.eras_viewmodel import ErasViewModel
+from screens.prefetch import use_route_prefetch
 from screens.shared_components import section_card, status_chip
-from services.service_registry import get_firestore_service
+from services.firestore_service import ActiveIncursion
+from services.service_registry import get_firestore_service, get_snapshot_store
+from utils.lazy_list import lazy_list_view, show_more_row, use_lazy_window
 from utils.logger import get_logger
 from utils.navigation import navigate
 from utils.router import register_route_loader
@@ -87,15 +91,55 @@ def _era_card(
     )
 
 
+@ft.memo
+@ft.component
+def era_card(
+    model: EraCardModel,
+    on_open_periods: Callable[[str], None],
+    on_open_active_incursion: Callable[[ActiveIncursion], None],
+) -> ft.Control:
+    active_incursion = model.active_incursion
+    if active_incursion:
+        action_row = ft.Row(
+            [
+                ft.OutlinedButton(
+                    "Ver períodos",
+                    on_click=lambda _: on_open_periods(model.era_id),
+                ),
+                ft.Button(
+                    "Continuar",
+                    on_click=lambda _: on_open_active_incursion(active_incursion),
+                ),
+            ],
+            alignment=ft.MainAxisAlignment.END,
+            spacing=8,
+            expand=True,
+        )
+    else:
+        action_row = ft.Row(
+            [
+                ft.Button(
+                    "Ver períodos",
+                    on_click=lambda _: on_open_periods(model.era_id),
+                )
+            ],
+            alignment=ft.MainAxisAlignment.END,
+            expand=True,
+        )
+    return _era_card(model, action_row)
+
+
 @ft.component
 def eras_view() -> ft.Control:
     logger.debug("Rendering eras_view")
     page = ft.context.page
     service = get_firestore_service(page.session)
+    snapshots = get_snapshot_store(page.session)
     view_model, _ = ft.use_state(ErasViewModel())
 
     def load() -> None:
-        view_model.ensure_loaded(service)
+        view_model.restore_snapshot(snapshots)
+        page.run_thread(view_model.ensure_loaded, service)
 
     ft.use_effect(load, [])
 
@@ -103,6 +147,7 @@ def eras_view() -> ft.Control:
         register_route_loader(page, "/eras", lambda _: view_model.load_eras(service))
 
     ft.use_effect(register_loader, [])
+    use_route_prefetch(view_model.prefetch_routes())
 
     def show_toast() -> None:
         if not view_model.toast_message:
@@ -134,6 +179,47 @@ def eras_view() -> ft.Control:
 
     ft.use_effect(handle_navigation, [view_model.nav_version])
 
+    def open_periods(era_id: str) -> None:
+        logger.info("UI click open periods era_id=%s", era_id)
+        try:
+            view_model.request_open_periods(era_id)
+        except Exception as exc:
+            logger.exception(
+                "Failed to handle open periods era_id=%s error=%s",
+                era_id,
+                exc,
+            )
+
+    def open_active_incursion(active_incursion: ActiveIncursion) -> None:
+        logger.info(
+            "UI click open active incursion era_id=%s period_id=%s incursion_id=%s",
+            active_incursion.era_id,
+            active_incursion.period_id,
+            active_incursion.incursion_id,
+        )
+        try:
+            view_model.request_open_active_incursion(active_incursion)
+        except Exception as exc:
+            logger.exception(
+                "Failed to handle open active incursion era_id=%s period_id=%s incursion_id=%s error=%s",
+                active_incursion.era_id,
+                active_incursion.period_id,
+                active_incursion.incursion_id,
+                exc,
+            )
+
+    def load_more(_: ft.ControlEvent) -> None:
+        logger.info("UI click load more eras count=%s", len(view_model.eras))
+        view_model.load_more_eras(service)
+
+    on_open_periods = ft.use_callback(open_periods, [])
+    on_open_active_incursion = ft.use_callback(open_active_incursion, [])
+    visible_count, handle_scroll, show_more = use_lazy_window(
+        len(view_model.eras),
+        reset_key=view_model.eras[0].era_id if view_model.eras else None,
+        on_end=lambda: view_model.load_more_eras(service),
+    )
+
     content_controls: list[ft.Control] = []
 
     if view_model.loading:
@@ -141,77 +227,30 @@ def eras_view() -> ft.Control:
     elif not view_model.eras:
         content_controls.append(ft.Text("No hay Eras disponibles."))
     else:
-        for era in view_model.eras:
-            def handle_open_periods(
-                event: ft.ControlEvent,
-                era_id: str = era.era_id,
-            ) -> None:
-                logger.info(
-                    "UI click open periods era_id=%s control=%s",
-                    era_id,
-                    event.control,
-                )
-                try:
-                    view_model.request_open_periods(era_id)
-                except Exception as exc:
-                    logger.exception(
-                        "Failed to handle open periods era_id=%s error=%s",
-                        era_id,
-                        exc,
-                    )
-
-            secondary_action = ft.OutlinedButton(
-                "Ver períodos",
-                on_click=handle_open_periods,
+        content_controls.extend(
+            era_card(
+                era,
+                on_open_periods,
+                on_open_active_incursion,
+                key=era.era_id,
             )
-            primary_action = None
-            if era.active_incursion:
-                def handle_open_active_incursion(
-                    event: ft.ControlEvent,
-                    active_incursion=era.active_incursion,
-                ) -> None:
-                    logger.info(
-                        "UI click open active incursion era_id=%s period_id=%s incursion_id=%s control=%s",
-                        active_incursion.era_id,
-                        active_incursion.period_id,
-                        active_incursion.incursion_id,
-                        event.control,
-                    )
-                    try:
-                        view_model.request_open_active_incursion(active_incursion)
-                    except Exception as exc:
-                        logger.exception(
-                            "Failed to handle open active incursion era_id=%s period_id=%s incursion_id=%s error=%s",
-                            active_incursion.era_id,
-                            active_incursion.period_id,
-                            active_incursion.incursion_id,
-                            exc,
-                        )
-
-                primary_action = ft.Button(
-                    "Continuar",
-                    on_click=handle_open_active_incursion,
-                )
-            if primary_action:
-                action_row = ft.Row(
-                    [secondary_action, primary_action],
-                    alignment=ft.MainAxisAlignment.END,
-                    spacing=8,
-                    expand=True,
-                )
-            else:
-                primary_action = ft.Button(
-                    "Ver períodos",
-                    on_click=handle_open_periods,
-                )
-                action_row = ft.Row(
-                    [primary_action],
-                    alignment=ft.MainAxisAlignment.END,
-                    expand=True,
+            for era in view_model.eras[:visible_count]
+        )
+        if visible_count < len(view_model.eras):
+            content_controls.append(show_more_row("Mostrar más Eras", show_more))
+        elif view_model.loading_more:
+            content_controls.append(
+                ft.Row([ft.ProgressRing()], alignment=ft.MainAxisAlignment.CENTER)
+            )
+        elif view_model.has_more:
+            content_controls.append(
+                ft.Row(
+                    [ft.OutlinedButton("Cargar más Eras", on_click=load_more)],
+                    alignment=ft.MainAxisAlignment.CENTER,
                 )
-            content_controls.append(_era_card(era, action_row))
+            )
 
-    eras_list = ft.ListView(spacing=8, expand=True, controls=content_controls)
+    eras_list = lazy_list_view(content_controls, handle_scroll)
     max_content_width = min(
         960.0,
         max(320.0, float(page.width or 960.0) - 32.0),
@@ -8,77 +8,148 @@ from screens.eras.eras_model import (
     get_era_status,
     get_incursion_status,
 )
+from services.firestore_records import EraDoc, IncursionDoc
 from services.firestore_service import FirestoreService
+from services.snapshot_store import SnapshotStore
 from utils.logger import get_logger
+from utils.observable import BatchedObservable, batched
 
 logger = get_logger(__name__)
 
+ERAS_ROUTE = "/eras"
+ERAS_PAGE_SIZE = 20
+ERA_SUMMARY_PERIOD_FIELDS: tuple[str, ...] = ()
+ERA_SUMMARY_INCURSION_FIELDS = ("index", "score", "ended_at")
+
 
 @ft.observable
-class ErasViewModel:
+class ErasViewModel(BatchedObservable):
     def __init__(self) -> None:
         self.eras: list[EraCardModel] = []
         self.loading = False
+        self.loading_more = False
+        self.has_more = False
         self.error: str | None = None
         self.toast_message: str | None = None
         self.toast_version = 0
         self.navigate_to: str | None = None
         self.nav_version = 0
+        self.snapshots: SnapshotStore | None = None
+
+    @batched
+    def restore_snapshot(self, snapshots: SnapshotStore | None) -> None:
+        self.snapshots = snapshots
+        cached = snapshots.get(ERAS_ROUTE) if snapshots else None
+        if cached and not self.eras:
+            self.eras, self.has_more = cached
+        self.loading = not self.eras
 
     def ensure_loaded(self, service: FirestoreService) -> None:
         self.load_eras(service)
 
+    def _save_snapshot(self) -> None:
+        if self.snapshots is not None:
+            self.snapshots.put(ERAS_ROUTE, (list(self.eras), self.has_more))
+
+    def _build_card(
+        self, service: FirestoreService, era: EraDoc, index: int
+    ) -> EraCardModel:
+        era_id = era.id
+        active_incursion = service.active_incursion_from_era(era)
+        periods = service.list_periods(era_id, fields=ERA_SUMMARY_PERIOD_FIELDS)
+        incursions_by_period: dict[str, list[IncursionDoc]] = {}
+        for period in periods:
+            period_id = period.id
+            incursions_by_period[period_id] = service.list_incursions(
+                era_id, period_id, fields=ERA_SUMMARY_INCURSION_FIELDS
+            )
+        score_total, completed_incursions, score_average = compute_era_score_summary(
+            incursions_by_period
+        )
+        status_label, status_color = get_era_status(era)
+        incursion_label, incursion_color = get_incursion_status(
+            active_incursion is not None
+        )
+        return EraCardModel(
+            era_id=era_id,
+            index=index,
+            status_label=status_label,
+            status_color=status_color,
+            incursion_label=incursion_label,
+            incursion_color=incursion_color,
+            score_total=score_total,
+            completed_incursions=completed_incursions,
+            score_average=score_average,
+            active_incursion=active_incursion,
+        )
+
+    def _load_page(
+        self, service: FirestoreService, start_after: str | None
+    ) -> list[EraCardModel]:
+        eras = service.list_eras(limit=ERAS_PAGE_SIZE, start_after=start_after)
+        self.has_more = len(eras) == ERAS_PAGE_SIZE
+        offset = len(self.eras) if start_after else 0
+        return [
+            self._build_card(service, era, offset + idx)
+            for idx, era in enumerate(eras, start=1)
+        ]
+
+    @batched
     def load_eras(self, service: FirestoreService) -> None:
         logger.info("Firestore list eras")
-        self.loading = True
+        self.loading = not self.eras
         self.error = None
         try:
-            eras = service.list_eras()
-            cards: list[EraCardModel] = []
-            for idx, era in enumerate(eras, start=1):
-                era_id = era["id"]
-                active_incursion = service.get_active_incursion(era_id)
-                periods = service.list_periods(era_id)
-                incursions_by_period: dict[str, list[dict]] = {}
-                for period in periods:
-                    period_id = period["id"]
-                    incursions_by_period[period_id] = service.list_incursions(
-                        era_id, period_id
-                    )
-                score_total, completed_incursions, score_average = (
-                    compute_era_score_summary(incursions_by_period)
-                )
-                status_label, status_color = get_era_status(era)
-                incursion_label, incursion_color = get_incursion_status(
-                    active_incursion is not None
-                )
-                cards.append(
-                    EraCardModel(
-                        era_id=era_id,
-                        index=idx,
-                        status_label=status_label,
-                        status_color=status_color,
-                        incursion_label=incursion_label,
-                        incursion_color=incursion_color,
-                        score_total=score_total,
-                        completed_incursions=completed_incursions,
-                        score_average=score_average,
-                        active_incursion=active_incursion,
-                    )
-                )
-            self.eras = cards
+            cards = self._load_page(service, None)
+            if cards != self.eras:
+                self.eras = cards
+            self._save_snapshot()
         except Exception as exc:
             logger.error("Failed to load eras error=%s", exc, exc_info=True)
-            self.error = "load_failed"
-            self.eras = []
+            if self.eras:
+                self.show_toast("No se pudieron actualizar las Eras.")
+            else:
+                self.error = "load_failed"
+                self.has_more = False
         finally:
             self.loading = False
 
+    @batched
+    def load_more_eras(self, service: FirestoreService) -> None:
+        if self.loading_more or not self.has_more or not self.eras:
+            return
+        logger.info("Firestore list more eras after=%s", self.eras[-1].era_id)
+        self.loading_more = True
+        try:
+            self.eras = self.eras + self._load_page(service, self.eras[-1].era_id)
+            self._save_snapshot()
+        except Exception as exc:
+            logger.error("Failed to load more eras error=%s", exc, exc_info=True)
+            self.show_toast("No se pudieron cargar más Eras.")
+        finally:
+            self.loading_more = False
+
+    def prefetch_routes(self) -> list[str]:
+        active = next(
+            (card.active_incursion for card in self.eras if card.active_incursion),
+            None,
+        )
+        if active is None:
+            return []
+        period_route = f"/eras/{active.era_id}/periods/{active.period_id}"
+        return [
+            f"{period_route}/incursions/{active.incursion_id}",
+            period_route,
+            f"/eras/{active.era_id}",
+        ]
+
+    @batched
     def request_open_periods(self, era_id: str) -> None:
         logger.info("UI open periods era_id=%s", era_id)
         self.navigate_to = f"/eras/{era_id}"
         self.nav_version += 1
 
+    @batched
     def request_open_active_incursion(self, active_incursion) -> None:
         logger.info(
             "UI open active incursion era_id=%s period_id=%s incursion_id=%s",
@@ -92,6 +163,7 @@ class ErasViewModel:
         )
         self.nav_version += 1
 
+    @batched
     def show_toast(self, message: str) -> None:
         logger.info("User message shown: %s", message)
         self.toast_message = message
@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
+from services.firestore_records import IncursionDoc, PeriodDoc
+
 
 SESSION_STATE_NOT_STARTED = "NOT_STARTED"
 SESSION_STATE_IN_SESSION = "IN_SESSION"
@@ -42,6 +44,16 @@ class SessionEntryModel:
     ended_at: datetime | None
 
 
+@dataclass(frozen=True)
+class PendingLevelChange:
+    era_id: str
+    period_id: str
+    incursion_id: str
+    adversary_id: str
+    adversary_level: str | None
+    difficulty: int | None
+
+
 @dataclass
 class FinalizeFormData:
     result: str | None
@@ -52,23 +64,23 @@ class FinalizeFormData:
 
 
 def resolve_session_state(
-    incursion: dict, has_sessions: bool, open_session: bool
+    incursion: IncursionDoc, has_sessions: bool, open_session: bool
 ) -> str:
-    if incursion.get("ended_at") or incursion.get("result"):
+    if incursion.is_finished:
         return SESSION_STATE_FINALIZED
     if has_sessions:
         return SESSION_STATE_IN_SESSION if open_session else SESSION_STATE_BETWEEN_SESSIONS
     return SESSION_STATE_NOT_STARTED
 
 
-def can_edit_adversary_level(incursion: dict, has_sessions: bool) -> bool:
-    return not incursion.get("ended_at") and not has_sessions
+def can_edit_adversary_level(incursion: IncursionDoc, has_sessions: bool) -> bool:
+    return incursion.ended_at is None and not has_sessions
 
 
-def build_period_label(period: dict | None) -> str:
-    if not period:
+def build_period_label(period: PeriodDoc | None) -> str:
+    if period is None:
         return "Periodo —"
-    return f"Periodo {period.get('index', '—')}"
+    return f"Periodo {period.index}"
 
 
 def get_result_label(result_value: str | None) -> str:
@@ -1,11 +1,7 @@
 from __future__ import annotations
 
 import asyncio
-import json
-import math
-import struct
 from datetime import datetime, timezone
-from pathlib import Path
 
 import flet as ft
 
@@ -17,22 +13,21 @@ from screens.incursion_detail.incursion_detail_model import (
     get_result_label,
 )
 from screens.incursion_detail.incursion_detail_viewmodel import (
+    LEVEL_FLUSH_DELAY_SECONDS,
     IncursionDetailViewModel,
 )
-from services.service_registry import get_firestore_service
+from screens.layout_geometry import BoardPlacement, compute_layout_placement
+from screens.shared_components import board_frame
+from services.service_registry import get_firestore_service, get_snapshot_store
 from utils.datetime_format import format_datetime_local
 from utils.logger import get_logger
+from utils.resize_broker import ViewportSize, quantize, use_viewport_bucket
 from utils.router import register_route_loader
 
 logger = get_logger(__name__)
 
 
-ASSETS_DIR = Path(__file__).resolve().parents[2] / "assets"
-LAYOUTS_DIR = ASSETS_DIR / "layouts"
-CALIBRATION_PATH = LAYOUTS_DIR / "calibration.json"
-BOARDS_DIR = ASSETS_DIR / "boards"
 DEFAULT_BOARD_HEIGHT_PCT = 0.80
-CENTER_ALIGN = ft.Alignment(0, 0)
 PREVIEW_TEXT_COLOR = ft.Colors.BLUE_GREY_100
 PREVIEW_BG_COLOR = ft.Colors.BLUE_GREY_700
 CONTENT_SECTION_PADDING = 16.0
@@ -43,68 +38,10 @@ LAYOUT_PLACEHOLDER_MAX_WIDTH = 960.0
 LAYOUT_PLACEHOLDER_RATIO = LAYOUT_PLACEHOLDER_HEIGHT / LAYOUT_PLACEHOLDER_WIDTH
 LAYOUT_PREVIEW_PADDING = 6.0
 LAYOUT_PREVIEW_INNER_PADDING = 10.0
+LAYOUT_PREVIEW_WIDTH_STEP = 8.0
 RESULT_FIELD_HEIGHT = 52.0
 DEBUG_LAYOUT_PREVIEW = False
 
-_CALIBRATION_CACHE: dict[str, dict[str, dict[str, float]]] | None = None
-_BOARD_ASPECT_CACHE: dict[str, float] = {}
-
-
-def _safe_float(value: object, default: float) -> float:
-    try:
-        return float(value)
-    except (TypeError, ValueError):
-        return default
-
-
-def _read_png_size(path: Path) -> tuple[int, int]:
-    if not path.exists():
-        return (1, 1)
-
-    with path.open("rb") as file:
-        header = file.read(24)
-
-    png_sig = b"\x89PNG\r\n\x1a\n"
-    if len(header) < 24 or header[:8] != png_sig:
-        return (1, 1)
-
-    width, height = struct.unpack(">II", header[16:24])
-    if width <= 0 or height <= 0:
-        return (1, 1)
-    return width, height
-
-
-def _load_layout_calibration() -> dict[str, dict[str, dict[str, float]]]:
-    global _CALIBRATION_CACHE
-    if _CALIBRATION_CACHE is not None:
-        return _CALIBRATION_CACHE
-
-    try:
-        data = json.loads(CALIBRATION_PATH.read_text(encoding="utf-8"))
-    except (FileNotFoundError, json.JSONDecodeError):
-        _CALIBRATION_CACHE = {}
-        return _CALIBRATION_CACHE
-
-    layouts = data.get("layouts")
-    if not isinstance(layouts, dict):
-        layouts = {}
-    _CALIBRATION_CACHE = layouts
-    return layouts
-
-
-def _get_board_aspect(board_id: str) -> float | None:
-    if board_id in _BOARD_ASPECT_CACHE:
-        return _BOARD_ASPECT_CACHE[board_id]
-
-    board_path = BOARDS_DIR / f"{board_id}.png"
-    if not board_path.exists():
-        return None
-
-    width, height = _read_png_size(board_path)
-    aspect = width / height if height else 1.0
-    _BOARD_ASPECT_CACHE[board_id] = aspect
-    return aspect
-
 
 def _compute_layout_preview_size(
     page_width: float,
@@ -118,77 +55,15 @@ def _compute_layout_preview_size(
     return preview_width, preview_height
 
 
-def _apply_board_layout(
-    board_frame: ft.Container,
-    board_aspect: float,
-    slot_data: dict[str, object],
-    preview_width: float,
-    preview_height: float,
-) -> None:
-    transform = {
-        "dx": _safe_float(slot_data.get("dx"), 0.0),
-        "dy": _safe_float(slot_data.get("dy"), 0.0),
-        "rot_deg": _safe_float(slot_data.get("rot_deg"), 0.0),
-    }
-
-    board_base_height_px = preview_height * DEFAULT_BOARD_HEIGHT_PCT
-    translate_x_px = transform["dx"] * board_base_height_px
-    translate_y_px = transform["dy"] * board_base_height_px
-    board_height_px = board_base_height_px
-    board_width_px = board_height_px * board_aspect
-
-    center_x = (preview_width / 2) + translate_x_px
-    center_y = (preview_height / 2) + translate_y_px
-
-    board_frame.width = board_width_px
-    board_frame.height = board_height_px
-    board_frame.left = center_x - (board_width_px / 2)
-    board_frame.top = center_y - (board_height_px / 2)
+def _layout_preview_bucket(size: ViewportSize) -> tuple[float, float]:
+    preview_width, _ = _compute_layout_preview_size(size.width)
+    preview_width = quantize(preview_width, LAYOUT_PREVIEW_WIDTH_STEP)
+    return preview_width, preview_width * LAYOUT_PLACEHOLDER_RATIO
 
 
 @ft.component
 def layout_preview(detail: IncursionDetailModel) -> ft.Control:
-    page = ft.context.page
-    page_width, set_page_width = ft.use_state(
-        float(page.width or getattr(getattr(page, "window", None), "width", 0) or 900.0)
-    )
-
-    preview_width, preview_height = _compute_layout_preview_size(page_width)
-
-    def register_resize_handler():
-        previous_handler = page.on_resize
-
-        def on_resize(event: ft.ControlEvent) -> None:
-            if previous_handler and previous_handler is not on_resize:
-                try:
-                    previous_handler(event)
-                except Exception:
-                    logger.exception("Previous page.on_resize handler failed")
-
-            updated_width = float(
-                getattr(event, "width", None)
-                or page.width
-                or getattr(getattr(page, "window", None), "width", 0)
-                or 900.0
-            )
-            set_page_width(updated_width)
-
-        page.on_resize = on_resize
-        set_page_width(
-            float(
-                page.width
-                or getattr(getattr(page, "window", None), "width", 0)
-                or 900.0
-            )
-        )
-
-        def cleanup() -> None:
-            if page.on_resize == on_resize:
-                page.on_resize = previous_handler
-
-        return cleanup
-
-    ft.use_effect(register_resize_handler, [])
+    preview_width, preview_height = use_viewport_bucket(_layout_preview_bucket)
 
     inner_preview_width = max(
         0.0,
@@ -234,79 +109,38 @@ def layout_preview(detail: IncursionDetailModel) -> ft.Control:
         )
 
     try:
-        if not detail.layout_id or not detail.board_1_id or not detail.board_2_id:
-            return build_fallback("Preview no disponible")
-
-        calibration = _load_layout_calibration()
-        layout_data = calibration.get(detail.layout_id)
-        if not isinstance(layout_data, dict):
-            return build_fallback("Preview no disponible")
-
-        left_slot = layout_data.get("left")
-        right_slot = layout_data.get("right")
-        if not isinstance(left_slot, dict) or not isinstance(right_slot, dict):
-            return build_fallback("Preview no disponible")
-
-        left_aspect = _get_board_aspect(detail.board_1_id)
-        right_aspect = _get_board_aspect(detail.board_2_id)
-        if left_aspect is None or right_aspect is None:
+        placement = compute_layout_placement(
+            detail.layout_id,
+            (detail.board_1_id, detail.board_2_id),
+            inner_preview_width,
+            inner_preview_height,
+            DEFAULT_BOARD_HEIGHT_PCT,
+        )
+        if placement is None:
             return build_fallback("Preview no disponible")
 
-        def build_board_control(
-            board_id: str,
-            board_aspect: float,
-            slot_data: dict[str, object],
-        ) -> ft.Container:
-            transform = {
-                "dx": _safe_float(slot_data.get("dx"), 0.0),
-                "dy": _safe_float(slot_data.get("dy"), 0.0),
-                "rot_deg": _safe_float(slot_data.get("rot_deg"), 0.0),
-            }
-
-            board_image = ft.Image(
-                src=f"boards/{board_id}.png",
-                fit=ft.BoxFit.CONTAIN,
-                expand=True,
-            )
-            board_image_container = ft.Container(
-                content=board_image,
-                alignment=ft.Alignment.CENTER,
-                expand=True,
-                border=(
+        def build_board_control(board_placement: BoardPlacement) -> ft.Container:
+            return board_frame(
+                board_placement,
+                image_border=(
                     ft.Border.all(1, ft.Colors.YELLOW_400)
                     if DEBUG_LAYOUT_PREVIEW
                     else None
                 ),
-            )
-            board_frame = ft.Container(
-                content=board_image_container,
-                alignment=ft.Alignment.CENTER,
-                border=(
+                frame_border=(
                     ft.Border.all(1, ft.Colors.GREEN_400)
                     if DEBUG_LAYOUT_PREVIEW
                     else None
                 ),
-                rotate=ft.Rotate(
-                    angle=math.radians(transform["rot_deg"]),
-                    alignment=CENTER_ALIGN,
-                ),
-            )
-            _apply_board_layout(
-                board_frame,
-                board_aspect,
-                slot_data,
-                inner_preview_width,
-                inner_preview_height,
             )
-            return board_frame
 
         return build_preview_frame(
             ft.Stack(
                 width=inner_preview_width,
                 height=inner_preview_height,
                 controls=[
-                    build_board_control(detail.board_1_id, left_aspect, left_slot),
-                    build_board_control(detail.board_2_id, right_aspect, right_slot),
+                    build_board_control(placement.left),
+                    build_board_control(placement.right),
                 ],
             )
         )
@@ -380,11 +214,16 @@ def incursion_detail_view(
     )
     page = ft.context.page
     service = get_firestore_service(page.session)
+    snapshots = get_snapshot_store(page.session)
     view_model, _ = ft.use_state(IncursionDetailViewModel())
     dialog_ref = ft.use_ref(None)
 
-    def load() -> None:
-        view_model.ensure_loaded(service, era_id, period_id, incursion_id)
+    def load():
+        view_model.restore_snapshot(snapshots, era_id, period_id, incursion_id)
+        page.run_thread(
+            view_model.ensure_loaded, service, era_id, period_id, incursion_id
+        )
+        return lambda: view_model.flush_adversary_level(service)
 
     ft.use_effect(load, [era_id, period_id, incursion_id])
 
@@ -408,6 +247,16 @@ def incursion_detail_view(
 
     ft.use_effect(register_loader, [era_id, period_id, incursion_id])
 
+    def select_level(level: str | None) -> None:
+        view_model.update_adversary_level(level)
+        version = view_model.level_version
+
+        async def flush_when_idle() -> None:
+            await asyncio.sleep(LEVEL_FLUSH_DELAY_SECONDS)
+            view_model.flush_adversary_level(service, version, page.run_thread)
+
+        page.run_task(flush_when_idle)
+
     def show_toast() -> None:
         if not view_model.toast_message:
             return
@@ -533,9 +382,7 @@ def incursion_detail_view(
                             disabled=not bool(level_options),
                             width=220,
                             value=view_model.adversary_level,
-                            on_select=lambda event: view_model.update_adversary_level(
-                                service, event.control.value
-                            ),
+                            on_select=lambda event: select_level(event.control.value),
                         ),
                         ft.Text(
                             (
@@ -658,7 +505,9 @@ def incursion_detail_view(
                 ft.Button(
                     "Confirmar",
                     icon=ft.Icons.CHECK,
-                    on_click=lambda _: view_model.finalize_incursion(service),
+                    on_click=lambda _: view_model.finalize_incursion(
+                        service, page.run_thread
+                    ),
                     bgcolor=ft.Colors.GREEN_600,
                     color=ft.Colors.WHITE,
                 ),
@@ -881,7 +730,9 @@ def incursion_detail_view(
                 ),
                 height=52,
                 width=320,
-                on_click=lambda _: view_model.handle_session_action(service),
+                on_click=lambda _: view_model.handle_session_action(
+                    service, page.run_thread
+                ),
                 style=ft.ButtonStyle(
                     bgcolor=ft.Colors.BLUE_700,
                     color=ft.Colors.WHITE,
@@ -902,11 +753,7 @@ def incursion_detail_view(
                 width=sessions_table_width,
             )
         else:
-            for session in sorted(
-                view_model.sessions,
-                key=lambda s: s.ended_at or s.started_at or datetime.min,
-                reverse=True,
-            ):
+            for session in reversed(view_model.sessions):
                 started_at = session.started_at
                 ended_at = session.ended_at
                 duration_seconds = (
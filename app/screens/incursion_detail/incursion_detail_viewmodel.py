@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import replace
 from datetime import datetime, timezone
+from typing import Callable
 
 import flet as ft
 
@@ -16,21 +17,39 @@ from screens.data_lookup import (
 from screens.incursion_detail.incursion_detail_model import (
     FinalizeFormData,
     IncursionDetailModel,
+    PendingLevelChange,
     SessionEntryModel,
+    SESSION_STATE_BETWEEN_SESSIONS,
     SESSION_STATE_FINALIZED,
+    SESSION_STATE_IN_SESSION,
     SESSION_STATE_NOT_STARTED,
     build_period_label,
     compute_score_preview,
     resolve_session_state,
 )
 from services.firestore_service import FirestoreService
+from services.score_service import calculate_score
+from services.snapshot_store import SnapshotStore
 from utils.logger import get_logger
+from utils.observable import BatchedObservable, batched
 
 logger = get_logger(__name__)
 
+DETAIL_PERIOD_FIELDS = ("index",)
+DETAIL_SESSION_FIELDS = ("started_at", "ended_at")
+PLAYER_COUNT = 2
+LEVEL_FLUSH_DELAY_SECONDS = 1.5
+
+Dispatch = Callable[[Callable[[], None]], None]
+DetailBundle = tuple[IncursionDetailModel, list[SessionEntryModel], str]
+
+
+def _run_inline(write: Callable[[], None]) -> None:
+    write()
+
 
 @ft.observable
-class IncursionDetailViewModel:
+class IncursionDetailViewModel(BatchedObservable):
     def __init__(self) -> None:
         self.era_id: str | None = None
         self.period_id: str | None = None
@@ -57,7 +76,43 @@ class IncursionDetailViewModel:
         self.score_dialog_version = 0
         self.timer_running = False
         self.timer_now: datetime | None = None
+        self.snapshots: SnapshotStore | None = None
+        self.saving = False
+        self.pending_level: PendingLevelChange | None = None
+        self.level_version = 0
+
+    @property
+    def route(self) -> str:
+        return (
+            f"/eras/{self.era_id}/periods/{self.period_id}"
+            f"/incursions/{self.incursion_id}"
+        )
+
+    @batched
+    def restore_snapshot(
+        self,
+        snapshots: SnapshotStore | None,
+        era_id: str,
+        period_id: str,
+        incursion_id: str,
+    ) -> None:
+        self.snapshots = snapshots
+        if (self.era_id, self.period_id, self.incursion_id) != (
+            era_id,
+            period_id,
+            incursion_id,
+        ):
+            self.era_id = era_id
+            self.period_id = period_id
+            self.incursion_id = incursion_id
+            self.detail = None
+            self.sessions = []
+            cached = snapshots.get(self.route) if snapshots else None
+            if cached:
+                self._apply_bundle(*cached)
+        self.loading = self.detail is None
 
+    @batched
     def ensure_loaded(
         self,
         service: FirestoreService,
@@ -68,8 +123,10 @@ class IncursionDetailViewModel:
         self.era_id = era_id
         self.period_id = period_id
         self.incursion_id = incursion_id
+        service.open_era(era_id)
         self.load_detail(service)
 
+    @batched
     def load_detail(self, service: FirestoreService) -> None:
         if not self.era_id or not self.period_id or not self.incursion_id:
             return
@@ -79,12 +136,12 @@ class IncursionDetailViewModel:
             self.period_id,
             self.incursion_id,
         )
-        self.loading = True
+        self.loading = self.detail is None
         self.error = None
         try:
             incursions = service.list_incursions(self.era_id, self.period_id)
             incursion = next(
-                (item for item in incursions if item["id"] == self.incursion_id), None
+                (item for item in incursions if item.id == self.incursion_id), None
             )
             if not incursion:
                 logger.warning(
@@ -97,79 +154,110 @@ class IncursionDetailViewModel:
             period = next(
                 (
                     item
-                    for item in service.list_periods(self.era_id)
-                    if item["id"] == self.period_id
+                    for item in service.list_periods(
+                        self.era_id, fields=DETAIL_PERIOD_FIELDS
+                    )
+                    if item.id == self.period_id
                 ),
                 None,
             )
-            sessions = service.list_sessions(
-                self.era_id, self.period_id, self.incursion_id
-            )
-            self.sessions = [
+            sessions = [
                 SessionEntryModel(
-                    started_at=session.get("started_at"),
-                    ended_at=session.get("ended_at"),
+                    started_at=session.started_at,
+                    ended_at=session.ended_at,
+                )
+                for session in service.iter_sessions(
+                    self.era_id,
+                    self.period_id,
+                    self.incursion_id,
+                    fields=DETAIL_SESSION_FIELDS,
                 )
-                for session in sessions
             ]
-            self.open_session = any(session.ended_at is None for session in self.sessions)
-            self.has_sessions = bool(self.sessions)
-            self.session_state = resolve_session_state(
-                incursion, self.has_sessions, self.open_session
+            session_state = resolve_session_state(
+                incursion,
+                bool(sessions),
+                any(session.ended_at is None for session in sessions),
             )
 
             detail = IncursionDetailModel(
-                incursion_id=incursion["id"],
-                index=incursion.get("index", 0),
-                spirit_1_name=get_spirit_name(incursion.get("spirit_1_id")),
-                spirit_2_name=get_spirit_name(incursion.get("spirit_2_id")),
-                layout_id=incursion.get("board_layout") or "",
-                board_1_name=get_board_name(incursion.get("board_1")),
-                board_2_name=get_board_name(incursion.get("board_2")),
-                layout_name=get_layout_name(incursion.get("board_layout")),
-                board_1_id=incursion.get("board_1") or "",
-                board_2_id=incursion.get("board_2") or "",
-                adversary_id=incursion.get("adversary_id"),
-                adversary_name=get_adversary_name(incursion.get("adversary_id")),
-                adversary_level=incursion.get("adversary_level"),
-                difficulty=incursion.get("difficulty"),
+                incursion_id=incursion.id,
+                index=incursion.index,
+                spirit_1_name=get_spirit_name(incursion.spirit_1_id),
+                spirit_2_name=get_spirit_name(incursion.spirit_2_id),
+                layout_id=incursion.board_layout or "",
+                board_1_name=get_board_name(incursion.board_1),
+                board_2_name=get_board_name(incursion.board_2),
+                layout_name=get_layout_name(incursion.board_layout),
+                board_1_id=incursion.board_1 or "",
+                board_2_id=incursion.board_2 or "",
+                adversary_id=incursion.adversary_id,
+                adversary_name=get_adversary_name(incursion.adversary_id),
+                adversary_level=incursion.adversary_level,
+                difficulty=incursion.difficulty,
                 period_label=build_period_label(period),
-                result=incursion.get("result"),
-                score=incursion.get("score"),
-                dahan_alive=incursion.get("dahan_alive"),
-                blight_on_island=incursion.get("blight_on_island"),
-                player_count=incursion.get("player_count"),
-                invader_cards_remaining=incursion.get("invader_cards_remaining"),
-                invader_cards_out_of_deck=incursion.get("invader_cards_out_of_deck"),
-            )
-            self.detail = detail
-            self.adversary_level = detail.adversary_level
-            self.finalize_form = FinalizeFormData(
-                result=detail.result,
-                dahan_alive=str(detail.dahan_alive or ""),
-                blight_on_island=str(detail.blight_on_island or ""),
-                invader_cards_remaining=str(detail.invader_cards_remaining or ""),
-                invader_cards_out_of_deck=str(detail.invader_cards_out_of_deck or ""),
-            )
-            self.show_finalize_confirm = False
-            self.timer_running = (
-                self.open_session and self.session_state != SESSION_STATE_FINALIZED
+                result=incursion.result,
+                score=incursion.score,
+                dahan_alive=incursion.dahan_alive,
+                blight_on_island=incursion.blight_on_island,
+                player_count=incursion.player_count,
+                invader_cards_remaining=incursion.invader_cards_remaining,
+                invader_cards_out_of_deck=incursion.invader_cards_out_of_deck,
             )
-            self.timer_now = datetime.now(timezone.utc) if self.timer_running else None
+            pending = self._pending_level_for(incursion.id)
+            if pending is not None:
+                detail = replace(
+                    detail,
+                    adversary_level=pending.adversary_level,
+                    difficulty=pending.difficulty,
+                )
+            if (detail, sessions, session_state) != (
+                self.detail,
+                self.sessions,
+                self.session_state,
+            ):
+                self._apply_bundle(detail, list(sessions), session_state)
+            if self.snapshots is not None:
+                self.snapshots.put(self.route, (detail, sessions, session_state))
         except Exception as exc:
             logger.error(
                 "Failed to load incursion detail error=%s", exc, exc_info=True
             )
-            self.error = "load_failed"
-            self.detail = None
-            self.sessions = []
+            if self.detail is not None:
+                self.show_toast("No se pudo actualizar la incursión.")
+            else:
+                self.error = "load_failed"
+                self.sessions = []
         finally:
             self.loading = False
 
-    def update_adversary_level(
-        self, service: FirestoreService, level: str | None
+    def _apply_bundle(
+        self,
+        detail: IncursionDetailModel,
+        sessions: list[SessionEntryModel],
+        session_state: str,
     ) -> None:
-        if not self.detail:
+        self.detail = detail
+        self.sessions = sessions
+        self.open_session = any(session.ended_at is None for session in sessions)
+        self.has_sessions = bool(sessions)
+        self.session_state = session_state
+        self.adversary_level = detail.adversary_level
+        self.finalize_form = FinalizeFormData(
+            result=detail.result,
+            dahan_alive=str(detail.dahan_alive or ""),
+            blight_on_island=str(detail.blight_on_island or ""),
+            invader_cards_remaining=str(detail.invader_cards_remaining or ""),
+            invader_cards_out_of_deck=str(detail.invader_cards_out_of_deck or ""),
+        )
+        self.show_finalize_confirm = False
+        self.timer_running = (
+            self.open_session and self.session_state != SESSION_STATE_FINALIZED
+        )
+        self.timer_now = datetime.now(timezone.utc) if self.timer_running else None
+
+    @batched
+    def update_adversary_level(self, level: str | None) -> None:
+        if not self.detail or self.saving:
             return
         if self.session_state == SESSION_STATE_FINALIZED or self.has_sessions:
             return
@@ -181,31 +269,81 @@ class IncursionDetailViewModel:
             return
         difficulty = get_adversary_difficulty(adversary_id, level)
         logger.info(
-            "Firestore update adversary level incursion_id=%s level=%s",
+            "UI buffer adversary level incursion_id=%s level=%s",
             self.incursion_id,
             level,
         )
-        try:
-            service.update_incursion_adversary_level(
-                era_id=self.era_id,
-                period_id=self.period_id,
-                incursion_id=self.incursion_id,
-                adversary_id=adversary_id,
-                adversary_level=level,
-                difficulty=difficulty,
-            )
-        except ValueError as exc:
-            logger.error(
-                "Failed to update adversary level error=%s", exc, exc_info=True
-            )
-            self.show_toast(str(exc))
-            return
-        self.adversary_level = level
-        self.detail = replace(
-            self.detail,
+        self.pending_level = PendingLevelChange(
+            era_id=self.era_id,
+            period_id=self.period_id,
+            incursion_id=self.incursion_id,
+            adversary_id=adversary_id,
             adversary_level=level,
             difficulty=difficulty,
         )
+        self.level_version += 1
+        self.adversary_level = level
+        self.detail = replace(self.detail, adversary_level=level, difficulty=difficulty)
+
+    @batched
+    def flush_adversary_level(
+        self,
+        service: FirestoreService,
+        version: int | None = None,
+        dispatch: Dispatch = _run_inline,
+    ) -> None:
+        pending = self.pending_level
+        if pending is None or self.saving:
+            return
+        if version is not None and version != self.level_version:
+            return
+        self.pending_level = None
+        route = self.route
+
+        def write() -> None:
+            logger.info(
+                "Firestore update adversary level incursion_id=%s level=%s",
+                pending.incursion_id,
+                pending.adversary_level,
+            )
+            try:
+                service.update_incursion_adversary_level(
+                    era_id=pending.era_id,
+                    period_id=pending.period_id,
+                    incursion_id=pending.incursion_id,
+                    adversary_id=pending.adversary_id,
+                    adversary_level=pending.adversary_level,
+                    difficulty=pending.difficulty,
+                )
+            except Exception as exc:
+                logger.error(
+                    "Failed to update adversary level error=%s", exc, exc_info=True
+                )
+                self._restore_pending_level(pending, exc)
+                return
+            self._confirm_write(service, route)
+
+        dispatch(write)
+
+    @batched
+    def _restore_pending_level(
+        self, pending: PendingLevelChange, exc: Exception
+    ) -> None:
+        if self.pending_level is None:
+            self.pending_level = pending
+        if isinstance(exc, ValueError):
+            self.show_toast(str(exc))
+        else:
+            self.show_toast("No se pudo guardar el nivel.")
+
+    def _pending_level_for(self, incursion_id: str | None) -> PendingLevelChange | None:
+        pending = self.pending_level
+        if pending is None:
+            return None
+        target = (pending.era_id, pending.period_id, pending.incursion_id)
+        if target != (self.era_id, self.period_id, incursion_id):
+            return None
+        return pending
 
     def update_finalize_field(self, field: str, value: str | None) -> None:
         if not self.finalize_form:
@@ -235,8 +373,11 @@ class IncursionDetailViewModel:
         except ValueError:
             return None
 
-    def finalize_incursion(self, service: FirestoreService) -> None:
-        if not self.detail:
+    @batched
+    def finalize_incursion(
+        self, service: FirestoreService, dispatch: Dispatch = _run_inline
+    ) -> None:
+        if not self.detail or self.saving:
             return
         if not self.era_id or not self.period_id or not self.incursion_id:
             return
@@ -270,60 +411,170 @@ class IncursionDetailViewModel:
                     "Debes indicar las cartas fuera del mazo (0 o más)."
                 )
                 return
-        if self.open_session:
-            logger.info(
-                "Closing active session before finalize incursion_id=%s",
-                self.incursion_id,
-            )
-            service.end_session(self.era_id, self.period_id, self.incursion_id)
-        try:
-            logger.info(
-                "Firestore finalize incursion incursion_id=%s", self.incursion_id
-            )
+        era_id, period_id, incursion_id = self.era_id, self.period_id, self.incursion_id
+        now = datetime.now(timezone.utc)
+
+        def write() -> None:
+            # finalize_incursion closes the open session in the same write.
+            logger.info("Firestore finalize incursion incursion_id=%s", incursion_id)
             service.finalize_incursion(
-                era_id=self.era_id,
-                period_id=self.period_id,
-                incursion_id=self.incursion_id,
+                era_id=era_id,
+                period_id=period_id,
+                incursion_id=incursion_id,
                 result=result_value,
                 dahan_alive=dahan_alive,
                 blight_on_island=blight_on_island,
-                player_count=2,
+                player_count=PLAYER_COUNT,
                 invader_cards_remaining=invader_cards_remaining,
                 invader_cards_out_of_deck=invader_cards_out_of_deck,
+                at=now,
             )
-        except ValueError as exc:
-            self.show_toast(str(exc))
-            return
-        self.toggle_finalize_confirm(False)
-        self.load_detail(service)
 
-    def handle_session_action(self, service: FirestoreService) -> None:
+        detail = replace(
+            self.detail,
+            result=result_value,
+            score=calculate_score(
+                difficulty=self.detail.difficulty or 0,
+                result=result_value,
+                dahan_alive=dahan_alive,
+                blight_on_island=blight_on_island,
+                player_count=PLAYER_COUNT,
+                invader_cards_remaining=invader_cards_remaining,
+                invader_cards_out_of_deck=invader_cards_out_of_deck,
+            ),
+            dahan_alive=dahan_alive,
+            blight_on_island=blight_on_island,
+            player_count=PLAYER_COUNT,
+            invader_cards_remaining=invader_cards_remaining,
+            invader_cards_out_of_deck=invader_cards_out_of_deck,
+        )
+        self._commit_optimistic(
+            service,
+            (detail, self._close_sessions(now), SESSION_STATE_FINALIZED),
+            write,
+            dispatch,
+        )
+
+    @batched
+    def handle_session_action(
+        self, service: FirestoreService, dispatch: Dispatch = _run_inline
+    ) -> None:
+        if not self.detail or self.saving:
+            return
         if self.session_state == SESSION_STATE_FINALIZED:
             self.show_toast("La incursión ya está finalizada.")
             return
         if not self.era_id or not self.period_id or not self.incursion_id:
             return
+        era_id, period_id, incursion_id = self.era_id, self.period_id, self.incursion_id
+        now = datetime.now(timezone.utc)
         if self.open_session:
-            logger.info(
-                "Firestore end session incursion_id=%s", self.incursion_id
+
+            def end_write() -> None:
+                logger.info("Firestore end session incursion_id=%s", incursion_id)
+                service.end_session(era_id, period_id, incursion_id, at=now)
+
+            self._commit_optimistic(
+                service,
+                (self.detail, self._close_sessions(now), SESSION_STATE_BETWEEN_SESSIONS),
+                end_write,
+                dispatch,
             )
-            service.end_session(self.era_id, self.period_id, self.incursion_id)
-            self.load_detail(service)
             return
         if not self.adversary_level or self.detail.difficulty is None:
             self.show_toast("Debes seleccionar un nivel válido.")
             return
-        try:
-            logger.info(
-                "Firestore start session incursion_id=%s", self.incursion_id
+
+        level_change = self._pending_level_for(incursion_id)
+
+        def start_write() -> None:
+            logger.info("Firestore start session incursion_id=%s", incursion_id)
+            service.start_session(
+                era_id,
+                period_id,
+                incursion_id,
+                at=now,
+                adversary_level=level_change.adversary_level if level_change else None,
+                difficulty=level_change.difficulty if level_change else None,
             )
-            service.start_session(self.era_id, self.period_id, self.incursion_id)
-        except ValueError as exc:
-            logger.error("Failed to start session error=%s", exc, exc_info=True)
+
+        self._commit_optimistic(
+            service,
+            (
+                self.detail,
+                [*self.sessions, SessionEntryModel(started_at=now, ended_at=None)],
+                SESSION_STATE_IN_SESSION,
+            ),
+            start_write,
+            dispatch,
+            consumes_level=level_change is not None,
+        )
+
+    def _close_sessions(self, now: datetime) -> list[SessionEntryModel]:
+        return [
+            replace(session, ended_at=now) if session.ended_at is None else session
+            for session in self.sessions
+        ]
+
+    def _commit_optimistic(
+        self,
+        service: FirestoreService,
+        bundle: DetailBundle,
+        write: Callable[[], None],
+        dispatch: Dispatch,
+        consumes_level: bool = False,
+    ) -> None:
+        previous: DetailBundle = (self.detail, list(self.sessions), self.session_state)
+        previous_level = self.pending_level
+        route = self.route
+        self.saving = True
+        if consumes_level:
+            self.pending_level = None
+        detail, sessions, session_state = bundle
+        self._apply_bundle(detail, list(sessions), session_state)
+
+        def run() -> None:
+            try:
+                write()
+            except Exception as exc:
+                logger.error("Optimistic write failed error=%s", exc, exc_info=True)
+                self._rollback(previous, previous_level, exc)
+                return
+            self._confirm_write(service, route, bundle)
+
+        dispatch(run)
+
+    @batched
+    def _confirm_write(
+        self,
+        service: FirestoreService,
+        route: str,
+        bundle: DetailBundle | None = None,
+    ) -> None:
+        # Reload the incursion so server-side fields replace the optimistic guess.
+        if bundle is not None:
+            self.saving = False
+            if self.snapshots is not None:
+                self.snapshots.put(route, bundle)
+        if route == self.route and not self.saving:
+            self.load_detail(service)
+
+    @batched
+    def _rollback(
+        self,
+        previous: DetailBundle,
+        previous_level: PendingLevelChange | None,
+        exc: Exception,
+    ) -> None:
+        self._apply_bundle(*previous)
+        self.pending_level = previous_level
+        self.saving = False
+        if isinstance(exc, ValueError):
             self.show_toast(str(exc))
-            return
-        self.load_detail(service)
+        else:
+            self.show_toast("No se pudo guardar el cambio.")
 
+    @batched
     def show_toast(self, text: str) -> None:
         logger.info("User message shown: %s", text)
         self.toast_message = text
@@ -337,12 +588,14 @@ class IncursionDetailViewModel:
             return
         self.timer_now = datetime.now(timezone.utc)
 
+    @batched
     def request_score_dialog(self) -> None:
         if not self.detail:
             return
         self.score_dialog_open = True
         self.score_dialog_version += 1
 
+    @batched
     def close_score_dialog(self) -> None:
         if not self.score_dialog_open:
             return
@@ -10,6 +10,7 @@ from screens.data_lookup import (
     get_layout_name,
     get_spirit_name,
 )
+from services.firestore_records import IncursionDoc
 
 
 @dataclass(frozen=True)
@@ -23,42 +24,40 @@ class IncursionCardModel:
     score_label: str
     status_label: str
     status_color: str
+    is_active: bool = False
 
 
-def get_incursion_status(incursion: dict) -> tuple[str, str]:
-    if incursion.get("ended_at") or incursion.get("result"):
+def get_incursion_status(incursion: IncursionDoc) -> tuple[str, str]:
+    if incursion.is_finished:
         return "Finalizada", ft.Colors.BLUE_600
-    if incursion.get("is_active"):
+    if incursion.is_active:
         return "Activa", ft.Colors.GREEN_600
     return "Pendiente", ft.Colors.GREY_500
 
 
-def get_spirit_info(incursion: dict) -> str:
+def get_spirit_info(incursion: IncursionDoc) -> str:
     return (
-        f"{get_spirit_name(incursion.get('spirit_1_id'))} · "
-        f"{get_spirit_name(incursion.get('spirit_2_id'))}"
+        f"{get_spirit_name(incursion.spirit_1_id)} · "
+        f"{get_spirit_name(incursion.spirit_2_id)}"
     )
 
 
-def get_board_info(incursion: dict) -> str:
+def get_board_info(incursion: IncursionDoc) -> str:
     return (
-        f"{get_board_name(incursion.get('board_1'))} + "
-        f"{get_board_name(incursion.get('board_2'))}"
+        f"{get_board_name(incursion.board_1)} + "
+        f"{get_board_name(incursion.board_2)}"
     )
 
 
-def get_layout_info(incursion: dict) -> str:
-    return get_layout_name(incursion.get("board_layout"))
+def get_layout_info(incursion: IncursionDoc) -> str:
+    return get_layout_name(incursion.board_layout)
 
 
-def get_adversary_info(incursion: dict) -> str:
-    return get_adversary_name(incursion.get("adversary_id"))
+def get_adversary_info(incursion: IncursionDoc) -> str:
+    return get_adversary_name(incursion.adversary_id)
 
 
-def get_score_label(incursion: dict) -> str:
-    score = incursion.get("score")
-    if isinstance(score, bool):
+def get_score_label(incursion: IncursionDoc) -> str:
+    if incursion.score is None:
         return "—"
-    if isinstance(score, (int, float)):
-        return str(int(score))
-    return "—"
+    return str(incursion.score)
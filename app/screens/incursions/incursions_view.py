@@ -2,13 +2,16 @@ from __future__ import annotations
 
 import asyncio
 import re
+from typing import Callable
 
 import flet as ft
 
 from screens.incursions.incursions_model import IncursionCardModel
 from screens.incursions.incursions_viewmodel import IncursionsViewModel
+from screens.prefetch import use_route_prefetch
 from screens.shared_components import section_card, status_chip
-from services.service_registry import get_firestore_service
+from services.service_registry import get_firestore_service, get_snapshot_store
+from utils.lazy_list import lazy_list_view, show_more_row, use_lazy_window
 from utils.logger import get_logger
 from utils.navigation import navigate
 from utils.router import register_route_loader
@@ -67,6 +70,18 @@ def _extract_index(value: str) -> str | None:
     return match.group(1) if match else None
 
 
+@ft.memo
+@ft.component
+def incursion_card(
+    model: IncursionCardModel,
+    on_open_incursion: Callable[[str], None],
+) -> ft.Control:
+    return _incursion_card(
+        model,
+        lambda _: on_open_incursion(model.incursion_id),
+    )
+
+
 @ft.component
 def incursions_view(
     era_id: str,
@@ -75,10 +90,12 @@ def incursions_view(
     logger.debug("Rendering incursions_view era_id=%s period_id=%s", era_id, period_id)
     page = ft.context.page
     service = get_firestore_service(page.session)
+    snapshots = get_snapshot_store(page.session)
     view_model, _ = ft.use_state(IncursionsViewModel())
 
     def load() -> None:
-        view_model.ensure_loaded(service, era_id, period_id)
+        view_model.restore_snapshot(snapshots, era_id, period_id)
+        page.run_thread(view_model.ensure_loaded, service, era_id, period_id)
 
     ft.use_effect(load, [era_id, period_id])
 
@@ -93,6 +110,7 @@ def incursions_view(
         )
 
     ft.use_effect(register_loader, [era_id, period_id])
+    use_route_prefetch(view_model.prefetch_routes())
 
     def show_toast() -> None:
         if not view_model.toast_message:
@@ -124,43 +142,47 @@ def incursions_view(
 
     ft.use_effect(handle_navigation, [view_model.nav_version])
 
+    def open_incursion(incursion_id: str) -> None:
+        logger.info(
+            "UI click open incursion era_id=%s period_id=%s incursion_id=%s",
+            era_id,
+            period_id,
+            incursion_id,
+        )
+        try:
+            view_model.request_open_incursion(incursion_id)
+        except Exception as exc:
+            logger.exception(
+                "Failed to handle open incursion era_id=%s period_id=%s incursion_id=%s error=%s",
+                era_id,
+                period_id,
+                incursion_id,
+                exc,
+            )
+
+    on_open_incursion = ft.use_callback(open_incursion, [era_id, period_id])
+    visible_count, handle_scroll, show_more = use_lazy_window(
+        len(view_model.incursions), reset_key=(era_id, period_id)
+    )
+
     content_controls: list[ft.Control] = []
     if view_model.loading:
         content_controls.append(ft.ProgressRing())
     elif not view_model.incursions:
         content_controls.append(ft.Text("No hay incursiones disponibles."))
     else:
-        for incursion in view_model.incursions:
-            def handle_open_incursion(
-                event: ft.ControlEvent,
-                incursion_id: str = incursion.incursion_id,
-            ) -> None:
-                logger.info(
-                    "UI click open incursion era_id=%s period_id=%s incursion_id=%s control=%s",
-                    era_id,
-                    period_id,
-                    incursion_id,
-                    event.control,
-                )
-                try:
-                    view_model.request_open_incursion(incursion_id)
-                except Exception as exc:
-                    logger.exception(
-                        "Failed to handle open incursion era_id=%s period_id=%s incursion_id=%s error=%s",
-                        era_id,
-                        period_id,
-                        incursion_id,
-                        exc,
-                    )
-
-            content_controls.append(
-                _incursion_card(
-                    incursion,
-                    handle_open_incursion,
-                )
+        content_controls.extend(
+            incursion_card(
+                incursion,
+                on_open_incursion,
+                key=incursion.incursion_id,
             )
+            for incursion in view_model.incursions[:visible_count]
+        )
+        if visible_count < len(view_model.incursions):
+            content_controls.append(show_more_row("Mostrar más incursiones", show_more))
 
-    incursions_list = ft.ListView(spacing=8, expand=True, controls=content_controls)
+    incursions_list = lazy_list_view(content_controls, handle_scroll)
     era_label = _extract_index(era_id) or era_id
     period_label = _extract_index(period_id) or period_id
     context_header = ft.Text(
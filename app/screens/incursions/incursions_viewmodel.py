@@ -12,13 +12,29 @@ from screens.incursions.incursions_model import (
     get_spirit_info,
 )
 from services.firestore_service import FirestoreService
+from services.snapshot_store import SnapshotStore
 from utils.logger import get_logger
+from utils.observable import BatchedObservable, batched
 
 logger = get_logger(__name__)
 
+INCURSION_CARD_FIELDS = (
+    "index",
+    "spirit_1_id",
+    "spirit_2_id",
+    "board_1",
+    "board_2",
+    "board_layout",
+    "adversary_id",
+    "is_active",
+    "ended_at",
+    "result",
+    "score",
+)
+
 
 @ft.observable
-class IncursionsViewModel:
+class IncursionsViewModel(BatchedObservable):
     def __init__(self) -> None:
         self.era_id: str | None = None
         self.period_id: str | None = None
@@ -29,14 +45,34 @@ class IncursionsViewModel:
         self.toast_version = 0
         self.navigate_to: str | None = None
         self.nav_version = 0
+        self.snapshots: SnapshotStore | None = None
 
+    @property
+    def route(self) -> str:
+        return f"/eras/{self.era_id}/periods/{self.period_id}"
+
+    @batched
+    def restore_snapshot(
+        self, snapshots: SnapshotStore | None, era_id: str, period_id: str
+    ) -> None:
+        self.snapshots = snapshots
+        if (self.era_id, self.period_id) != (era_id, period_id):
+            self.era_id = era_id
+            self.period_id = period_id
+            cached = snapshots.get(self.route) if snapshots else None
+            self.incursions = list(cached) if cached else []
+        self.loading = not self.incursions
+
+    @batched
     def ensure_loaded(
         self, service: FirestoreService, era_id: str, period_id: str
     ) -> None:
         self.era_id = era_id
         self.period_id = period_id
+        service.open_era(era_id)
         self.load_incursions(service)
 
+    @batched
     def load_incursions(self, service: FirestoreService) -> None:
         if not self.era_id or not self.period_id:
             return
@@ -45,17 +81,19 @@ class IncursionsViewModel:
             self.era_id,
             self.period_id,
         )
-        self.loading = True
+        self.loading = not self.incursions
         self.error = None
         try:
-            incursions = service.list_incursions(self.era_id, self.period_id)
+            incursions = service.list_incursions(
+                self.era_id, self.period_id, fields=INCURSION_CARD_FIELDS
+            )
             cards: list[IncursionCardModel] = []
             for incursion in incursions:
                 status_label, status_color = get_incursion_status(incursion)
                 cards.append(
                     IncursionCardModel(
-                        incursion_id=incursion["id"],
-                        title=f"Incursión {incursion.get('index', 0)}",
+                        incursion_id=incursion.id,
+                        title=f"Incursión {incursion.index}",
                         spirit_info=get_spirit_info(incursion),
                         board_info=get_board_info(incursion),
                         layout_info=get_layout_info(incursion),
@@ -63,9 +101,13 @@ class IncursionsViewModel:
                         score_label=get_score_label(incursion),
                         status_label=status_label,
                         status_color=status_color,
+                        is_active=incursion.is_active and not incursion.is_finished,
                     )
                 )
-            self.incursions = cards
+            if cards != self.incursions:
+                self.incursions = cards
+            if self.snapshots is not None:
+                self.snapshots.put(self.route, list(cards))
         except Exception as exc:
             logger.error(
                 "Failed to load incursions era_id=%s period_id=%s error=%s",
@@ -74,11 +116,21 @@ class IncursionsViewModel:
                 exc,
                 exc_info=True,
             )
-            self.error = "load_failed"
-            self.incursions = []
+            if self.incursions:
+                self.show_toast("No se pudieron actualizar las incursiones.")
+            else:
+                self.error = "load_failed"
         finally:
             self.loading = False
 
+    def prefetch_routes(self) -> list[str]:
+        return [
+            f"{self.route}/incursions/{card.incursion_id}"
+            for card in self.incursions
+            if card.is_active
+        ][:1]
+
+    @batched
     def request_open_incursion(self, incursion_id: str) -> None:
         if not self.era_id or not self.period_id:
             return
@@ -93,6 +145,7 @@ class IncursionsViewModel:
         )
         self.nav_version += 1
 
+    @batched
     def show_toast(self, message: str) -> None:
         logger.info("User message shown: %s", message)
         self.toast_message = message
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import json
+import math
+import struct
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ASSETS_DIR = Path(__file__).resolve().parents[1] / "assets"
+CALIBRATION_PATH = ASSETS_DIR / "layouts" / "calibration.json"
+BOARDS_DIR = ASSETS_DIR / "boards"
+DEFAULT_BOARD_HEIGHT_PCT = 0.90
+PLACEMENT_CACHE_SIZE = 256
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+@dataclass(frozen=True)
+class SlotCalibration:
+    dx: float = 0.0
+    dy: float = 0.0
+    rot_deg: float = 0.0
+
+
+@dataclass(frozen=True)
+class LayoutCalibration:
+    left: SlotCalibration
+    right: SlotCalibration
+
+
+@dataclass(frozen=True)
+class BoardPlacement:
+    board_id: str
+    left: float
+    top: float
+    width: float
+    height: float
+    rotation: float
+
+
+@dataclass(frozen=True)
+class LayoutPlacement:
+    left: BoardPlacement
+    right: BoardPlacement
+
+
+def safe_float(value: object, default: float) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def read_png_size(path: Path) -> tuple[int, int]:
+    if not path.exists():
+        return (1, 1)
+
+    with path.open("rb") as file:
+        header = file.read(24)
+
+    if len(header) < 24 or header[:8] != _PNG_SIGNATURE:
+        return (1, 1)
+
+    width, height = struct.unpack(">II", header[16:24])
+    if width <= 0 or height <= 0:
+        return (1, 1)
+    return width, height
+
+
+def parse_slot_calibration(raw_slot: object) -> SlotCalibration | None:
+    if not isinstance(raw_slot, dict):
+        return None
+    return SlotCalibration(
+        dx=safe_float(raw_slot.get("dx"), 0.0),
+        dy=safe_float(raw_slot.get("dy"), 0.0),
+        rot_deg=safe_float(raw_slot.get("rot_deg"), 0.0),
+    )
+
+
+@lru_cache
+def load_layout_calibration(
+    path: Path = CALIBRATION_PATH,
+) -> dict[str, LayoutCalibration]:
+    if not path.exists():
+        logger.debug("Layout calibration file not found: %s", path)
+        return {}
+
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        logger.exception("Failed to read layout calibration file: %s", path)
+        return {}
+
+    layouts = data.get("layouts") if isinstance(data, dict) else None
+    if not isinstance(layouts, dict):
+        return {}
+
+    parsed: dict[str, LayoutCalibration] = {}
+    for key, layout_data in layouts.items():
+        if not isinstance(key, str) or not isinstance(layout_data, dict):
+            continue
+        left = parse_slot_calibration(layout_data.get("left"))
+        right = parse_slot_calibration(layout_data.get("right"))
+        if left is None or right is None:
+            continue
+        parsed[key] = LayoutCalibration(left=left, right=right)
+    logger.debug("Layout calibration loaded count=%s path=%s", len(parsed), path)
+    return parsed
+
+
+@lru_cache
+def get_board_aspect(board_id: str, boards_dir: Path = BOARDS_DIR) -> float | None:
+    board_path = boards_dir / f"{board_id}.png"
+    if not board_path.exists():
+        return None
+
+    width, height = read_png_size(board_path)
+    return width / height if height else 1.0
+
+
+def compute_board_placement(
+    board_id: str,
+    slot: SlotCalibration,
+    board_aspect: float,
+    width: float,
+    height: float,
+    board_height_pct: float = DEFAULT_BOARD_HEIGHT_PCT,
+) -> BoardPlacement:
+    board_height_px = height * board_height_pct
+    board_width_px = board_height_px * board_aspect
+
+    center_x = (width / 2) + slot.dx * board_height_px
+    center_y = (height / 2) + slot.dy * board_height_px
+
+    return BoardPlacement(
+        board_id=board_id,
+        left=center_x - (board_width_px / 2),
+        top=center_y - (board_height_px / 2),
+        width=board_width_px,
+        height=board_height_px,
+        rotation=math.radians(slot.rot_deg),
+    )
+
+
+@lru_cache(maxsize=PLACEMENT_CACHE_SIZE)
+def _compute_layout_placement(
+    layout_id: str,
+    board_ids: tuple[str, str],
+    width: float,
+    height: float,
+    board_height_pct: float,
+) -> LayoutPlacement | None:
+    calibration = load_layout_calibration().get(layout_id)
+    if calibration is None:
+        return None
+
+    board_1_id, board_2_id = board_ids
+    left_aspect = get_board_aspect(board_1_id)
+    right_aspect = get_board_aspect(board_2_id)
+    if left_aspect is None or right_aspect is None:
+        return None
+
+    return LayoutPlacement(
+        left=compute_board_placement(
+            board_1_id, calibration.left, left_aspect, width, height, board_height_pct
+        ),
+        right=compute_board_placement(
+            board_2_id, calibration.right, right_aspect, width, height, board_height_pct
+        ),
+    )
+
+
+def compute_layout_placement(
+    layout_id: str | None,
+    board_ids: tuple[str | None, str | None],
+    width: float,
+    height: float,
+    board_height_pct: float = DEFAULT_BOARD_HEIGHT_PCT,
+) -> LayoutPlacement | None:
+    board_1_id, board_2_id = board_ids
+    if not layout_id or not board_1_id or not board_2_id:
+        return None
+    # Rounded to tenths of a pixel so near-identical resize widths share an entry.
+    return _compute_layout_placement(
+        layout_id,
+        (board_1_id, board_2_id),
+        round(float(width), 1),
+        round(float(height), 1),
+        board_height_pct,
+    )
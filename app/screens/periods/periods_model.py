@@ -5,6 +5,7 @@ from dataclasses import dataclass
 import flet as ft
 
 from screens.data_lookup import get_board_name, get_layout_name, get_spirit_name
+from services.firestore_records import IncursionDoc, PeriodDoc
 
 
 @dataclass(frozen=True)
@@ -36,58 +37,48 @@ class AssignmentIncursionModel:
     layout_name: str
 
 
-def can_reveal(periods: list[dict], index: int) -> bool:
+def can_reveal(periods: list[PeriodDoc], index: int) -> bool:
     if index == 0:
         return True
-    previous = periods[index - 1]
-    return bool(previous.get("ended_at"))
+    return periods[index - 1].ended_at is not None
 
 
-def get_period_action(period: dict, allow_reveal: bool) -> str | None:
-    if period.get("ended_at"):
+def get_period_action(period: PeriodDoc, allow_reveal: bool) -> str | None:
+    if period.ended_at is not None:
         return "results"
-    if period.get("adversaries_assigned_at"):
+    if period.adversaries_assigned_at is not None:
         return "incursions"
-    if period.get("revealed_at"):
+    if period.revealed_at is not None:
         return "assign"
     if allow_reveal:
         return "reveal"
     return None
 
 
-def get_period_status(period: dict) -> tuple[str, str]:
-    if period.get("ended_at"):
+def get_period_status(period: PeriodDoc) -> tuple[str, str]:
+    if period.ended_at is not None:
         return "Finalizado", ft.Colors.BLUE_600
-    if period.get("adversaries_assigned_at"):
+    if period.adversaries_assigned_at is not None:
         return "Preparado", ft.Colors.GREEN_600
-    if period.get("revealed_at"):
+    if period.revealed_at is not None:
         return "Revelado", ft.Colors.AMBER_700
     return "Pendiente", ft.Colors.GREY_500
 
 
-def get_incursion_count(period: dict, incursions: list[dict]) -> int:
-    raw_count = period.get("incursions_count")
-    if raw_count is None:
-        raw_count = period.get("incursions")
-    if isinstance(raw_count, (list, tuple)):
-        raw_count = len(raw_count)
-    if isinstance(raw_count, int) and raw_count > 0:
-        return raw_count
+def get_incursion_count(period: PeriodDoc, incursions: list[IncursionDoc]) -> int:
+    if (period.incursions_count or 0) > 0:
+        return period.incursions_count
     if incursions:
         return len(incursions)
     return 4
 
 
-def compute_score_summary(incursions: list[dict]) -> tuple[int, int, float | None]:
-    score_total = 0
-    completed_incursions = 0
-    for incursion in incursions:
-        score = incursion.get("score")
-        if isinstance(score, bool):
-            continue
-        if isinstance(score, (int, float)):
-            score_total += int(score)
-            completed_incursions += 1
+def compute_score_summary(
+    incursions: list[IncursionDoc],
+) -> tuple[int, int, float | None]:
+    scores = [incursion.score for incursion in incursions if incursion.score is not None]
+    score_total = sum(scores)
+    completed_incursions = len(scores)
     score_average = (
         score_total / completed_incursions if completed_incursions else None
     )
@@ -101,12 +92,12 @@ def format_score_average(score_average: float | None) -> str:
 
 
 def build_period_rows(
-    periods: list[dict],
-    incursions_by_period: dict[str, list[dict]],
+    periods: list[PeriodDoc],
+    incursions_by_period: dict[str, list[IncursionDoc]],
 ) -> list[PeriodRowModel]:
     rows: list[PeriodRowModel] = []
     for idx, period in enumerate(periods):
-        period_id = period["id"]
+        period_id = period.id
         action = get_period_action(period, can_reveal(periods, idx))
         status_label, status_color = get_period_status(period)
         center_actions = action == "reveal"
@@ -116,20 +107,17 @@ def build_period_rows(
             incursions
         )
         preview_lines: list[str] = []
-        if period.get("revealed_at") and incursions:
-            for incursion in sorted(
-                incursions,
-                key=lambda item: item.get("index", 0),
-            ):
-                spirit_1 = get_spirit_name(incursion.get("spirit_1_id"))
-                spirit_2 = get_spirit_name(incursion.get("spirit_2_id"))
+        if period.revealed_at is not None and incursions:
+            for incursion in sorted(incursions, key=lambda item: item.index):
+                spirit_1 = get_spirit_name(incursion.spirit_1_id)
+                spirit_2 = get_spirit_name(incursion.spirit_2_id)
                 preview_lines.append(
-                    f"Incursión {incursion.get('index', 0)}: {spirit_1} · {spirit_2}"
+                    f"Incursión {incursion.index}: {spirit_1} · {spirit_2}"
                 )
         rows.append(
             PeriodRowModel(
                 period_id=period_id,
-                title=f"Período {period.get('index', 0)}",
+                title=f"Período {period.index}",
                 action=action,
                 center_actions=center_actions,
                 status_label=status_label,
@@ -144,21 +132,39 @@ def build_period_rows(
     return rows
 
 
-def build_assignment_incursions(incursions: list[dict]) -> list[AssignmentIncursionModel]:
+def build_assignment_incursions(
+    incursions: list[IncursionDoc],
+) -> list[AssignmentIncursionModel]:
     items: list[AssignmentIncursionModel] = []
     for incursion in incursions:
         items.append(
             AssignmentIncursionModel(
-                incursion_id=incursion["id"],
-                index=incursion.get("index", 0),
-                spirit_1_name=get_spirit_name(incursion.get("spirit_1_id")),
-                spirit_2_name=get_spirit_name(incursion.get("spirit_2_id")),
-                board_1_id=incursion.get("board_1") or "",
-                board_2_id=incursion.get("board_2") or "",
-                board_1_name=get_board_name(incursion.get("board_1")),
-                board_2_name=get_board_name(incursion.get("board_2")),
-                layout_id=incursion.get("board_layout") or "",
-                layout_name=get_layout_name(incursion.get("board_layout")),
+                incursion_id=incursion.id,
+                index=incursion.index,
+                spirit_1_name=get_spirit_name(incursion.spirit_1_id),
+                spirit_2_name=get_spirit_name(incursion.spirit_2_id),
+                board_1_id=incursion.board_1 or "",
+                board_2_id=incursion.board_2 or "",
+                board_1_name=get_board_name(incursion.board_1),
+                board_2_name=get_board_name(incursion.board_2),
+                layout_id=incursion.board_layout or "",
+                layout_name=get_layout_name(incursion.board_layout),
             )
         )
     return items
+
+
+def collect_taken_adversaries(selections: dict[str, str | None]) -> frozenset[str]:
+    return frozenset(value for value in selections.values() if value)
+
+
+def available_adversary_ids(
+    adversary_ids: list[str],
+    taken: frozenset[str],
+    selection: str | None,
+) -> list[str]:
+    return [
+        adversary_id
+        for adversary_id in adversary_ids
+        if adversary_id == selection or adversary_id not in taken
+    ]
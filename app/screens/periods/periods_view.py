@@ -1,11 +1,8 @@
 from __future__ import annotations
 
 import asyncio
-import json
-import math
 import re
-import struct
-from pathlib import Path
+from typing import Callable
 
 import flet as ft
 
@@ -13,22 +10,27 @@ from screens.data_lookup import get_adversary_catalog
 from screens.periods.periods_model import (
     AssignmentIncursionModel,
     PeriodRowModel,
+    available_adversary_ids,
     format_score_average,
 )
+from screens.layout_geometry import compute_layout_placement
 from screens.periods.periods_viewmodel import PeriodsViewModel
-from screens.shared_components import section_card, status_chip
-from services.service_registry import get_firestore_service
+from screens.prefetch import use_route_prefetch
+from screens.shared_components import board_frame, section_card, status_chip
+from services.service_registry import get_firestore_service, get_snapshot_store
+from utils.lazy_list import lazy_list_view, show_more_row, use_lazy_window
 from utils.logger import get_logger
 from utils.navigation import navigate
+from utils.resize_broker import (
+    ViewportSize,
+    get_resize_broker,
+    quantize,
+    use_viewport_bucket,
+)
 from utils.router import register_route_loader
 
 logger = get_logger(__name__)
 
-ASSETS_DIR = Path(__file__).resolve().parents[2] / "assets"
-LAYOUTS_DIR = ASSETS_DIR / "layouts"
-CALIBRATION_PATH = LAYOUTS_DIR / "calibration.json"
-BOARDS_DIR = ASSETS_DIR / "boards"
-CENTER_ALIGN = ft.Alignment(0, 0)
 DEFAULT_BOARD_HEIGHT_PCT = 0.90
 LAYOUT_PLACEHOLDER_WIDTH = 240.0
 LAYOUT_PLACEHOLDER_HEIGHT = 140.0
@@ -37,9 +39,16 @@ LAYOUT_PREVIEW_PADDING = 6.0
 LAYOUT_PREVIEW_INNER_PADDING = 10.0
 PREVIEW_TEXT_COLOR = ft.Colors.BLUE_GREY_100
 PREVIEW_BG_COLOR = ft.Colors.BLUE_GREY_700
+ASSIGNMENT_DIALOG_STEP = 16.0
+
 
-_CALIBRATION_CACHE: dict[str, dict[str, dict[str, float]]] | None = None
-_BOARD_ASPECT_CACHE: dict[str, float] = {}
+def _assignment_dialog_size(size: ViewportSize) -> tuple[float, float]:
+    width = min(960.0, max(320.0, size.width - 48.0))
+    height = max(360.0, size.height * 0.9)
+    return (
+        quantize(width, ASSIGNMENT_DIALOG_STEP),
+        quantize(height, ASSIGNMENT_DIALOG_STEP),
+    )
 
 
 def _period_card(
@@ -102,111 +111,6 @@ def _extract_index(value: str) -> str | None:
     return match.group(1) if match else None
 
 
-def _safe_float(value: object, default: float) -> float:
-    try:
-        return float(value)
-    except (TypeError, ValueError):
-        return default
-
-
-def _read_png_size(path: Path) -> tuple[int, int]:
-    if not path.exists():
-        return (1, 1)
-
-    with path.open("rb") as file:
-        header = file.read(24)
-
-    png_sig = b"\x89PNG\r\n\x1a\n"
-    if len(header) < 24 or header[:8] != png_sig:
-        return (1, 1)
-
-    width = struct.unpack(">I", header[16:20])[0]
-    height = struct.unpack(">I", header[20:24])[0]
-    return width, height
-
-
-def _get_board_aspect(board_id: str) -> float | None:
-    if board_id in _BOARD_ASPECT_CACHE:
-        return _BOARD_ASPECT_CACHE[board_id]
-
-    board_path = BOARDS_DIR / f"{board_id}.png"
-    if not board_path.exists():
-        return None
-
-    width, height = _read_png_size(board_path)
-    aspect = width / height if height else 1.0
-    _BOARD_ASPECT_CACHE[board_id] = aspect
-    return aspect
-
-
-def _load_layout_calibration() -> dict[str, dict[str, dict[str, float]]]:
-    global _CALIBRATION_CACHE
-    if _CALIBRATION_CACHE is not None:
-        return _CALIBRATION_CACHE
-
-    if not CALIBRATION_PATH.exists():
-        _CALIBRATION_CACHE = {}
-        return _CALIBRATION_CACHE
-
-    try:
-        data = json.loads(CALIBRATION_PATH.read_text(encoding="utf-8"))
-    except Exception:
-        logger.exception("Failed to read layout calibration file: %s", CALIBRATION_PATH)
-        _CALIBRATION_CACHE = {}
-        return _CALIBRATION_CACHE
-
-    layouts = data.get("layouts") if isinstance(data, dict) else None
-    if not isinstance(layouts, dict):
-        _CALIBRATION_CACHE = {}
-        return _CALIBRATION_CACHE
-
-    parsed: dict[str, dict[str, dict[str, float]]] = {}
-    for key, layout_data in layouts.items():
-        if not isinstance(key, str) or not isinstance(layout_data, dict):
-            continue
-        left = layout_data.get("left")
-        right = layout_data.get("right")
-        if not isinstance(left, dict) or not isinstance(right, dict):
-            continue
-        parsed[key] = {
-            "left": {
-                "dx": _safe_float(left.get("dx"), 0.0),
-                "dy": _safe_float(left.get("dy"), 0.0),
-                "rot_deg": _safe_float(left.get("rot_deg"), 0.0),
-            },
-            "right": {
-                "dx": _safe_float(right.get("dx"), 0.0),
-                "dy": _safe_float(right.get("dy"), 0.0),
-                "rot_deg": _safe_float(right.get("rot_deg"), 0.0),
-            },
-        }
-
-    _CALIBRATION_CACHE = parsed
-    return _CALIBRATION_CACHE
-
-
-def _apply_board_layout(
-    board_frame: ft.Container,
-    board_aspect: float,
-    slot_data: dict[str, object],
-    preview_width: float,
-    preview_height: float,
-) -> None:
-    board_base_height_px = preview_height * DEFAULT_BOARD_HEIGHT_PCT
-    translate_x_px = _safe_float(slot_data.get("dx"), 0.0) * board_base_height_px
-    translate_y_px = _safe_float(slot_data.get("dy"), 0.0) * board_base_height_px
-    board_height_px = board_base_height_px
-    board_width_px = board_height_px * board_aspect
-
-    center_x = (preview_width / 2) + translate_x_px
-    center_y = (preview_height / 2) + translate_y_px
-
-    board_frame.width = board_width_px
-    board_frame.height = board_height_px
-    board_frame.left = center_x - (board_width_px / 2)
-    board_frame.top = center_y - (board_height_px / 2)
-
-
 def _build_assignment_layout_preview(incursion: AssignmentIncursionModel) -> ft.Control:
     preview_width = 220.0
     preview_height = preview_width * LAYOUT_PLACEHOLDER_RATIO
@@ -252,85 +156,37 @@ def _build_assignment_layout_preview(incursion: AssignmentIncursionModel) -> ft.
             )
         )
 
-    layout_id = incursion.layout_id
-    if not layout_id or not incursion.board_1_id or not incursion.board_2_id:
-        return build_fallback("Preview no disponible")
-
-    calibration = _load_layout_calibration()
-    layout_data = calibration.get(layout_id)
-    if not isinstance(layout_data, dict):
-        return build_fallback("Preview no disponible")
-
-    left_slot = layout_data.get("left")
-    right_slot = layout_data.get("right")
-    if not isinstance(left_slot, dict) or not isinstance(right_slot, dict):
-        return build_fallback("Preview no disponible")
-
-    left_aspect = _get_board_aspect(incursion.board_1_id)
-    right_aspect = _get_board_aspect(incursion.board_2_id)
-    if left_aspect is None or right_aspect is None:
+    placement = compute_layout_placement(
+        incursion.layout_id,
+        (incursion.board_1_id, incursion.board_2_id),
+        inner_preview_width,
+        inner_preview_height,
+        DEFAULT_BOARD_HEIGHT_PCT,
+    )
+    if placement is None:
         return build_fallback("Preview no disponible")
 
-    def build_board_control(
-        board_id: str,
-        board_aspect: float,
-        slot_data: dict[str, object],
-    ) -> ft.Container:
-        board_image = ft.Image(
-            src=f"boards/{board_id}.png",
-            fit=ft.BoxFit.CONTAIN,
-            expand=True,
-        )
-        board_frame = ft.Container(
-            content=ft.Container(
-                content=board_image,
-                alignment=ft.Alignment.CENTER,
-                expand=True,
-            ),
-            alignment=ft.Alignment.CENTER,
-            rotate=ft.Rotate(
-                angle=math.radians(_safe_float(slot_data.get("rot_deg"), 0.0)),
-                alignment=CENTER_ALIGN,
-            ),
-        )
-        _apply_board_layout(
-            board_frame,
-            board_aspect,
-            slot_data,
-            inner_preview_width,
-            inner_preview_height,
-        )
-        return board_frame
-
     return build_preview_frame(
         ft.Stack(
             width=inner_preview_width,
             height=inner_preview_height,
             controls=[
-                build_board_control(incursion.board_1_id, left_aspect, left_slot),
-                build_board_control(incursion.board_2_id, right_aspect, right_slot),
+                board_frame(placement.left),
+                board_frame(placement.right),
             ],
         )
     )
 
 
+def _assignment_error_text(show_error: bool) -> str | None:
+    return "Selecciona un adversario" if show_error else None
+
+
 def _assignment_card(
     incursion: AssignmentIncursionModel,
-    selection: str | None,
-    options: list[ft.dropdown.Option],
-    show_error: bool,
-    on_select,
+    dropdown: ft.Dropdown,
 ) -> ft.Card:
     layout_preview_control = _build_assignment_layout_preview(incursion)
-    dropdown_width = 220
-    dropdown = ft.Dropdown(
-        options=options,
-        value=selection,
-        error_text="Selecciona un adversario" if show_error else None,
-        on_select=on_select,
-        height=40,
-        width=dropdown_width,
-    )
     spirits_column = ft.Column(
         [
             ft.Text(
@@ -410,6 +266,55 @@ def _assignment_card(
     )
 
 
+@ft.memo
+@ft.component
+def period_card(
+    row: PeriodRowModel,
+    on_open_incursions: Callable[[str], None],
+    on_assign_adversaries: Callable[[str], None],
+    on_reveal_period: Callable[[str], None],
+) -> ft.Control:
+    action = None
+    if row.action in {"results", "incursions"}:
+        action = ft.Button(
+            "Ver incursiones",
+            on_click=lambda _: on_open_incursions(row.period_id),
+        )
+    elif row.action == "assign":
+        action = ft.Button(
+            "Asignar adversarios",
+            on_click=lambda _: on_assign_adversaries(row.period_id),
+        )
+    elif row.action == "reveal" or row.status_label == "Pendiente":
+        action = ft.Button(
+            "Revelar",
+            on_click=lambda _: on_reveal_period(row.period_id),
+        )
+
+    preview_lines = (
+        _incursions_preview(list(row.incursions_preview))
+        if row.incursions_preview
+        else []
+    )
+    score_lines = [
+        ft.Text(
+            f"Puntuación total: {row.score_total}",
+            size=12,
+            color=ft.Colors.BLUE_GREY_700,
+        ),
+        ft.Text(
+            (
+                "Media/incursión: "
+                f"{format_score_average(row.score_average)} "
+                f"({row.completed_incursions} finalizadas)"
+            ),
+            size=12,
+            color=ft.Colors.BLUE_GREY_700,
+        ),
+    ]
+    return _period_card(row, action, preview_lines + score_lines)
+
+
 @ft.component
 def periods_view(
     era_id: str,
@@ -417,11 +322,13 @@ def periods_view(
     logger.debug("Rendering periods_view era_id=%s", era_id)
     page = ft.context.page
     service = get_firestore_service(page.session)
+    snapshots = get_snapshot_store(page.session)
     view_model, _ = ft.use_state(PeriodsViewModel())
     dialog_ref: ft.Ref[ft.AlertDialog | None] = ft.use_ref(None)
 
     def load() -> None:
-        view_model.ensure_loaded(service, era_id)
+        view_model.restore_snapshot(snapshots, era_id)
+        page.run_thread(view_model.ensure_loaded, service, era_id)
 
     ft.use_effect(load, [era_id])
 
@@ -433,6 +340,7 @@ def periods_view(
         register_route_loader(page, "/eras/{era_id}", loader)
 
     ft.use_effect(register_loader, [era_id])
+    use_route_prefetch(view_model.prefetch_routes())
 
     def show_toast() -> None:
         if not view_model.toast_message:
@@ -463,10 +371,42 @@ def periods_view(
 
     ft.use_effect(handle_navigation, [view_model.nav_version])
 
-    options = [
-        ft.dropdown.Option(item.adversary_id, item.name)
-        for item in sorted(get_adversary_catalog().values(), key=lambda item: item.name)
-    ]
+    dropdowns_ref: ft.Ref[dict[str, ft.Dropdown]] = ft.use_ref(dict)
+    adversaries = sorted(get_adversary_catalog().values(), key=lambda item: item.name)
+    adversary_ids = [item.adversary_id for item in adversaries]
+    adversary_names = {item.adversary_id: item.name for item in adversaries}
+
+    def build_adversary_options(incursion_id: str) -> list[ft.dropdown.Option]:
+        return [
+            ft.dropdown.Option(adversary_id, adversary_names[adversary_id])
+            for adversary_id in available_adversary_ids(
+                adversary_ids,
+                view_model.assignment_taken,
+                view_model.assignment_selections.get(incursion_id),
+            )
+        ]
+
+    def sync_assignment_dropdowns(incursion_ids: list[str]) -> None:
+        dropdowns = dropdowns_ref.current
+        changed: list[ft.Dropdown] = []
+        for incursion_id in incursion_ids:
+            dropdown = dropdowns.get(incursion_id)
+            if dropdown is None:
+                continue
+            dropdown.options = build_adversary_options(incursion_id)
+            dropdown.value = view_model.assignment_selections.get(incursion_id)
+            dropdown.error_text = _assignment_error_text(
+                view_model.assignment_errors.get(incursion_id, False)
+            )
+            changed.append(dropdown)
+        dialog = dialog_ref.current
+        if changed and dialog is not None and dialog.open:
+            page.update(*changed)
+
+    def handle_assignment_select(incursion_id: str, value: str | None) -> None:
+        if not view_model.set_assignment_selection(incursion_id, value):
+            return
+        sync_assignment_dropdowns(list(dropdowns_ref.current))
 
     def close_assignment_dialog_ui(_: ft.ControlEvent | None = None) -> None:
         view_model.close_assignment_dialog()
@@ -483,11 +423,10 @@ def periods_view(
         if not dialog:
             return
         if view_model.assignment_open:
-            configure_assignment_dialog(dialog)
             if dialog.open:
-                # Refresh in-place (dialog stays open) to show validation errors.
-                page.update()
+                sync_assignment_dropdowns(list(dropdowns_ref.current))
                 return
+            configure_assignment_dialog(dialog)
             page.show_dialog(dialog)
             return
         if dialog.open:
@@ -505,34 +444,28 @@ def periods_view(
         return dialog
 
     def configure_assignment_dialog(dialog: ft.AlertDialog) -> None:
-        page_width = float(
-            view_model.assignment_viewport_width
-            or page.width
-            or getattr(getattr(page, "window", None), "width", 0)
-            or 900.0
-        )
-        page_height = float(
-            view_model.assignment_viewport_height
-            or page.height
-            or getattr(getattr(page, "window", None), "height", 0)
-            or 700.0
+        dialog_width, dialog_height = _assignment_dialog_size(
+            get_resize_broker(page).size
         )
-        dialog_width = min(960.0, max(320.0, page_width - 48.0))
-        dialog_height = max(360.0, page_height * 0.9)
+        dropdowns: dict[str, ft.Dropdown] = {}
         list_view = ft.ListView(spacing=10, expand=True)
         for incursion in view_model.assignment_incursions:
             incursion_id = incursion.incursion_id
-            list_view.controls.append(
-                _assignment_card(
-                    incursion,
-                    view_model.assignment_selections.get(incursion_id),
-                    options,
-                    view_model.assignment_errors.get(incursion_id, False),
-                    lambda event, iid=incursion_id: view_model.set_assignment_selection(
-                        iid, event.control.value
-                    ),
-                )
+            dropdown = ft.Dropdown(
+                options=build_adversary_options(incursion_id),
+                value=view_model.assignment_selections.get(incursion_id),
+                error_text=_assignment_error_text(
+                    view_model.assignment_errors.get(incursion_id, False)
+                ),
+                on_select=lambda event, iid=incursion_id: handle_assignment_select(
+                    iid, event.control.value
+                ),
+                height=40,
+                width=220,
             )
+            dropdowns[incursion_id] = dropdown
+            list_view.controls.append(_assignment_card(incursion, dropdown))
+        dropdowns_ref.current = dropdowns
         dialog.title = ft.Text("Asignar adversarios")
         dialog.content = ft.Container(
             content=list_view,
@@ -550,185 +483,78 @@ def periods_view(
             ),
         ]
 
-    def register_resize_handler():
-        def update_viewport(
-            width: float | None,
-            height: float | None,
-        ) -> None:
-            resolved_width = float(
-                width
-                or page.width
-                or getattr(getattr(page, "window", None), "width", 0)
-                or 900.0
-            )
-            resolved_height = float(
-                height
-                or page.height
-                or getattr(getattr(page, "window", None), "height", 0)
-                or 700.0
-            )
-            view_model.set_assignment_viewport(resolved_width, resolved_height)
+    dialog_size = use_viewport_bucket(_assignment_dialog_size)
 
-        def on_resize(event: ft.ControlEvent) -> None:
-            update_viewport(
-                getattr(event, "width", None),
-                getattr(event, "height", None),
-            )
+    def resize_assignment_dialog() -> None:
+        dialog = dialog_ref.current
+        if dialog is None or not dialog.open:
+            return
+        content = dialog.content
+        if not isinstance(content, ft.Container):
+            return
+        content.width, content.height = dialog_size
+        dialog.update()
 
-        page.on_resize = on_resize
-        update_viewport(page.width, page.height)
-
-        def cleanup() -> None:
-            if page.on_resize == on_resize:
-                page.on_resize = None
-
-        return cleanup
-
-    ft.use_effect(register_resize_handler, [])
-
-    def build_period_card(row: PeriodRowModel) -> ft.Control:
-        action = None
-        if row.action in {"results", "incursions"}:
-
-            def handle_open_incursions(
-                event: ft.ControlEvent,
-                period_id: str = row.period_id,
-            ) -> None:
-                logger.info(
-                    "UI click open incursions era_id=%s period_id=%s control=%s",
-                    era_id,
-                    period_id,
-                    event.control,
-                )
-                try:
-                    view_model.request_open_period(period_id)
-                except Exception as exc:
-                    logger.exception(
-                        "Failed to handle open incursions era_id=%s period_id=%s error=%s",
-                        era_id,
-                        period_id,
-                        exc,
-                    )
-
-            action = ft.Button(
-                "Ver incursiones",
-                on_click=handle_open_incursions,
-            )
-        elif row.action == "assign":
-
-            def handle_assign_adversaries(
-                event: ft.ControlEvent,
-                period_id: str = row.period_id,
-            ) -> None:
-                logger.info(
-                    "UI click assign adversaries era_id=%s period_id=%s control=%s",
-                    era_id,
-                    period_id,
-                    event.control,
-                )
-                try:
-                    view_model.open_assignment_dialog(service, period_id)
-                    if not view_model.assignment_open:
-                        return
-                    dialog = ensure_assignment_dialog()
-                    configure_assignment_dialog(dialog)
-                    if dialog.open:
-                        return
-                    page.show_dialog(dialog)
-                except RuntimeError as exc:
-                    if "already opened" in str(exc).lower():
-                        logger.warning(
-                            "Assignment dialog already open; skipping reopen"
-                        )
-                        return
-                    raise
-                except Exception as exc:
-                    logger.exception(
-                        "Failed to handle assign adversaries era_id=%s period_id=%s error=%s",
-                        era_id,
-                        period_id,
-                        exc,
-                    )
-
-            action = ft.Button(
-                "Asignar adversarios",
-                on_click=handle_assign_adversaries,
+    ft.use_effect(resize_assignment_dialog, [dialog_size])
+
+    def open_incursions(period_id: str) -> None:
+        logger.info(
+            "UI click open incursions era_id=%s period_id=%s", era_id, period_id
+        )
+        try:
+            view_model.request_open_period(period_id)
+        except Exception as exc:
+            logger.exception(
+                "Failed to handle open incursions era_id=%s period_id=%s error=%s",
+                era_id,
+                period_id,
+                exc,
             )
-        elif row.action == "reveal":
-
-            def handle_reveal_period(
-                event: ft.ControlEvent,
-                period_id: str = row.period_id,
-            ) -> None:
-                logger.info(
-                    "UI click reveal period era_id=%s period_id=%s control=%s",
-                    era_id,
-                    period_id,
-                    event.control,
-                )
-                try:
-                    view_model.reveal_period(service, period_id)
-                except Exception as exc:
-                    logger.exception(
-                        "Failed to handle reveal period era_id=%s period_id=%s error=%s",
-                        era_id,
-                        period_id,
-                        exc,
-                    )
-
-            action = ft.Button(
-                "Revelar",
-                on_click=handle_reveal_period,
+
+    def assign_adversaries(period_id: str) -> None:
+        logger.info(
+            "UI click assign adversaries era_id=%s period_id=%s", era_id, period_id
+        )
+        try:
+            view_model.open_assignment_dialog(service, period_id)
+            if not view_model.assignment_open:
+                return
+            dialog = ensure_assignment_dialog()
+            configure_assignment_dialog(dialog)
+            if dialog.open:
+                return
+            page.show_dialog(dialog)
+        except RuntimeError as exc:
+            if "already opened" in str(exc).lower():
+                logger.warning("Assignment dialog already open; skipping reopen")
+                return
+            raise
+        except Exception as exc:
+            logger.exception(
+                "Failed to handle assign adversaries era_id=%s period_id=%s error=%s",
+                era_id,
+                period_id,
+                exc,
             )
-        elif row.status_label == "Pendiente":
-
-            def handle_reveal_pending_period(
-                event: ft.ControlEvent,
-                period_id: str = row.period_id,
-            ) -> None:
-                logger.info(
-                    "UI click reveal pending period era_id=%s period_id=%s control=%s",
-                    era_id,
-                    period_id,
-                    event.control,
-                )
-                try:
-                    view_model.reveal_period(service, period_id)
-                except Exception as exc:
-                    logger.exception(
-                        "Failed to handle reveal pending period era_id=%s period_id=%s error=%s",
-                        era_id,
-                        period_id,
-                        exc,
-                    )
-
-            action = ft.Button(
-                "Revelar",
-                on_click=handle_reveal_pending_period,
+
+    def reveal_period(period_id: str) -> None:
+        logger.info("UI click reveal period era_id=%s period_id=%s", era_id, period_id)
+        try:
+            view_model.reveal_period(service, period_id)
+        except Exception as exc:
+            logger.exception(
+                "Failed to handle reveal period era_id=%s period_id=%s error=%s",
+                era_id,
+                period_id,
+                exc,
             )
 
-        preview_lines = (
-            _incursions_preview(list(row.incursions_preview))
-            if row.incursions_preview
-            else []
-        )
-        score_lines = [
-            ft.Text(
-                f"Puntuación total: {row.score_total}",
-                size=12,
-                color=ft.Colors.BLUE_GREY_700,
-            ),
-            ft.Text(
-                (
-                    "Media/incursión: "
-                    f"{format_score_average(row.score_average)} "
-                    f"({row.completed_incursions} finalizadas)"
-                ),
-                size=12,
-                color=ft.Colors.BLUE_GREY_700,
-            ),
-        ]
-        return _period_card(row, action, preview_lines + score_lines)
+    on_open_incursions = ft.use_callback(open_incursions, [era_id])
+    on_assign_adversaries = ft.use_callback(assign_adversaries, [era_id])
+    on_reveal_period = ft.use_callback(reveal_period, [era_id])
+    visible_count, handle_scroll, show_more = use_lazy_window(
+        len(view_model.rows), reset_key=era_id
+    )
 
     content_controls: list[ft.Control] = []
     if view_model.loading:
@@ -736,9 +562,20 @@ def periods_view(
     elif not view_model.rows:
         content_controls.append(ft.Text("No hay períodos disponibles."))
     else:
-        content_controls.extend(build_period_card(row) for row in view_model.rows)
+        content_controls.extend(
+            period_card(
+                row,
+                on_open_incursions,
+                on_assign_adversaries,
+                on_reveal_period,
+                key=row.period_id,
+            )
+            for row in view_model.rows[:visible_count]
+        )
+        if visible_count < len(view_model.rows):
+            content_controls.append(show_more_row("Mostrar más períodos", show_more))
 
-    periods_list = ft.ListView(spacing=8, expand=True, controls=content_controls)
+    periods_list = lazy_list_view(content_controls, handle_scroll)
     era_label = _extract_index(era_id) or era_id
     context_header = ft.Text(
         f"Era {era_label}",
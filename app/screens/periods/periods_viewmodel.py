@@ -7,15 +7,38 @@ from screens.periods.periods_model import (
     PeriodRowModel,
     build_assignment_incursions,
     build_period_rows,
+    collect_taken_adversaries,
 )
+from services.firestore_records import IncursionDoc
 from services.firestore_service import FirestoreService
+from services.snapshot_store import SnapshotStore
 from utils.logger import get_logger
+from utils.observable import BatchedObservable, batched
 
 logger = get_logger(__name__)
 
+PERIOD_ROW_FIELDS = (
+    "index",
+    "revealed_at",
+    "adversaries_assigned_at",
+    "ended_at",
+    "incursions_count",
+    "incursions",
+)
+PERIOD_PREVIEW_INCURSION_FIELDS = ("index", "spirit_1_id", "spirit_2_id", "score")
+ASSIGNMENT_INCURSION_FIELDS = (
+    "index",
+    "spirit_1_id",
+    "spirit_2_id",
+    "board_1",
+    "board_2",
+    "board_layout",
+    "adversary_id",
+)
+
 
 @ft.observable
-class PeriodsViewModel:
+class PeriodsViewModel(BatchedObservable):
     def __init__(self) -> None:
         self.era_id: str | None = None
         self.rows: list[PeriodRowModel] = []
@@ -25,34 +48,56 @@ class PeriodsViewModel:
         self.assignment_incursions: list[AssignmentIncursionModel] = []
         self.assignment_selections: dict[str, str | None] = {}
         self.assignment_errors: dict[str, bool] = {}
+        self.assignment_taken: frozenset[str] = frozenset()
         self.assignment_open = False
-        self.assignment_viewport_width: float | None = None
-        self.assignment_viewport_height: float | None = None
         self.assignment_version = 0
         self.toast_message: str | None = None
         self.toast_version = 0
         self.navigate_to: str | None = None
         self.nav_version = 0
+        self.snapshots: SnapshotStore | None = None
 
+    @property
+    def route(self) -> str:
+        return f"/eras/{self.era_id}"
+
+    @batched
+    def restore_snapshot(self, snapshots: SnapshotStore | None, era_id: str) -> None:
+        self.snapshots = snapshots
+        if self.era_id != era_id:
+            self.era_id = era_id
+            cached = snapshots.get(self.route) if snapshots else None
+            self.rows = list(cached) if cached else []
+        self.loading = not self.rows
+
+    @batched
     def ensure_loaded(self, service: FirestoreService, era_id: str) -> None:
         self.era_id = era_id
+        service.open_era(era_id)
         self.load_periods(service)
 
+    @batched
     def load_periods(self, service: FirestoreService) -> None:
         if not self.era_id:
             return
         logger.info("Firestore list periods era_id=%s", self.era_id)
-        self.loading = True
+        self.loading = not self.rows
         self.error = None
         try:
-            periods = service.list_periods(self.era_id)
-            incursions_by_period: dict[str, list[dict]] = {}
+            periods = service.list_periods(self.era_id, fields=PERIOD_ROW_FIELDS)
+            incursions_by_period: dict[str, list[IncursionDoc]] = {}
             for period in periods:
-                if period.get("revealed_at"):
-                    incursions_by_period[period["id"]] = service.list_incursions(
-                        self.era_id, period["id"]
+                if period.revealed_at is not None:
+                    incursions_by_period[period.id] = service.list_incursions(
+                        self.era_id,
+                        period.id,
+                        fields=PERIOD_PREVIEW_INCURSION_FIELDS,
                     )
-            self.rows = build_period_rows(periods, incursions_by_period)
+            rows = build_period_rows(periods, incursions_by_period)
+            if rows != self.rows:
+                self.rows = rows
+            if self.snapshots is not None:
+                self.snapshots.put(self.route, list(rows))
         except Exception as exc:
             logger.error(
                 "Failed to load periods era_id=%s error=%s",
@@ -60,12 +105,20 @@ class PeriodsViewModel:
                 exc,
                 exc_info=True,
             )
-            self.error = "load_failed"
-            self.rows = []
+            if not self.rows:
+                self.error = "load_failed"
             self.show_toast("No se pudieron cargar los períodos.")
         finally:
             self.loading = False
 
+    def prefetch_routes(self) -> list[str]:
+        return [
+            f"{self.route}/periods/{row.period_id}"
+            for row in self.rows
+            if row.action == "incursions"
+        ][:1]
+
+    @batched
     def request_open_period(self, period_id: str) -> None:
         if not self.era_id:
             return
@@ -73,36 +126,31 @@ class PeriodsViewModel:
         self.navigate_to = f"/eras/{self.era_id}/periods/{period_id}"
         self.nav_version += 1
 
+    @batched
     def open_assignment_dialog(
         self, service: FirestoreService, period_id: str
     ) -> None:
         if not self.era_id:
             return
         logger.info("UI open assignment dialog period_id=%s", period_id)
-        incursions = service.list_incursions(self.era_id, period_id)
-        pending = [item for item in incursions if not item.get("adversary_id")]
+        incursions = service.list_incursions(
+            self.era_id, period_id, fields=ASSIGNMENT_INCURSION_FIELDS
+        )
+        pending = [item for item in incursions if not item.adversary_id]
         if not pending:
             self.show_toast("No hay incursiones pendientes de asignar.")
             return
         self.assignment_period_id = period_id
         self.assignment_incursions = build_assignment_incursions(pending)
         self.assignment_selections = {
-            incursion["id"]: incursion.get("adversary_id") for incursion in pending
+            incursion.id: incursion.adversary_id for incursion in pending
         }
+        self.assignment_taken = collect_taken_adversaries(self.assignment_selections)
         self.assignment_errors = {}
         self.assignment_open = True
         self.assignment_version += 1
 
-    def set_assignment_viewport(self, width: float, height: float) -> None:
-        if (
-            self.assignment_viewport_width == width
-            and self.assignment_viewport_height == height
-        ):
-            return
-        self.assignment_viewport_width = width
-        self.assignment_viewport_height = height
-        self.assignment_version += 1
-
+    @batched
     def reveal_period(self, service: FirestoreService, period_id: str) -> None:
         if not self.era_id:
             return
@@ -126,6 +174,7 @@ class PeriodsViewModel:
             return
         self.load_periods(service)
 
+    @batched
     def close_assignment_dialog(self) -> None:
         if not self.assignment_open:
             return
@@ -135,14 +184,19 @@ class PeriodsViewModel:
         self.assignment_open = False
         self.assignment_version += 1
 
+    @batched
     def set_assignment_selection(
         self, incursion_id: str, adversary_id: str | None
-    ) -> None:
+    ) -> bool:
+        if self.assignment_selections.get(incursion_id) == adversary_id:
+            return False
         self.assignment_selections[incursion_id] = adversary_id
+        self.assignment_taken = collect_taken_adversaries(self.assignment_selections)
         if incursion_id in self.assignment_errors:
             self.assignment_errors.pop(incursion_id, None)
-        self.assignment_version += 1
+        return True
 
+    @batched
     def validate_assignments(self) -> bool:
         missing = [
             incursion_id
@@ -156,6 +210,7 @@ class PeriodsViewModel:
         self.show_toast("Selecciona un adversario para cada incursión.")
         return False
 
+    @batched
     def save_assignment(self, service: FirestoreService) -> None:
         if not self.assignment_period_id or not self.era_id:
             return
@@ -190,6 +245,7 @@ class PeriodsViewModel:
         self.assignment_version += 1
         self.load_periods(service)
 
+    @batched
     def show_toast(self, text: str) -> None:
         logger.info("User message shown: %s", text)
         self.toast_message = text
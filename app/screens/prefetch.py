@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from threading import Event, Lock
+from typing import Any, Callable, Iterator, Sequence
+from weakref import WeakKeyDictionary
+
+import flet as ft
+
+from screens.eras.eras_viewmodel import ErasViewModel
+from screens.incursion_detail.incursion_detail_viewmodel import IncursionDetailViewModel
+from screens.incursions.incursions_viewmodel import IncursionsViewModel
+from screens.periods.periods_viewmodel import PeriodsViewModel
+from services.firestore_service import FirestoreService
+from services.service_registry import get_firestore_service, get_snapshot_store
+from services.snapshot_store import SnapshotStore
+from utils.logger import get_logger
+from utils.router import add_route_listener, resolve_route_target
+
+logger = get_logger(__name__)
+
+PREFETCH_READ_BUDGET = 40
+PREFETCH_IDLE_SECONDS = 0.8
+PREFETCH_READ_METHODS = frozenset(
+    {
+        "list_eras",
+        "get_era",
+        "get_active_incursion",
+        "list_periods",
+        "list_incursions",
+        "iter_sessions",
+    }
+)
+
+Runner = Callable[..., None]
+
+_PREFETCHERS: WeakKeyDictionary[ft.Page, "RoutePrefetcher"] = WeakKeyDictionary()
+
+
+class PrefetchStopped(BaseException):
+    """Raised inside a prefetch read; BaseException so view-model loaders let it through."""
+
+
+def _run_inline(handler: Callable[..., None], *args: Any) -> None:
+    handler(*args)
+
+
+def _documents_read(result: Any) -> int:
+    # Firestore bills an empty query or a missing document as one read.
+    if isinstance(result, (list, tuple)):
+        return max(1, len(result))
+    return 1
+
+
+class _BudgetedService:
+    """Service proxy that charges each read by the documents it returns."""
+
+    def __init__(self, service: FirestoreService, budget: int, cancelled: Event) -> None:
+        self._service = service
+        self._budget = budget
+        self._cancelled = cancelled
+        self.reads = 0
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._service, name)
+        if name not in PREFETCH_READ_METHODS:
+            return attr
+
+        def read(*args: Any, **kwargs: Any) -> Any:
+            if self._cancelled.is_set():
+                raise PrefetchStopped("cancelled")
+            if self.reads >= self._budget:
+                raise PrefetchStopped("budget")
+            result = attr(*args, **kwargs)
+            streamed = isinstance(result, Iterator)
+            if streamed:
+                result = list(result)
+            self.reads += _documents_read(result)
+            if self.reads > self._budget:
+                raise PrefetchStopped("budget")
+            return iter(result) if streamed else result
+
+        return read
+
+
+class RoutePrefetcher:
+    """Warms route snapshots for the likely next screen while the current one is idle."""
+
+    def __init__(
+        self,
+        service: FirestoreService,
+        snapshots: SnapshotStore,
+        read_budget: int = PREFETCH_READ_BUDGET,
+        idle_seconds: float = PREFETCH_IDLE_SECONDS,
+    ) -> None:
+        self.service = service
+        self.snapshots = snapshots
+        self.read_budget = read_budget
+        self.idle_seconds = idle_seconds
+        self._lock = Lock()
+        self._cancelled = Event()
+
+    def schedule(
+        self, routes: Sequence[str], run: Runner = _run_inline
+    ) -> Callable[[], None]:
+        cancelled = Event()
+        with self._lock:
+            self._cancelled.set()
+            self._cancelled = cancelled
+        if routes:
+            run(self._prefetch, tuple(routes), cancelled)
+        return cancelled.set
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled.set()
+
+    def _prefetch(self, routes: tuple[str, ...], cancelled: Event) -> None:
+        if cancelled.wait(self.idle_seconds):
+            return
+        service = _BudgetedService(self.service, self.read_budget, cancelled)
+        for route in routes:
+            if not self._is_mirrored(route):
+                logger.debug("Prefetch skipped route=%s reason=unmirrored", route)
+                continue
+            try:
+                self._load_route(route, service)
+            except PrefetchStopped as stop:
+                logger.debug(
+                    "Prefetch stopped route=%s reason=%s reads=%s", route, stop, service.reads
+                )
+                return
+            logger.debug("Prefetched route=%s reads=%s", route, service.reads)
+
+    def _is_mirrored(self, route: str) -> bool:
+        # Eras nobody has opened are not mirrored; leave them to the screen
+        # that opens them instead of spending the budget on Firestore reads.
+        store = getattr(self.service, "store", None)
+        era_id = resolve_route_target(route)[1].get("era_id")
+        return store is None or era_id is None or store.mirrored_at(era_id) is not None
+
+    def _load_route(self, route: str, service: _BudgetedService) -> None:
+        target, params = resolve_route_target(route)
+        if target == "/eras":
+            eras = ErasViewModel()
+            eras.restore_snapshot(self.snapshots)
+            eras.load_eras(service)
+        elif target == "/eras/{era_id}":
+            periods = PeriodsViewModel()
+            periods.restore_snapshot(self.snapshots, params["era_id"])
+            periods.load_periods(service)
+        elif target == "/eras/{era_id}/periods/{period_id}":
+            incursions = IncursionsViewModel()
+            incursions.restore_snapshot(
+                self.snapshots, params["era_id"], params["period_id"]
+            )
+            incursions.load_incursions(service)
+        else:
+            detail = IncursionDetailViewModel()
+            detail.restore_snapshot(
+                self.snapshots,
+                params["era_id"],
+                params["period_id"],
+                params["incursion_id"],
+            )
+            detail.load_detail(service)
+
+
+def get_route_prefetcher(page: ft.Page) -> RoutePrefetcher | None:
+    prefetcher = _PREFETCHERS.get(page)
+    if prefetcher is not None:
+        return prefetcher
+    service = get_firestore_service(page.session)
+    snapshots = get_snapshot_store(page.session)
+    if service is None or snapshots is None:
+        return None
+    prefetcher = RoutePrefetcher(service, snapshots)
+    add_route_listener(page, lambda _route: prefetcher.cancel())
+    _PREFETCHERS[page] = prefetcher
+    return prefetcher
+
+
+def use_route_prefetch(routes: Sequence[str]) -> None:
+    page = ft.context.page
+
+    def schedule():
+        prefetcher = get_route_prefetcher(page)
+        if prefetcher is None or not routes:
+            return None
+        return prefetcher.schedule(routes, page.run_thread)
+
+    ft.use_effect(schedule, [tuple(routes)])
@@ -2,6 +2,10 @@ from __future__ import annotations
 
 import flet as ft
 
+from screens.layout_geometry import BoardPlacement
+
+CENTER_ALIGN = ft.Alignment(0, 0)
+
 
 def header_text(text: str) -> ft.Text:
     return ft.Text(text, size=22, weight=ft.FontWeight.BOLD)
@@ -43,3 +47,29 @@ def action_button(
     if variant == "outlined":
         return ft.OutlinedButton(label, icon=icon, on_click=on_click, disabled=disabled)
     return ft.Button(label, icon=icon, on_click=on_click, disabled=disabled)
+
+
+def board_frame(
+    placement: BoardPlacement,
+    image_border: ft.Border | None = None,
+    frame_border: ft.Border | None = None,
+) -> ft.Container:
+    return ft.Container(
+        content=ft.Container(
+            content=ft.Image(
+                src=f"boards/{placement.board_id}.png",
+                fit=ft.BoxFit.CONTAIN,
+                expand=True,
+            ),
+            alignment=ft.Alignment.CENTER,
+            expand=True,
+            border=image_border,
+        ),
+        alignment=ft.Alignment.CENTER,
+        border=frame_border,
+        rotate=ft.Rotate(angle=placement.rotation, alignment=CENTER_ALIGN),
+        width=placement.width,
+        height=placement.height,
+        left=placement.left,
+        top=placement.top,
+    )
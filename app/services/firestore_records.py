@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Protocol
+
+
+class Snapshot(Protocol):
+    id: str
+
+    def to_dict(self) -> dict[str, Any] | None: ...
+
+
+def normalize_timestamp(value: Any) -> datetime | None:
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _int(value: Any) -> int | None:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return int(value)
+
+
+def _str(value: Any) -> str | None:
+    return value if isinstance(value, str) and value else None
+
+
+@dataclass(frozen=True, slots=True)
+class EraDoc:
+    id: str
+    is_active: bool = False
+    active_incursion_id: str | None = None
+    created_at: datetime | None = None
+
+    @classmethod
+    def from_data(cls, doc_id: str, data: dict[str, Any]) -> EraDoc:
+        return cls(
+            id=doc_id,
+            is_active=bool(data.get("is_active")),
+            active_incursion_id=_str(data.get("active_incursion_id")),
+            created_at=normalize_timestamp(data.get("created_at")),
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Snapshot) -> EraDoc:
+        return cls.from_data(snapshot.id, snapshot.to_dict() or {})
+
+
+@dataclass(frozen=True, slots=True)
+class PeriodDoc:
+    id: str
+    index: int = 0
+    revealed_at: datetime | None = None
+    adversaries_assigned_at: datetime | None = None
+    ended_at: datetime | None = None
+    incursions_count: int | None = None
+
+    @classmethod
+    def from_data(cls, doc_id: str, data: dict[str, Any]) -> PeriodDoc:
+        incursions_count = data.get("incursions_count")
+        if incursions_count is None:
+            incursions_count = data.get("incursions")
+        if isinstance(incursions_count, (list, tuple)):
+            incursions_count = len(incursions_count)
+        return cls(
+            id=doc_id,
+            index=_int(data.get("index")) or 0,
+            revealed_at=normalize_timestamp(data.get("revealed_at")),
+            adversaries_assigned_at=normalize_timestamp(
+                data.get("adversaries_assigned_at")
+            ),
+            ended_at=normalize_timestamp(data.get("ended_at")),
+            incursions_count=_int(incursions_count),
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Snapshot) -> PeriodDoc:
+        return cls.from_data(snapshot.id, snapshot.to_dict() or {})
+
+
+@dataclass(frozen=True, slots=True)
+class IncursionDoc:
+    id: str
+    index: int = 0
+    spirit_1_id: str | None = None
+    spirit_2_id: str | None = None
+    board_1: str | None = None
+    board_2: str | None = None
+    board_layout: str | None = None
+    adversary_id: str | None = None
+    adversary_level: str | None = None
+    difficulty: int | None = None
+    is_active: bool = False
+    started_at: datetime | None = None
+    ended_at: datetime | None = None
+    result: str | None = None
+    score: int | None = None
+    dahan_alive: int | None = None
+    blight_on_island: int | None = None
+    player_count: int | None = None
+    invader_cards_remaining: int | None = None
+    invader_cards_out_of_deck: int | None = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.ended_at is not None or self.result is not None
+
+    @classmethod
+    def from_data(cls, doc_id: str, data: dict[str, Any]) -> IncursionDoc:
+        return cls(
+            id=doc_id,
+            index=_int(data.get("index")) or 0,
+            spirit_1_id=_str(data.get("spirit_1_id")),
+            spirit_2_id=_str(data.get("spirit_2_id")),
+            board_1=_str(data.get("board_1")),
+            board_2=_str(data.get("board_2")),
+            board_layout=_str(data.get("board_layout")),
+            adversary_id=_str(data.get("adversary_id")),
+            adversary_level=_str(data.get("adversary_level")),
+            difficulty=_int(data.get("difficulty")),
+            is_active=bool(data.get("is_active")),
+            started_at=normalize_timestamp(data.get("started_at")),
+            ended_at=normalize_timestamp(data.get("ended_at")),
+            result=_str(data.get("result")),
+            score=_int(data.get("score")),
+            dahan_alive=_int(data.get("dahan_alive")),
+            blight_on_island=_int(data.get("blight_on_island")),
+            player_count=_int(data.get("player_count")),
+            invader_cards_remaining=_int(data.get("invader_cards_remaining")),
+            invader_cards_out_of_deck=_int(data.get("invader_cards_out_of_deck")),
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Snapshot) -> IncursionDoc:
+        return cls.from_data(snapshot.id, snapshot.to_dict() or {})
+
+
+@dataclass(frozen=True, slots=True)
+class SessionDoc:
+    id: str
+    started_at: datetime | None = None
+    ended_at: datetime | None = None
+
+    @classmethod
+    def from_data(cls, doc_id: str, data: dict[str, Any]) -> SessionDoc:
+        return cls(
+            id=doc_id,
+            started_at=normalize_timestamp(data.get("started_at")),
+            ended_at=normalize_timestamp(data.get("ended_at")),
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Snapshot) -> SessionDoc:
+        return cls.from_data(snapshot.id, snapshot.to_dict() or {})
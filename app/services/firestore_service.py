@@ -1,17 +1,28 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable, Iterator, Sequence, TypeVar
 
 import firebase_admin
 from firebase_admin import firestore
+from google.cloud.firestore_v1.field_path import FieldPath
 from services.firebase_init import ensure_firebase_initialized
+from services.firestore_records import (
+    EraDoc,
+    IncursionDoc,
+    PeriodDoc,
+    SessionDoc,
+    Snapshot,
+)
 from services.score_service import calculate_score
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+ERA_LIST_FIELDS = ("is_active", "active_incursion_id")
+
+RecordT = TypeVar("RecordT")
 
 @dataclass(frozen=True)
 class ActiveIncursion:
@@ -44,44 +55,72 @@ class FirestoreService:
         logger.debug("UTC now=%s", now)
         return now
 
-    def list_eras(self) -> list[dict[str, Any]]:
-        logger.debug("Listing eras")
-        eras = []
-        for doc in self.db.collection("eras").stream():
-            data = doc.to_dict()
-            data["id"] = doc.id
-            eras.append(data)
+    def list_eras(
+        self,
+        limit: int | None = None,
+        start_after: str | None = None,
+        fields: tuple[str, ...] | None = ERA_LIST_FIELDS,
+    ) -> list[EraDoc]:
+        logger.debug("Listing eras limit=%s start_after=%s", limit, start_after)
+        document_id = FieldPath.document_id()
+        query = self.db.collection("eras").order_by(document_id)
+        if fields is not None:
+            query = query.select(list(fields))
+        if start_after is not None:
+            query = query.start_after({document_id: start_after})
+        if limit is not None:
+            query = query.limit(limit)
+        eras = self._stream_records(query, EraDoc.from_snapshot)
         logger.debug("Listed eras count=%s", len(eras))
         return eras
 
-    def list_periods(self, era_id: str) -> list[dict[str, Any]]:
-        logger.debug("Listing periods era_id=%s", era_id)
-        periods = []
-        for doc in (
-            self.db.collection("eras").document(era_id).collection("periods").stream()
-        ):
-            data = doc.to_dict()
-            data["id"] = doc.id
-            periods.append(data)
-        periods_sorted = sorted(periods, key=lambda item: item.get("index", 0))
+    @staticmethod
+    def _project(
+        query: firestore.Query, fields: Sequence[str] | None, *required: str
+    ) -> firestore.Query:
+        # Sorting keys are always fetched so projected listings keep their order.
+        if fields is None:
+            return query
+        return query.select(sorted({*fields, *required}))
+
+    @staticmethod
+    def _stream_records(
+        query: firestore.Query, decode: Callable[[Snapshot], RecordT]
+    ) -> list[RecordT]:
+        return [decode(doc) for doc in query.stream()]
+
+    def list_periods(
+        self, era_id: str, fields: Sequence[str] | None = None
+    ) -> list[PeriodDoc]:
+        logger.debug("Listing periods era_id=%s fields=%s", era_id, fields)
+        query = self.db.collection("eras").document(era_id).collection("periods")
+        periods = self._stream_records(
+            self._project(query, fields, "index"), PeriodDoc.from_snapshot
+        )
+        periods_sorted = sorted(periods, key=lambda item: item.index)
         logger.debug("Listed periods count=%s era_id=%s", len(periods_sorted), era_id)
         return periods_sorted
 
-    def list_incursions(self, era_id: str, period_id: str) -> list[dict[str, Any]]:
-        logger.debug("Listing incursions era_id=%s period_id=%s", era_id, period_id)
-        incursions = []
-        for doc in (
+    def list_incursions(
+        self, era_id: str, period_id: str, fields: Sequence[str] | None = None
+    ) -> list[IncursionDoc]:
+        logger.debug(
+            "Listing incursions era_id=%s period_id=%s fields=%s",
+            era_id,
+            period_id,
+            fields,
+        )
+        query = (
             self.db.collection("eras")
             .document(era_id)
             .collection("periods")
             .document(period_id)
             .collection("incursions")
-            .stream()
-        ):
-            data = doc.to_dict()
-            data["id"] = doc.id
-            incursions.append(data)
-        incursions_sorted = sorted(incursions, key=lambda item: item.get("index", 0))
+        )
+        incursions = self._stream_records(
+            self._project(query, fields, "index"), IncursionDoc.from_snapshot
+        )
+        incursions_sorted = sorted(incursions, key=lambda item: item.index)
         logger.debug(
             "Listed incursions count=%s era_id=%s period_id=%s",
             len(incursions_sorted),
@@ -90,17 +129,30 @@ class FirestoreService:
         )
         return incursions_sorted
 
-    def list_sessions(
-        self, era_id: str, period_id: str, incursion_id: str
-    ) -> list[dict[str, Any]]:
+    def iter_sessions(
+        self,
+        era_id: str,
+        period_id: str,
+        incursion_id: str,
+        fields: Sequence[str] | None = None,
+        limit_to_last: int | None = None,
+        ordered: bool = True,
+    ) -> Iterator[SessionDoc]:
+        """Sessions ordered by `started_at` on the server.
+
+        Firestore leaves documents without the order field out of the result,
+        so legacy sessions missing `started_at` only appear with `ordered=False`
+        (unordered stream, used to mirror the whole history).
+        """
         logger.debug(
-            "Listing sessions era_id=%s period_id=%s incursion_id=%s",
+            "Streaming sessions era_id=%s period_id=%s incursion_id=%s last=%s ordered=%s",
             era_id,
             period_id,
             incursion_id,
+            limit_to_last,
+            ordered,
         )
-        sessions = []
-        for doc in (
+        query = (
             self.db.collection("eras")
             .document(era_id)
             .collection("periods")
@@ -108,20 +160,17 @@ class FirestoreService:
             .collection("incursions")
             .document(incursion_id)
             .collection("sessions")
-            .stream()
-        ):
-            data = doc.to_dict()
-            data["id"] = doc.id
-            sessions.append(data)
-        sessions.sort(key=lambda item: item.get("started_at") or self._utc_now())
-        logger.debug(
-            "Listed sessions count=%s era_id=%s period_id=%s incursion_id=%s",
-            len(sessions),
-            era_id,
-            period_id,
-            incursion_id,
         )
-        return sessions
+        if ordered:
+            query = query.order_by("started_at")
+        query = self._project(query, fields, "started_at")
+        if limit_to_last is not None:
+            # limit_to_last queries cannot be streamed; get() returns them in order.
+            snapshots = query.limit_to_last(limit_to_last).get()
+        else:
+            snapshots = query.stream()
+        for snapshot in snapshots:
+            yield SessionDoc.from_snapshot(snapshot)
 
     def _build_active_incursion_id(self, period_id: str, incursion_id: str) -> str:
         return f"{period_id}{self._ACTIVE_INCURSION_SEPARATOR}{incursion_id}"
@@ -148,12 +197,24 @@ class FirestoreService:
             return None
         return period_id, incursion_id
 
+    def open_era(self, era_id: str) -> None:
+        """No-op here; the offline service mirrors the era a screen opens."""
+
+    def get_era(self, era_id: str) -> EraDoc | None:
+        snapshot = self.db.collection("eras").document(era_id).get()
+        if not snapshot.exists:
+            return None
+        return EraDoc.from_snapshot(snapshot)
+
     def get_active_incursion(self, era_id: str) -> ActiveIncursion | None:
         logger.debug("Getting active incursion era_id=%s", era_id)
         era_ref = self.db.collection("eras").document(era_id)
-        era_data = era_ref.get().to_dict() or {}
-        active_incursion_id = era_data.get("active_incursion_id")
-        parsed = self._parse_active_incursion_id(active_incursion_id)
+        era = EraDoc.from_snapshot(era_ref.get(field_paths=["active_incursion_id"]))
+        return self.active_incursion_from_era(era)
+
+    def active_incursion_from_era(self, era: EraDoc) -> ActiveIncursion | None:
+        era_id = era.id
+        parsed = self._parse_active_incursion_id(era.active_incursion_id)
         if parsed:
             period_id, incursion_id = parsed
             logger.debug(
@@ -165,12 +226,14 @@ class FirestoreService:
         logger.debug("No active incursion found era_id=%s", era_id)
         return None
 
-    def reveal_period(self, era_id: str, period_id: str) -> None:
+    def reveal_period(
+        self, era_id: str, period_id: str, at: datetime | None = None
+    ) -> None:
         logger.info("Reveal period request era_id=%s period_id=%s", era_id, period_id)
-        periods = self.list_periods(era_id)
+        periods = self.list_periods(era_id, fields=("ended_at",))
         target_index: int | None = None
         for idx, period in enumerate(periods):
-            if period["id"] == period_id:
+            if period.id == period_id:
                 target_index = idx
                 break
         if target_index is None:
@@ -178,7 +241,7 @@ class FirestoreService:
             raise ValueError("Periodo no encontrado.")
         if target_index > 0:
             previous = periods[target_index - 1]
-            if not previous.get("ended_at"):
+            if previous.ended_at is None:
                 logger.warning(
                     "Cannot reveal period; previous not ended era_id=%s period_id=%s",
                     era_id,
@@ -198,12 +261,15 @@ class FirestoreService:
         if not snapshot.exists:
             logger.error("Periodo no encontrado in Firestore era_id=%s period_id=%s", era_id, period_id)
             raise ValueError("Periodo no encontrado.")
-        period_data = snapshot.to_dict() or {}
-        if period_data.get("revealed_at"):
+        revealed_at = PeriodDoc.from_snapshot(snapshot).revealed_at
+        if revealed_at is not None:
+            if at is not None and revealed_at == at:
+                logger.info("Period already revealed at=%s period_id=%s", at, period_id)
+                return
             logger.warning("Periodo ya revelado era_id=%s period_id=%s", era_id, period_id)
             raise ValueError("Este periodo ya esta revelado.")
         logger.debug("Updating period revealed_at era_id=%s period_id=%s", era_id, period_id)
-        period_ref.update({"revealed_at": self._utc_now()})
+        period_ref.update({"revealed_at": at or self._utc_now()})
         logger.info("Period revealed era_id=%s period_id=%s", era_id, period_id)
 
     def set_incursion_adversary(
@@ -226,16 +292,16 @@ class FirestoreService:
         if not period_snapshot.exists:
             logger.error("Periodo no encontrado era_id=%s period_id=%s", era_id, period_id)
             raise ValueError("Periodo no encontrado.")
-        period_data = period_snapshot.to_dict() or {}
-        if period_data.get("adversaries_assigned_at"):
+        period = PeriodDoc.from_snapshot(period_snapshot)
+        if period.adversaries_assigned_at is not None:
             logger.warning("Adversaries already assigned era_id=%s period_id=%s", era_id, period_id)
             raise ValueError(
                 "No puedes modificar adversarios cuando ya fueron asignados."
             )
-        if not period_data.get("revealed_at"):
+        if period.revealed_at is None:
             logger.warning("Periodo not revealed era_id=%s period_id=%s", era_id, period_id)
             raise ValueError("No puedes asignar adversarios sin revelar el periodo.")
-        if period_data.get("ended_at"):
+        if period.ended_at is not None:
             logger.warning("Periodo already ended era_id=%s period_id=%s", era_id, period_id)
             raise ValueError("No puedes modificar adversarios en un periodo finalizado.")
 
@@ -245,11 +311,17 @@ class FirestoreService:
             logger.error("Incursion no encontrada incursion_id=%s", incursion_id)
             raise ValueError("Incursion no encontrada.")
         logger.debug("Updating incursion adversary incursion_id=%s", incursion_id)
-        incursion_ref.update({"adversary_id": adversary_id})
+        incursion_ref.update(
+            {"adversary_id": adversary_id, "updated_at": firestore.SERVER_TIMESTAMP}
+        )
         logger.info("Incursion adversary updated incursion_id=%s", incursion_id)
 
     def assign_period_adversaries(
-        self, era_id: str, period_id: str, assignments: dict[str, str | None]
+        self,
+        era_id: str,
+        period_id: str,
+        assignments: dict[str, str | None],
+        at: datetime | None = None,
     ) -> None:
         logger.info(
             "Assign period adversaries era_id=%s period_id=%s assignments_count=%s",
@@ -267,14 +339,17 @@ class FirestoreService:
         if not period_snapshot.exists:
             logger.error("Periodo no encontrado era_id=%s period_id=%s", era_id, period_id)
             raise ValueError("Periodo no encontrado.")
-        period_data = period_snapshot.to_dict() or {}
-        if not period_data.get("revealed_at"):
+        period = PeriodDoc.from_snapshot(period_snapshot)
+        if at is not None and period.adversaries_assigned_at == at:
+            logger.info("Adversaries already assigned at=%s period_id=%s", at, period_id)
+            return
+        if period.revealed_at is None:
             logger.warning("Periodo not revealed era_id=%s period_id=%s", era_id, period_id)
             raise ValueError("No puedes asignar adversarios sin revelar el periodo.")
-        if period_data.get("ended_at"):
+        if period.ended_at is not None:
             logger.warning("Periodo already ended era_id=%s period_id=%s", era_id, period_id)
             raise ValueError("No puedes asignar adversarios en un periodo finalizado.")
-        if period_data.get("adversaries_assigned_at"):
+        if period.adversaries_assigned_at is not None:
             logger.warning(
                 "Periodo already has adversaries assigned era_id=%s period_id=%s",
                 era_id,
@@ -282,14 +357,14 @@ class FirestoreService:
             )
             raise ValueError("Este periodo ya tiene adversarios asignados.")
 
-        incursions = self.list_incursions(era_id, period_id)
+        incursions = self.list_incursions(era_id, period_id, fields=())
         if len(incursions) != 4:
             logger.warning(
                 "Invalid incursion count for assignments count=%s",
                 len(incursions),
             )
             raise ValueError("El periodo debe tener exactamente 4 incursiones.")
-        incursion_ids = {incursion["id"] for incursion in incursions}
+        incursion_ids = {incursion.id for incursion in incursions}
         if set(assignments.keys()) != incursion_ids:
             logger.warning(
                 "Assignment keys do not match incursions expected=%s actual=%s",
@@ -306,13 +381,20 @@ class FirestoreService:
             logger.warning("Duplicate adversaries in assignments")
             raise ValueError("Los adversarios deben ser distintos en el periodo.")
 
+        now = at or self._utc_now()
         batch = self.db.batch()
         for incursion in incursions:
-            incursion_ref = period_ref.collection("incursions").document(incursion["id"])
-            batch.update(incursion_ref, {"adversary_id": assignments[incursion["id"]]})
+            incursion_ref = period_ref.collection("incursions").document(incursion.id)
+            batch.update(
+                incursion_ref,
+                {
+                    "adversary_id": assignments[incursion.id],
+                    "updated_at": firestore.SERVER_TIMESTAMP,
+                },
+            )
         batch.update(
             period_ref,
-            {"adversaries_assigned_at": self._utc_now()},
+            {"adversaries_assigned_at": now},
         )
         logger.debug("Committing batch assignments period_id=%s", period_id)
         batch.commit()
@@ -323,27 +405,38 @@ class FirestoreService:
         era_id: str,
         period_id: str,
         incursion_id: str,
+        at: datetime | None = None,
+        session_id: str | None = None,
+        adversary_level: str | None = None,
+        difficulty: int | None = None,
     ) -> None:
         logger.info(
-            "Start session era_id=%s period_id=%s incursion_id=%s",
+            "Start session era_id=%s period_id=%s incursion_id=%s level=%s",
             era_id,
             period_id,
             incursion_id,
+            adversary_level,
         )
         era_ref = self.db.collection("eras").document(era_id)
         period_ref = era_ref.collection("periods").document(period_id)
+        incursion_ref = period_ref.collection("incursions").document(incursion_id)
+        sessions_ref = incursion_ref.collection("sessions")
+        if session_id is not None and sessions_ref.document(session_id).get().exists:
+            # A replay whose earlier commit landed but whose response was lost.
+            logger.info("Session already started session_id=%s", session_id)
+            return
         period_snapshot = period_ref.get()
         if not period_snapshot.exists:
             logger.error("Periodo no encontrado era_id=%s period_id=%s", era_id, period_id)
             raise ValueError("Periodo no encontrado.")
-        period_data = period_snapshot.to_dict() or {}
-        if not period_data.get("revealed_at"):
+        period = PeriodDoc.from_snapshot(period_snapshot)
+        if period.revealed_at is None:
             logger.warning("Periodo not revealed era_id=%s period_id=%s", era_id, period_id)
             raise ValueError("No puedes iniciar una incursion sin revelar el periodo.")
-        if period_data.get("ended_at"):
+        if period.ended_at is not None:
             logger.warning("Periodo already ended era_id=%s period_id=%s", era_id, period_id)
             raise ValueError("El periodo ya esta finalizado.")
-        if not period_data.get("adversaries_assigned_at"):
+        if period.adversaries_assigned_at is None:
             logger.warning("Adversaries not assigned era_id=%s period_id=%s", era_id, period_id)
             raise ValueError("Debes asignar adversarios antes de iniciar incursiones.")
 
@@ -355,38 +448,44 @@ class FirestoreService:
             logger.warning("Active incursion exists era_id=%s", era_id)
             raise ValueError("Ya existe una incursion activa en esta Era.")
 
-        incursion_ref = (
-            period_ref.collection("incursions").document(incursion_id)
-        )
         incursion_snapshot = incursion_ref.get()
         if not incursion_snapshot.exists:
             logger.error("Incursion no encontrada incursion_id=%s", incursion_id)
             raise ValueError("Incursion no encontrada.")
-        incursion_data = incursion_snapshot.to_dict() or {}
-        if incursion_data.get("ended_at") or incursion_data.get("result"):
+        incursion = IncursionDoc.from_snapshot(incursion_snapshot)
+        if incursion.is_finished:
             logger.warning("Incursion already ended incursion_id=%s", incursion_id)
             raise ValueError("La incursion ya esta finalizada.")
 
-        sessions_ref = incursion_ref.collection("sessions")
         open_sessions = list(sessions_ref.where("ended_at", "==", None).stream())
         if open_sessions:
             logger.warning("Open session already exists incursion_id=%s", incursion_id)
             raise ValueError("Ya hay una sesión abierta.")
 
-        has_sessions = bool(self.list_sessions(era_id, period_id, incursion_id))
+        # Unordered so legacy sessions without started_at also count.
+        has_sessions = any(True for _ in sessions_ref.select([]).limit(1).stream())
+        if adversary_level is not None:
+            if has_sessions:
+                logger.warning("Level change after sessions incursion_id=%s", incursion_id)
+                raise ValueError("El nivel ya no se puede cambiar.")
+            incursion = replace(
+                incursion, adversary_level=adversary_level, difficulty=difficulty
+            )
         if not has_sessions:
-            if not incursion_data.get("adversary_level"):
+            if not incursion.adversary_level:
                 logger.warning("Missing adversary level incursion_id=%s", incursion_id)
                 raise ValueError("Debes seleccionar un nivel válido.")
-            if incursion_data.get("difficulty") is None:
+            if incursion.difficulty is None:
                 logger.warning("Missing difficulty incursion_id=%s", incursion_id)
                 raise ValueError("Debes seleccionar un nivel válido.")
 
-            incursions = self.list_incursions(era_id, period_id)
+            incursions = self.list_incursions(
+                era_id, period_id, fields=("adversary_id",)
+            )
             if len(incursions) != 4:
                 logger.warning("Invalid incursion count=%s", len(incursions))
                 raise ValueError("El periodo debe tener exactamente 4 incursiones.")
-            adversaries = [incursion.get("adversary_id") for incursion in incursions]
+            adversaries = [item.adversary_id for item in incursions]
             if any(not adversary for adversary in adversaries):
                 logger.warning("Missing adversary assignment in period")
                 raise ValueError(
@@ -396,23 +495,29 @@ class FirestoreService:
                 logger.warning("Duplicate adversaries found in period")
                 raise ValueError("Los adversarios del periodo deben ser distintos.")
 
+        now = at or self._utc_now()
         update_data: dict[str, Any] = {"is_active": True}
-        if not incursion_data.get("started_at"):
-            update_data["started_at"] = self._utc_now()
-        logger.debug("Updating incursion start metadata incursion_id=%s", incursion_id)
-        incursion_ref.update(update_data)
+        if incursion.started_at is None:
+            update_data["started_at"] = now
+        if adversary_level is not None:
+            update_data["adversary_level"] = adversary_level
+            update_data["difficulty"] = difficulty
         active_incursion_id = self._build_active_incursion_id(period_id, incursion_id)
-        logger.debug("Updating era active incursion era_id=%s", era_id)
-        era_ref.update(
+        batch = self.db.batch()
+        batch.update(incursion_ref, update_data)
+        batch.update(
+            era_ref,
             {
                 "active_incursion_id": active_incursion_id,
                 "active_incursion": {
                     "period_id": period_id,
                     "incursion_id": incursion_id,
                 },
-            }
+            },
         )
-        self._create_session(incursion_ref)
+        self._create_session(batch, incursion_ref, now, session_id)
+        logger.debug("Committing session start incursion_id=%s", incursion_id)
+        batch.commit()
         logger.info("Session started incursion_id=%s", incursion_id)
 
     def update_incursion_adversary_level(
@@ -446,10 +551,17 @@ class FirestoreService:
         }
         if adversary_id is not None:
             update_data["adversary_id"] = adversary_id
+            update_data["updated_at"] = firestore.SERVER_TIMESTAMP
         incursion_ref.update(update_data)
         logger.info("Incursion adversary level updated incursion_id=%s", incursion_id)
 
-    def end_session(self, era_id: str, period_id: str, incursion_id: str) -> None:
+    def end_session(
+        self,
+        era_id: str,
+        period_id: str,
+        incursion_id: str,
+        at: datetime | None = None,
+    ) -> None:
         logger.info(
             "End session era_id=%s period_id=%s incursion_id=%s",
             era_id,
@@ -470,7 +582,7 @@ class FirestoreService:
             logger.warning("No open sessions to end incursion_id=%s", incursion_id)
             return
         logger.debug("Closing session id=%s", open_sessions[0].id)
-        open_sessions[0].reference.update({"ended_at": self._utc_now()})
+        open_sessions[0].reference.update({"ended_at": at or self._utc_now()})
         logger.info("Session ended incursion_id=%s", incursion_id)
 
     def finalize_incursion(
@@ -484,6 +596,7 @@ class FirestoreService:
         player_count: int | None = None,
         invader_cards_remaining: int | None = None,
         invader_cards_out_of_deck: int | None = None,
+        at: datetime | None = None,
     ) -> None:
         logger.info(
             "Finalize incursion era_id=%s period_id=%s incursion_id=%s result=%s",
@@ -492,21 +605,20 @@ class FirestoreService:
             incursion_id,
             result,
         )
-        incursion_ref = (
-            self.db.collection("eras")
-            .document(era_id)
-            .collection("periods")
-            .document(period_id)
-            .collection("incursions")
-            .document(incursion_id)
-        )
+        era_ref = self.db.collection("eras").document(era_id)
+        period_ref = era_ref.collection("periods").document(period_id)
+        incursion_ref = period_ref.collection("incursions").document(incursion_id)
         snapshot = incursion_ref.get()
-        incursion_data = snapshot.to_dict() or {}
-        if incursion_data.get("ended_at"):
+        incursion = IncursionDoc.from_snapshot(snapshot)
+        if incursion.ended_at is not None:
+            if at is not None and incursion.ended_at == at:
+                # A replay whose earlier commit landed but whose response was lost.
+                logger.info("Incursion already finalized at=%s incursion_id=%s", at, incursion_id)
+                return
             logger.error("Incursion already finalized incursion_id=%s", incursion_id)
             raise ValueError("La incursion ya esta finalizada. El score es inmutable.")
 
-        difficulty = int(incursion_data.get("difficulty", 0) or 0)
+        difficulty = incursion.difficulty or 0
         resolved_player_count = 2
         if result == "win":
             if invader_cards_remaining is None:
@@ -529,10 +641,9 @@ class FirestoreService:
             invader_cards_out_of_deck=invader_cards_out_of_deck,
         )
 
-        self.end_session(era_id, period_id, incursion_id)
-        logger.debug("Updating incursion finalize fields incursion_id=%s", incursion_id)
+        now = at or self._utc_now()
         update_payload: dict[str, object | None] = {
-            "ended_at": self._utc_now(),
+            "ended_at": now,
             "result": result,
             "dahan_alive": dahan_alive,
             "blight_on_island": blight_on_island,
@@ -544,32 +655,51 @@ class FirestoreService:
             update_payload["invader_cards_remaining"] = invader_cards_remaining
         if result == "loss":
             update_payload["invader_cards_out_of_deck"] = invader_cards_out_of_deck
-        incursion_ref.update(update_payload)
-        logger.debug("Clearing active incursion era_id=%s", era_id)
-        self.db.collection("eras").document(era_id).update(
+        open_sessions = list(
+            incursion_ref.collection("sessions").where("ended_at", "==", None).stream()
+        )
+        batch = self.db.batch()
+        for open_session in open_sessions:
+            batch.update(open_session.reference, {"ended_at": now})
+        batch.update(incursion_ref, update_payload)
+        batch.update(
+            era_ref,
             {
                 "active_incursion_id": firestore.DELETE_FIELD,
                 "active_incursion": firestore.DELETE_FIELD,
-            }
+            },
         )
-        if self._period_complete(era_id, period_id):
+        if self._period_complete(era_id, period_id, incursion_id):
             logger.info("Period completed; marking ended era_id=%s period_id=%s", era_id, period_id)
-            self.db.collection("eras").document(era_id).collection("periods").document(
-                period_id
-            ).update({"ended_at": self._utc_now()})
+            batch.update(period_ref, {"ended_at": now})
+        logger.debug("Committing finalize incursion_id=%s", incursion_id)
+        batch.commit()
         logger.info("Incursion finalized incursion_id=%s score=%s", incursion_id, score)
 
-    def _create_session(self, incursion_ref: firestore.DocumentReference) -> None:
+    def _create_session(
+        self,
+        batch: firestore.WriteBatch,
+        incursion_ref: firestore.DocumentReference,
+        started_at: datetime,
+        session_id: str | None = None,
+    ) -> None:
         logger.debug("Creating session for incursion_ref=%s", incursion_ref)
-        incursion_ref.collection("sessions").add(
-            {"started_at": self._utc_now(), "ended_at": None}
+        # Offline replays pass the id already used by the local mirror.
+        batch.set(
+            incursion_ref.collection("sessions").document(session_id),
+            {"started_at": started_at, "ended_at": None},
         )
-        logger.debug("Session created")
 
-    def _period_complete(self, era_id: str, period_id: str) -> bool:
+    def _period_complete(
+        self, era_id: str, period_id: str, finishing_incursion_id: str
+    ) -> bool:
         logger.debug("Checking period completion era_id=%s period_id=%s", era_id, period_id)
-        incursions = self.list_incursions(era_id, period_id)
-        complete = all(incursion.get("ended_at") for incursion in incursions)
+        incursions = self.list_incursions(era_id, period_id, fields=("ended_at",))
+        complete = all(
+            incursion.ended_at is not None
+            for incursion in incursions
+            if incursion.id != finishing_incursion_id
+        )
         logger.debug(
             "Period completion result=%s era_id=%s period_id=%s",
             complete,
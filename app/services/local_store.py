@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from threading import RLock
+from typing import Any, Final
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_STORAGE_ENV: Final[str] = "FLET_APP_STORAGE_DATA"
+_STORE_FILENAME: Final[str] = "spiritplanner_local.sqlite3"
+_TIMESTAMP_KEY: Final[str] = "__ts__"
+
+MUTATION_PENDING = "pending"
+MUTATION_CONFLICT = "conflict"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    parent TEXT NOT NULL,
+    era_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_parent ON documents (parent);
+CREATE INDEX IF NOT EXISTS documents_era ON documents (era_id);
+CREATE TABLE IF NOT EXISTS mirrored_eras (
+    era_id TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS mutations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    era_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    args TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS mutations_status ON mutations (status, id);
+"""
+
+
+@dataclass(frozen=True)
+class QueuedMutation:
+    id: int
+    era_id: str
+    kind: str
+    args: dict[str, Any]
+    attempts: int
+    next_attempt_at: float
+
+
+def default_store_path() -> Path:
+    storage_dir = os.getenv(_STORAGE_ENV, "").strip()
+    base_dir = Path(storage_dir) if storage_dir else Path.home() / ".spiritplanner"
+    return base_dir / _STORE_FILENAME
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {_TIMESTAMP_KEY: value.isoformat()}
+    raise TypeError(f"Unsupported value for local store: {value!r}")
+
+
+def _decode_object(value: dict[str, Any]) -> Any:
+    if len(value) == 1 and _TIMESTAMP_KEY in value:
+        return datetime.fromisoformat(value[_TIMESTAMP_KEY])
+    return value
+
+
+def encode_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=_encode_value)
+
+
+def decode_json(raw: str) -> Any:
+    return json.loads(raw, object_hook=_decode_object)
+
+
+def _parent_path(path: str) -> str:
+    return path.rsplit("/", 1)[0]
+
+
+def _era_id_of(path: str) -> str:
+    return path.split("/", 2)[1]
+
+
+class LocalStore:
+    """SQLite mirror of Firestore documents plus the durable mutation queue."""
+
+    def __init__(self, path: Path | str = ":memory:") -> None:
+        if isinstance(path, Path):
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = RLock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        logger.debug("Local store opened path=%s", path)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(self, path: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM documents WHERE path = ?", (path,)
+            ).fetchone()
+        return decode_json(row["data"]) if row else None
+
+    def children(self, parent: str) -> list[tuple[str, dict[str, Any]]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, data FROM documents WHERE parent = ?", (parent,)
+            ).fetchall()
+        return [(row["path"].rsplit("/", 1)[1], decode_json(row["data"])) for row in rows]
+
+    def mirrored_at(self, era_id: str) -> float | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_at FROM mirrored_eras WHERE era_id = ?", (era_id,)
+            ).fetchone()
+        return row["synced_at"] if row else None
+
+    def mirrored_era_ids(self) -> list[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT era_id FROM mirrored_eras ORDER BY era_id"
+            ).fetchall()
+        return [row["era_id"] for row in rows]
+
+    def replace_era(self, era_id: str, documents: dict[str, dict[str, Any]]) -> bool:
+        """Swap in a fresh copy of the era unless a local write was queued meanwhile."""
+        with self._lock, self._conn:
+            if self.has_pending(era_id):
+                logger.debug("Era mirror skipped; pending mutations era_id=%s", era_id)
+                return False
+            self._conn.execute("DELETE FROM documents WHERE era_id = ?", (era_id,))
+            self._conn.executemany(
+                "INSERT INTO documents (path, parent, era_id, data) VALUES (?, ?, ?, ?)",
+                [
+                    (path, _parent_path(path), era_id, encode_json(data))
+                    for path, data in documents.items()
+                ],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO mirrored_eras (era_id, synced_at) VALUES (?, ?)",
+                (era_id, time.time()),
+            )
+        logger.debug("Era mirrored era_id=%s documents=%s", era_id, len(documents))
+        return True
+
+    def apply(
+        self,
+        era_id: str,
+        updates: dict[str, dict[str, Any]],
+        kind: str,
+        args: dict[str, Any],
+    ) -> int:
+        """Merge `updates` into the mirror and queue the mutation in one transaction."""
+        with self._lock, self._conn:
+            for path, changes in updates.items():
+                row = self._conn.execute(
+                    "SELECT data FROM documents WHERE path = ?", (path,)
+                ).fetchone()
+                data = decode_json(row["data"]) if row else {}
+                data.update(changes)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO documents (path, parent, era_id, data) "
+                    "VALUES (?, ?, ?, ?)",
+                    (path, _parent_path(path), _era_id_of(path), encode_json(data)),
+                )
+            cursor = self._conn.execute(
+                "INSERT INTO mutations (era_id, kind, args) VALUES (?, ?, ?)",
+                (era_id, kind, encode_json(args)),
+            )
+        logger.debug("Mutation queued id=%s kind=%s era_id=%s", cursor.lastrowid, kind, era_id)
+        return int(cursor.lastrowid)
+
+    def pending_mutations(self) -> list[QueuedMutation]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, era_id, kind, args, attempts, next_attempt_at "
+                "FROM mutations WHERE status = ? ORDER BY id",
+                (MUTATION_PENDING,),
+            ).fetchall()
+        return [
+            QueuedMutation(
+                id=row["id"],
+                era_id=row["era_id"],
+                kind=row["kind"],
+                args=decode_json(row["args"]),
+                attempts=row["attempts"],
+                next_attempt_at=row["next_attempt_at"],
+            )
+            for row in rows
+        ]
+
+    def has_pending(self, era_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM mutations WHERE era_id = ? AND status = ? LIMIT 1",
+                (era_id, MUTATION_PENDING),
+            ).fetchone()
+        return row is not None
+
+    def complete(self, mutation_id: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM mutations WHERE id = ?", (mutation_id,))
+
+    def retry_later(self, mutation_id: int, error: str, next_attempt_at: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE mutations SET attempts = attempts + 1, next_attempt_at = ?, "
+                "last_error = ? WHERE id = ?",
+                (next_attempt_at, error, mutation_id),
+            )
+
+    def mark_conflict(self, mutation_id: int, error: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE mutations SET status = ?, attempts = attempts + 1, last_error = ? "
+                "WHERE id = ?",
+                (MUTATION_CONFLICT, error, mutation_id),
+            )
@@ -0,0 +1,686 @@
+from __future__ import annotations
+
+import time
+import uuid
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timezone
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Iterator, Sequence
+
+from services.firestore_records import EraDoc, IncursionDoc, PeriodDoc, SessionDoc
+from services.firestore_service import ERA_LIST_FIELDS, ActiveIncursion, FirestoreService
+from services.local_store import LocalStore
+from services.score_service import calculate_score
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SYNC_INTERVAL_SECONDS = 5.0
+MIRROR_MAX_AGE_SECONDS = 300.0
+MAX_RETRY_DELAY_SECONDS = 60.0
+ERA_LIST_CACHE_SECONDS = 5.0
+
+REPLAYABLE_MUTATIONS = frozenset(
+    {
+        "reveal_period",
+        "assign_period_adversaries",
+        "update_incursion_adversary_level",
+        "start_session",
+        "end_session",
+        "finalize_incursion",
+    }
+)
+
+
+@dataclass(frozen=True)
+class SyncConflict:
+    era_id: str
+    kind: str
+    message: str
+
+
+ConflictListener = Callable[[SyncConflict], None]
+
+
+def _era_path(era_id: str) -> str:
+    return f"eras/{era_id}"
+
+
+def _period_path(era_id: str, period_id: str) -> str:
+    return f"eras/{era_id}/periods/{period_id}"
+
+
+def _incursion_path(era_id: str, period_id: str, incursion_id: str) -> str:
+    return f"{_period_path(era_id, period_id)}/incursions/{incursion_id}"
+
+
+def _session_path(era_id: str, period_id: str, incursion_id: str, session_id: str) -> str:
+    return f"{_incursion_path(era_id, period_id, incursion_id)}/sessions/{session_id}"
+
+
+def _record_data(record: EraDoc | PeriodDoc | IncursionDoc | SessionDoc) -> dict[str, Any]:
+    data = asdict(record)
+    data.pop("id")
+    return data
+
+
+class OfflineFirstService:
+    """Reads and writes against the local mirror; a worker replays writes to Firestore.
+
+    An era is mirrored when a screen opens it or a write touches it. Until then
+    reads go straight to Firestore with their field projections.
+
+    Firestore re-validates every replayed mutation, so a ValueError there is a
+    conflict: the mutation is parked and the era is re-mirrored from Firestore.
+    """
+
+    def __init__(
+        self,
+        remote: FirestoreService,
+        store: LocalStore,
+        sync_interval: float = SYNC_INTERVAL_SECONDS,
+    ) -> None:
+        self.remote = remote
+        self.store = store
+        self._sync_interval = sync_interval
+        self._wake = Event()
+        self._stop = Event()
+        self._thread: Thread | None = None
+        self._refresh_lock = Lock()
+        self._refresh_era_ids: set[str] = set()
+        self._mirror_locks_guard = Lock()
+        self._mirror_locks: dict[str, Lock] = {}
+        self._era_list_lock = Lock()
+        self._era_list_cache: dict[tuple[Any, ...], tuple[float, list[EraDoc]]] = {}
+        self._conflict_lock = Lock()
+        self._conflict_listeners: list[ConflictListener] = []
+
+    @staticmethod
+    def _utc_now() -> datetime:
+        return datetime.now(timezone.utc)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name="offline-sync", daemon=True)
+        self._thread.start()
+        logger.info("Offline sync worker started")
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def request_sync(self) -> None:
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sync_once()
+            except Exception as exc:
+                logger.error("Offline sync pass failed error=%s", exc, exc_info=True)
+            self._wake.wait(self._sync_interval)
+            self._wake.clear()
+
+    def add_conflict_listener(self, listener: ConflictListener) -> Callable[[], None]:
+        """Call `listener` from the sync thread whenever Firestore rejects a queued write."""
+        with self._conflict_lock:
+            self._conflict_listeners.append(listener)
+
+        def remove() -> None:
+            with self._conflict_lock:
+                if listener in self._conflict_listeners:
+                    self._conflict_listeners.remove(listener)
+
+        return remove
+
+    def _notify_conflict(self, conflict: SyncConflict) -> None:
+        with self._conflict_lock:
+            listeners = list(self._conflict_listeners)
+        for listener in listeners:
+            try:
+                listener(conflict)
+            except Exception as exc:
+                logger.error("Conflict listener failed error=%s", exc, exc_info=True)
+
+    def _schedule_refresh(self, era_id: str) -> None:
+        with self._refresh_lock:
+            self._refresh_era_ids.add(era_id)
+
+    def mirror_era(self, era_id: str) -> bool:
+        logger.info("Mirroring era from Firestore era_id=%s", era_id)
+        era = self.remote.get_era(era_id)
+        if era is None:
+            raise ValueError("Era no encontrada.")
+        documents = {_era_path(era_id): _record_data(era)}
+        for period in self.remote.list_periods(era_id):
+            documents[_period_path(era_id, period.id)] = _record_data(period)
+            for incursion in self.remote.list_incursions(era_id, period.id):
+                documents[_incursion_path(era_id, period.id, incursion.id)] = (
+                    _record_data(incursion)
+                )
+                for session in self.remote.iter_sessions(
+                    era_id, period.id, incursion.id, ordered=False
+                ):
+                    path = _session_path(era_id, period.id, incursion.id, session.id)
+                    documents[path] = _record_data(session)
+        return self.store.replace_era(era_id, documents)
+
+    def replay_pending(self, now: float | None = None) -> int:
+        replayed = 0
+        now = time.time() if now is None else now
+        for mutation in self.store.pending_mutations():
+            if mutation.next_attempt_at > now:
+                break
+            if mutation.kind not in REPLAYABLE_MUTATIONS:
+                self.store.mark_conflict(mutation.id, f"Unknown mutation {mutation.kind}")
+                continue
+            try:
+                getattr(self.remote, mutation.kind)(**mutation.args)
+            except ValueError as exc:
+                logger.warning(
+                    "Mutation rejected by Firestore id=%s kind=%s error=%s",
+                    mutation.id,
+                    mutation.kind,
+                    exc,
+                )
+                self.store.mark_conflict(mutation.id, str(exc))
+                self._schedule_refresh(mutation.era_id)
+                self._notify_conflict(SyncConflict(mutation.era_id, mutation.kind, str(exc)))
+                continue
+            except Exception as exc:
+                # Keep queue order: nothing after a failed mutation is replayed yet.
+                delay = min(2**mutation.attempts, MAX_RETRY_DELAY_SECONDS)
+                logger.info(
+                    "Mutation replay failed id=%s retry_in=%ss error=%s",
+                    mutation.id,
+                    delay,
+                    exc,
+                )
+                self.store.retry_later(mutation.id, str(exc), now + delay)
+                break
+            self.store.complete(mutation.id)
+            replayed += 1
+        return replayed
+
+    def sync_once(self, now: float | None = None) -> int:
+        replayed = self.replay_pending(now)
+        if replayed:
+            self._invalidate_era_list()
+        with self._refresh_lock:
+            era_ids = sorted(self._refresh_era_ids)
+        for era_id in era_ids:
+            if self.store.has_pending(era_id):
+                continue
+            try:
+                if not self.mirror_era(era_id):
+                    continue
+            except Exception as exc:
+                logger.warning("Era refresh failed era_id=%s error=%s", era_id, exc)
+                continue
+            with self._refresh_lock:
+                self._refresh_era_ids.discard(era_id)
+        return replayed
+
+    def _mirror_lock(self, era_id: str) -> Lock:
+        with self._mirror_locks_guard:
+            return self._mirror_locks.setdefault(era_id, Lock())
+
+    def _is_mirrored(self, era_id: str) -> bool:
+        synced_at = self.store.mirrored_at(era_id)
+        if synced_at is None:
+            return False
+        if time.time() - synced_at > MIRROR_MAX_AGE_SECONDS:
+            self._schedule_refresh(era_id)
+            self.request_sync()
+        return True
+
+    def _ensure_mirrored(self, era_id: str) -> None:
+        if self._is_mirrored(era_id):
+            return
+        # Sessions opening the same era wait for a single mirror pass.
+        with self._mirror_lock(era_id):
+            if self.store.mirrored_at(era_id) is None:
+                self.mirror_era(era_id)
+
+    def open_era(self, era_id: str) -> None:
+        try:
+            self._ensure_mirrored(era_id)
+        except Exception as exc:
+            logger.warning(
+                "Era mirror failed; reading Firestore era_id=%s error=%s", era_id, exc
+            )
+
+    def _apply(
+        self,
+        era_id: str,
+        updates: dict[str, dict[str, Any]],
+        kind: str,
+        args: dict[str, Any],
+    ) -> None:
+        self.store.apply(era_id, updates, kind, args)
+        self._invalidate_era_list()
+        self.request_sync()
+
+    def _invalidate_era_list(self) -> None:
+        with self._era_list_lock:
+            self._era_list_cache.clear()
+
+    def _remote_eras(
+        self,
+        limit: int | None,
+        start_after: str | None,
+        fields: tuple[str, ...] | None,
+    ) -> list[EraDoc]:
+        key = (limit, start_after, tuple(fields) if fields is not None else None)
+        with self._era_list_lock:
+            now = time.monotonic()
+            cached = self._era_list_cache.get(key)
+            if cached is not None and now - cached[0] < ERA_LIST_CACHE_SECONDS:
+                return list(cached[1])
+            eras = self.remote.list_eras(limit=limit, start_after=start_after, fields=fields)
+            self._era_list_cache = {
+                cache_key: entry
+                for cache_key, entry in self._era_list_cache.items()
+                if now - entry[0] < ERA_LIST_CACHE_SECONDS
+            }
+            self._era_list_cache[key] = (now, eras)
+        return list(eras)
+
+    def _local_era(self, era_id: str) -> EraDoc | None:
+        data = self.store.get(_era_path(era_id))
+        return EraDoc.from_data(era_id, data) if data is not None else None
+
+    def list_eras(
+        self,
+        limit: int | None = None,
+        start_after: str | None = None,
+        fields: tuple[str, ...] | None = ERA_LIST_FIELDS,
+    ) -> list[EraDoc]:
+        try:
+            eras = self._remote_eras(limit, start_after, fields)
+        except Exception as exc:
+            logger.warning("Firestore eras unavailable; using local mirror error=%s", exc)
+            era_ids = [
+                era_id
+                for era_id in self.store.mirrored_era_ids()
+                if start_after is None or era_id > start_after
+            ]
+            if limit is not None:
+                era_ids = era_ids[:limit]
+            return [era for era in map(self._local_era, era_ids) if era is not None]
+        return [
+            (self._local_era(era.id) or era) if self.store.has_pending(era.id) else era
+            for era in eras
+        ]
+
+    def active_incursion_from_era(self, era: EraDoc) -> ActiveIncursion | None:
+        return self.remote.active_incursion_from_era(era)
+
+    def get_active_incursion(self, era_id: str) -> ActiveIncursion | None:
+        if not self._is_mirrored(era_id):
+            return self.remote.get_active_incursion(era_id)
+        era = self._local_era(era_id)
+        return self.active_incursion_from_era(era) if era is not None else None
+
+    def list_periods(
+        self, era_id: str, fields: Sequence[str] | None = None
+    ) -> list[PeriodDoc]:
+        if not self._is_mirrored(era_id):
+            return self.remote.list_periods(era_id, fields=fields)
+        periods = [
+            PeriodDoc.from_data(doc_id, data)
+            for doc_id, data in self.store.children(f"{_era_path(era_id)}/periods")
+        ]
+        return sorted(periods, key=lambda item: item.index)
+
+    def list_incursions(
+        self, era_id: str, period_id: str, fields: Sequence[str] | None = None
+    ) -> list[IncursionDoc]:
+        if not self._is_mirrored(era_id):
+            return self.remote.list_incursions(era_id, period_id, fields=fields)
+        incursions = [
+            IncursionDoc.from_data(doc_id, data)
+            for doc_id, data in self.store.children(
+                f"{_period_path(era_id, period_id)}/incursions"
+            )
+        ]
+        return sorted(incursions, key=lambda item: item.index)
+
+    def iter_sessions(
+        self,
+        era_id: str,
+        period_id: str,
+        incursion_id: str,
+        fields: Sequence[str] | None = None,
+        limit_to_last: int | None = None,
+    ) -> Iterator[SessionDoc]:
+        if not self._is_mirrored(era_id):
+            yield from self.remote.iter_sessions(
+                era_id,
+                period_id,
+                incursion_id,
+                fields=fields,
+                limit_to_last=limit_to_last,
+            )
+            return
+        sessions = sorted(
+            (
+                SessionDoc.from_data(doc_id, data)
+                for doc_id, data in self.store.children(
+                    f"{_incursion_path(era_id, period_id, incursion_id)}/sessions"
+                )
+            ),
+            key=lambda item: item.started_at or datetime.min.replace(tzinfo=timezone.utc),
+        )
+        if limit_to_last is not None:
+            sessions = sessions[-limit_to_last:]
+        yield from sessions
+
+    def _period(self, era_id: str, period_id: str) -> PeriodDoc:
+        self._ensure_mirrored(era_id)
+        data = self.store.get(_period_path(era_id, period_id))
+        if data is None:
+            raise ValueError("Periodo no encontrado.")
+        return PeriodDoc.from_data(period_id, data)
+
+    def _incursion(self, era_id: str, period_id: str, incursion_id: str) -> IncursionDoc:
+        data = self.store.get(_incursion_path(era_id, period_id, incursion_id))
+        if data is None:
+            raise ValueError("Incursion no encontrada.")
+        return IncursionDoc.from_data(incursion_id, data)
+
+    def reveal_period(self, era_id: str, period_id: str) -> None:
+        self._ensure_mirrored(era_id)
+        periods = self.list_periods(era_id)
+        index = next(
+            (idx for idx, period in enumerate(periods) if period.id == period_id), None
+        )
+        if index is None:
+            raise ValueError("Periodo no encontrado.")
+        if index > 0 and periods[index - 1].ended_at is None:
+            raise ValueError(
+                "No puedes revelar este periodo hasta que el anterior este finalizado."
+            )
+        if periods[index].revealed_at is not None:
+            raise ValueError("Este periodo ya esta revelado.")
+        now = self._utc_now()
+        self._apply(
+            era_id,
+            {_period_path(era_id, period_id): {"revealed_at": now}},
+            "reveal_period",
+            {"era_id": era_id, "period_id": period_id, "at": now},
+        )
+
+    def assign_period_adversaries(
+        self, era_id: str, period_id: str, assignments: dict[str, str | None]
+    ) -> None:
+        period = self._period(era_id, period_id)
+        if period.revealed_at is None:
+            raise ValueError("No puedes asignar adversarios sin revelar el periodo.")
+        if period.ended_at is not None:
+            raise ValueError("No puedes asignar adversarios en un periodo finalizado.")
+        if period.adversaries_assigned_at is not None:
+            raise ValueError("Este periodo ya tiene adversarios asignados.")
+        incursions = self.list_incursions(era_id, period_id)
+        if len(incursions) != 4:
+            raise ValueError("El periodo debe tener exactamente 4 incursiones.")
+        if set(assignments) != {incursion.id for incursion in incursions}:
+            raise ValueError("Debes asignar adversarios a las 4 incursiones.")
+        adversaries = list(assignments.values())
+        if any(not adversary for adversary in adversaries):
+            raise ValueError("Debes asignar adversario a todas las incursiones.")
+        if len(set(adversaries)) != len(adversaries):
+            raise ValueError("Los adversarios deben ser distintos en el periodo.")
+
+        now = self._utc_now()
+        updates: dict[str, dict[str, Any]] = {
+            _incursion_path(era_id, period_id, incursion_id): {"adversary_id": adversary_id}
+            for incursion_id, adversary_id in assignments.items()
+        }
+        updates[_period_path(era_id, period_id)] = {"adversaries_assigned_at": now}
+        self._apply(
+            era_id,
+            updates,
+            "assign_period_adversaries",
+            {
+                "era_id": era_id,
+                "period_id": period_id,
+                "assignments": dict(assignments),
+                "at": now,
+            },
+        )
+
+    def update_incursion_adversary_level(
+        self,
+        era_id: str,
+        period_id: str,
+        incursion_id: str,
+        adversary_id: str | None,
+        adversary_level: str | None,
+        difficulty: int | None,
+    ) -> None:
+        self._ensure_mirrored(era_id)
+        self._incursion(era_id, period_id, incursion_id)
+        changes: dict[str, Any] = {
+            "adversary_level": adversary_level,
+            "difficulty": difficulty,
+        }
+        if adversary_id is not None:
+            changes["adversary_id"] = adversary_id
+        self._apply(
+            era_id,
+            {_incursion_path(era_id, period_id, incursion_id): changes},
+            "update_incursion_adversary_level",
+            {
+                "era_id": era_id,
+                "period_id": period_id,
+                "incursion_id": incursion_id,
+                "adversary_id": adversary_id,
+                "adversary_level": adversary_level,
+                "difficulty": difficulty,
+            },
+        )
+
+    def start_session(
+        self,
+        era_id: str,
+        period_id: str,
+        incursion_id: str,
+        at: datetime | None = None,
+        adversary_level: str | None = None,
+        difficulty: int | None = None,
+    ) -> None:
+        period = self._period(era_id, period_id)
+        if period.revealed_at is None:
+            raise ValueError("No puedes iniciar una incursion sin revelar el periodo.")
+        if period.ended_at is not None:
+            raise ValueError("El periodo ya esta finalizado.")
+        if period.adversaries_assigned_at is None:
+            raise ValueError("Debes asignar adversarios antes de iniciar incursiones.")
+        active_incursion = self.get_active_incursion(era_id)
+        if active_incursion and (
+            active_incursion.period_id != period_id
+            or active_incursion.incursion_id != incursion_id
+        ):
+            raise ValueError("Ya existe una incursion activa en esta Era.")
+        incursion = self._incursion(era_id, period_id, incursion_id)
+        if incursion.is_finished:
+            raise ValueError("La incursion ya esta finalizada.")
+        sessions = list(self.iter_sessions(era_id, period_id, incursion_id))
+        if any(session.ended_at is None for session in sessions):
+            raise ValueError("Ya hay una sesión abierta.")
+        if adversary_level is not None:
+            if sessions:
+                raise ValueError("El nivel ya no se puede cambiar.")
+            incursion = replace(
+                incursion, adversary_level=adversary_level, difficulty=difficulty
+            )
+        if not sessions:
+            if not incursion.adversary_level or incursion.difficulty is None:
+                raise ValueError("Debes seleccionar un nivel válido.")
+            incursions = self.list_incursions(era_id, period_id)
+            if len(incursions) != 4:
+                raise ValueError("El periodo debe tener exactamente 4 incursiones.")
+            adversaries = [item.adversary_id for item in incursions]
+            if any(not adversary for adversary in adversaries):
+                raise ValueError(
+                    "Todas las incursiones deben tener un adversario asignado."
+                )
+            if len(set(adversaries)) != 4:
+                raise ValueError("Los adversarios del periodo deben ser distintos.")
+
+        now = at or self._utc_now()
+        session_id = uuid.uuid4().hex[:20]
+        incursion_changes: dict[str, Any] = {"is_active": True}
+        if incursion.started_at is None:
+            incursion_changes["started_at"] = now
+        if adversary_level is not None:
+            incursion_changes["adversary_level"] = adversary_level
+            incursion_changes["difficulty"] = difficulty
+        active_incursion_id = self.remote._build_active_incursion_id(period_id, incursion_id)
+        self._apply(
+            era_id,
+            {
+                _incursion_path(era_id, period_id, incursion_id): incursion_changes,
+                _era_path(era_id): {"active_incursion_id": active_incursion_id},
+                _session_path(era_id, period_id, incursion_id, session_id): {
+                    "started_at": now,
+                    "ended_at": None,
+                },
+            },
+            "start_session",
+            {
+                "era_id": era_id,
+                "period_id": period_id,
+                "incursion_id": incursion_id,
+                "at": now,
+                "session_id": session_id,
+                "adversary_level": adversary_level,
+                "difficulty": difficulty,
+            },
+        )
+
+    def end_session(
+        self,
+        era_id: str,
+        period_id: str,
+        incursion_id: str,
+        at: datetime | None = None,
+    ) -> None:
+        self._ensure_mirrored(era_id)
+        open_session = next(
+            (
+                session
+                for session in self.iter_sessions(era_id, period_id, incursion_id)
+                if session.ended_at is None
+            ),
+            None,
+        )
+        if open_session is None:
+            logger.warning("No open sessions to end incursion_id=%s", incursion_id)
+            return
+        now = at or self._utc_now()
+        self._apply(
+            era_id,
+            {
+                _session_path(era_id, period_id, incursion_id, open_session.id): {
+                    "ended_at": now
+                }
+            },
+            "end_session",
+            {
+                "era_id": era_id,
+                "period_id": period_id,
+                "incursion_id": incursion_id,
+                "at": now,
+            },
+        )
+
+    def finalize_incursion(
+        self,
+        era_id: str,
+        period_id: str,
+        incursion_id: str,
+        result: str,
+        dahan_alive: int,
+        blight_on_island: int,
+        player_count: int | None = None,
+        invader_cards_remaining: int | None = None,
+        invader_cards_out_of_deck: int | None = None,
+        at: datetime | None = None,
+    ) -> None:
+        self._ensure_mirrored(era_id)
+        incursion = self._incursion(era_id, period_id, incursion_id)
+        if incursion.ended_at is not None:
+            raise ValueError("La incursion ya esta finalizada. El score es inmutable.")
+        if result == "win":
+            if invader_cards_remaining is None:
+                raise ValueError("Debes indicar las cartas en el mazo.")
+            if invader_cards_remaining < 0:
+                raise ValueError("Las cartas en el mazo deben ser 0 o más.")
+        if result == "loss":
+            if invader_cards_out_of_deck is None:
+                raise ValueError("Debes indicar las cartas fuera del mazo.")
+            if invader_cards_out_of_deck < 0:
+                raise ValueError("Las cartas fuera del mazo deben ser 0 o más.")
+        resolved_player_count = 2
+        score = calculate_score(
+            difficulty=incursion.difficulty or 0,
+            result=result,
+            dahan_alive=dahan_alive,
+            blight_on_island=blight_on_island,
+            player_count=resolved_player_count,
+            invader_cards_remaining=invader_cards_remaining,
+            invader_cards_out_of_deck=invader_cards_out_of_deck,
+        )
+
+        now = at or self._utc_now()
+        incursion_changes: dict[str, Any] = {
+            "ended_at": now,
+            "result": result,
+            "dahan_alive": dahan_alive,
+            "blight_on_island": blight_on_island,
+            "score": score,
+            "is_active": False,
+            "player_count": resolved_player_count,
+        }
+        if result == "win":
+            incursion_changes["invader_cards_remaining"] = invader_cards_remaining
+        if result == "loss":
+            incursion_changes["invader_cards_out_of_deck"] = invader_cards_out_of_deck
+        updates: dict[str, dict[str, Any]] = {
+            _incursion_path(era_id, period_id, incursion_id): incursion_changes,
+            _era_path(era_id): {"active_incursion_id": None},
+        }
+        for session in self.iter_sessions(era_id, period_id, incursion_id):
+            if session.ended_at is None:
+                path = _session_path(era_id, period_id, incursion_id, session.id)
+                updates[path] = {"ended_at": now}
+        if all(
+            item.ended_at is not None
+            for item in self.list_incursions(era_id, period_id)
+            if item.id != incursion_id
+        ):
+            updates[_period_path(era_id, period_id)] = {"ended_at": now}
+        self._apply(
+            era_id,
+            updates,
+            "finalize_incursion",
+            {
+                "era_id": era_id,
+                "period_id": period_id,
+                "incursion_id": incursion_id,
+                "result": result,
+                "dahan_alive": dahan_alive,
+                "blight_on_island": blight_on_island,
+                "player_count": player_count,
+                "invader_cards_remaining": invader_cards_remaining,
+                "invader_cards_out_of_deck": invader_cards_out_of_deck,
+                "at": now,
+            },
+        )
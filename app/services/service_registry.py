@@ -1,20 +1,78 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable
+
 from services.firestore_service import FirestoreService
+from services.local_store import LocalStore, default_store_path
+from services.offline_service import OfflineFirstService
+from services.snapshot_store import SnapshotStore, default_snapshot_path
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 _FIRESTORE_ATTR = "_sp_firestore_service"
+_SNAPSHOT_ATTR = "_sp_snapshot_store"
+
+_SHARED_LOCK = Lock()
+_shared_services: SharedServices | None = None
 
 
-def set_firestore_service(session: object, service: FirestoreService) -> None:
+def set_firestore_service(
+    session: object, service: FirestoreService | OfflineFirstService
+) -> None:
     setattr(session, _FIRESTORE_ATTR, service)
     logger.debug("Firestore service stored in session attr=%s", _FIRESTORE_ATTR)
 
 
-def get_firestore_service(session: object) -> FirestoreService | None:
+def get_firestore_service(
+    session: object,
+) -> FirestoreService | OfflineFirstService | None:
     service = getattr(session, _FIRESTORE_ATTR, None)
     if service is None:
         logger.warning("Firestore service not found in session")
     return service
+
+
+def set_snapshot_store(session: object, store: SnapshotStore) -> None:
+    setattr(session, _SNAPSHOT_ATTR, store)
+
+
+def get_snapshot_store(session: object) -> SnapshotStore | None:
+    return getattr(session, _SNAPSHOT_ATTR, None)
+
+
+@dataclass(frozen=True)
+class SharedServices:
+    """Process-wide Firestore client, local mirror and snapshot cache shared by all sessions."""
+
+    service: OfflineFirstService
+    snapshots: SnapshotStore
+
+
+def _build_shared_services() -> SharedServices:
+    logger.info("Initializing shared services")
+    service = OfflineFirstService(FirestoreService(), LocalStore(default_store_path()))
+    service.start()
+    return SharedServices(service=service, snapshots=SnapshotStore(default_snapshot_path()))
+
+
+def get_shared_services(
+    factory: Callable[[], SharedServices] = _build_shared_services,
+) -> SharedServices:
+    global _shared_services
+    with _SHARED_LOCK:
+        if _shared_services is None:
+            _shared_services = factory()
+        return _shared_services
+
+
+def attach_session_services(
+    session: object,
+    factory: Callable[[], SharedServices] = _build_shared_services,
+) -> SharedServices:
+    shared = get_shared_services(factory)
+    set_firestore_service(session, shared.service)
+    set_snapshot_store(session, shared.snapshots)
+    return shared
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import os
+import pickle
+from pathlib import Path
+from threading import RLock
+from typing import Any, Final
+
+from services.local_store import default_store_path
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SNAPSHOT_VERSION: Final[int] = 2
+MAX_SNAPSHOT_ROUTES: Final[int] = 64
+_SNAPSHOT_FILENAME: Final[str] = "spiritplanner_snapshots.pickle"
+
+
+def default_snapshot_path() -> Path:
+    return default_store_path().with_name(_SNAPSHOT_FILENAME)
+
+
+class SnapshotStore:
+    """Last rendered view-model state per route, kept on disk for instant cold starts."""
+
+    def __init__(
+        self, path: Path | None = None, max_routes: int = MAX_SNAPSHOT_ROUTES
+    ) -> None:
+        self._path = path
+        self._max_routes = max_routes
+        self._lock = RLock()
+        self._routes: dict[str, Any] = self._read()
+
+    def _read(self) -> dict[str, Any]:
+        if self._path is None or not self._path.exists():
+            return {}
+        try:
+            with self._path.open("rb") as handle:
+                payload = pickle.load(handle)
+        except Exception as exc:
+            logger.warning("Discarding unreadable snapshots path=%s error=%s", self._path, exc)
+            return {}
+        if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION:
+            logger.info("Discarding snapshots from another version path=%s", self._path)
+            return {}
+        return dict(payload.get("routes", {}))
+
+    def _write(self) -> None:
+        if self._path is None:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_suffix(".tmp")
+        with tmp_path.open("wb") as handle:
+            pickle.dump(
+                {"version": SNAPSHOT_VERSION, "routes": self._routes},
+                handle,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, self._path)
+
+    def get(self, route: str) -> Any | None:
+        with self._lock:
+            return self._routes.get(route)
+
+    def put(self, route: str, value: Any) -> bool:
+        with self._lock:
+            if route in self._routes and self._routes[route] == value:
+                return False
+            self._routes.pop(route, None)
+            self._routes[route] = value
+            while len(self._routes) > self._max_routes:
+                self._routes.pop(next(iter(self._routes)))
+            try:
+                self._write()
+            except (OSError, pickle.PicklingError, TypeError) as exc:
+                logger.warning("Failed to persist snapshots path=%s error=%s", self._path, exc)
+        logger.debug("Snapshot stored route=%s", route)
+        return True
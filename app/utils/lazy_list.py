@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Callable, Hashable
+
+import flet as ft
+
+LAZY_WINDOW_STEP = 12
+LOAD_AHEAD_PIXELS = 600.0
+SCROLL_EVENT_INTERVAL_MS = 100
+
+ScrollHandler = Callable[[ft.OnScrollEvent], None]
+ShowMore = Callable[[], None]
+
+
+def next_window_size(visible: int, total: int, step: int = LAZY_WINDOW_STEP) -> int:
+    return min(total, max(visible, 0) + step)
+
+
+def is_near_end(
+    pixels: float, max_scroll_extent: float, threshold: float = LOAD_AHEAD_PIXELS
+) -> bool:
+    return max_scroll_extent - pixels <= threshold
+
+
+def use_lazy_window(
+    total: int,
+    reset_key: Hashable = None,
+    step: int = LAZY_WINDOW_STEP,
+    on_end: Callable[[], None] | None = None,
+) -> tuple[int, ScrollHandler, ShowMore]:
+    """Number of items to build now, grown by `step` as the list nears its end.
+
+    Scrolling only fires once the content overflows, so screens also render
+    `show_more_row` for lists whose first window fits on screen.
+    """
+    visible, set_visible = ft.use_state(step)
+
+    def reset() -> None:
+        set_visible(step)
+
+    ft.use_effect(reset, [reset_key])
+
+    def show_more() -> None:
+        set_visible(next_window_size(visible, total, step))
+
+    def handle_scroll(event: ft.OnScrollEvent) -> None:
+        if not is_near_end(event.pixels, event.max_scroll_extent):
+            return
+        if visible < total:
+            show_more()
+        elif on_end is not None:
+            on_end()
+
+    return min(visible, total), handle_scroll, show_more
+
+
+def show_more_row(label: str, on_click: Callable[[], None]) -> ft.Row:
+    return ft.Row(
+        [ft.OutlinedButton(label, on_click=lambda _: on_click())],
+        alignment=ft.MainAxisAlignment.CENTER,
+    )
+
+
+def lazy_list_view(
+    controls: list[ft.Control], on_scroll: ScrollHandler, spacing: float = 8
+) -> ft.ListView:
+    return ft.ListView(
+        controls=controls,
+        spacing=spacing,
+        expand=True,
+        build_controls_on_demand=True,
+        scroll_interval=SCROLL_EVENT_INTERVAL_MS,
+        on_scroll=on_scroll,
+    )
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Iterator, TypeVar
+
+import flet as ft
+
+R = TypeVar("R")
+
+
+class BatchedObservable(ft.Observable):
+    _batch_depth = 0
+    _batch_dirty = False
+
+    @contextmanager
+    def batch_update(self) -> Iterator[None]:
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_dirty:
+                self._batch_dirty = False
+                super()._notify(None)
+
+    def _notify(self, field: str | None) -> None:
+        if self._batch_depth:
+            self._batch_dirty = True
+            return
+        super()._notify(field)
+
+
+def batched(method: Callable[..., R]) -> Callable[..., R]:
+    @wraps(method)
+    def wrapper(self: BatchedObservable, *args, **kwargs) -> R:
+        with self.batch_update():
+            return method(self, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+from weakref import WeakKeyDictionary
+
+import flet as ft
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_WIDTH = 900.0
+DEFAULT_HEIGHT = 700.0
+RESIZE_DEBOUNCE_SECONDS = 0.12
+RESIZE_MAX_WAIT_SECONDS = 0.4
+
+BucketT = TypeVar("BucketT")
+ResizeSubscriber = Callable[["ViewportSize"], None]
+
+_RESIZE_BROKERS: WeakKeyDictionary[ft.Page, "ResizeBroker"] = WeakKeyDictionary()
+
+
+@dataclass(frozen=True)
+class ViewportSize:
+    width: float
+    height: float
+
+
+def quantize(value: float, step: float) -> float:
+    if step <= 0:
+        return value
+    return float(int(max(0.0, value) // step) * step)
+
+
+def read_page_size(page: ft.Page) -> ViewportSize:
+    window = getattr(page, "window", None)
+    width = page.width or getattr(window, "width", 0) or DEFAULT_WIDTH
+    height = page.height or getattr(window, "height", 0) or DEFAULT_HEIGHT
+    return ViewportSize(width=float(width), height=float(height))
+
+
+class ResizeBroker:
+    def __init__(
+        self,
+        page: ft.Page,
+        debounce_seconds: float = RESIZE_DEBOUNCE_SECONDS,
+        max_wait_seconds: float = RESIZE_MAX_WAIT_SECONDS,
+    ) -> None:
+        self._page = page
+        self._debounce_seconds = debounce_seconds
+        self._max_wait_seconds = max_wait_seconds
+        self._subscribers: list[ResizeSubscriber] = []
+        self._pending: ViewportSize | None = None
+        self._first_event_at = 0.0
+        self._last_event_at = 0.0
+        self._flush_scheduled = False
+        self.size = read_page_size(page)
+        page.on_resize = self.handle_resize
+
+    def subscribe(self, subscriber: ResizeSubscriber) -> Callable[[], None]:
+        self._subscribers.append(subscriber)
+
+        def unsubscribe() -> None:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+        return unsubscribe
+
+    def handle_resize(self, event: ft.PageResizeEvent) -> None:
+        current = read_page_size(self._page)
+        self._pending = ViewportSize(
+            width=float(getattr(event, "width", None) or current.width),
+            height=float(getattr(event, "height", None) or current.height),
+        )
+        now = time.monotonic()
+        self._last_event_at = now
+        if self._flush_scheduled:
+            return
+        self._first_event_at = now
+        self._flush_scheduled = True
+        self._page.run_task(self._flush_when_idle)
+
+    async def _flush_when_idle(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self._debounce_seconds)
+                now = time.monotonic()
+                idle = now - self._last_event_at >= self._debounce_seconds
+                overdue = now - self._first_event_at >= self._max_wait_seconds
+                if idle or overdue:
+                    break
+        finally:
+            self._flush_scheduled = False
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            self.publish(pending)
+
+    def publish(self, size: ViewportSize) -> None:
+        if size == self.size:
+            return
+        self.size = size
+        logger.debug(
+            "Viewport resized width=%s height=%s subscribers=%s",
+            size.width,
+            size.height,
+            len(self._subscribers),
+        )
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber(size)
+            except Exception:
+                logger.exception("Resize subscriber failed")
+
+
+def get_resize_broker(page: ft.Page) -> ResizeBroker:
+    broker = _RESIZE_BROKERS.get(page)
+    if broker is None:
+        broker = ResizeBroker(page)
+        _RESIZE_BROKERS[page] = broker
+    return broker
+
+
+def use_viewport_bucket(bucket: Callable[[ViewportSize], BucketT]) -> BucketT:
+    broker = get_resize_broker(ft.context.page)
+    value, set_value = ft.use_state(lambda: bucket(broker.size))
+
+    def subscribe():
+        set_value(bucket(broker.size))
+        return broker.subscribe(lambda size: set_value(bucket(size)))
+
+    ft.use_effect(subscribe, [])
+    return value
@@ -12,11 +12,15 @@ _ROUTER_REGISTRY: WeakKeyDictionary[ft.Page, "RouterCoordinator"] = WeakKeyDicti
 _ROUTE_LOADERS: WeakKeyDictionary[
     ft.Page, dict[str, "RouteLoader"]
 ] = WeakKeyDictionary()
+_ROUTE_LISTENERS: WeakKeyDictionary[
+    ft.Page, list["RouteListener"]
+] = WeakKeyDictionary()
 
 logger = get_logger(__name__)
 
 RouteParams = dict[str, str]
 RouteLoader = Callable[[RouteParams], None]
+RouteListener = Callable[[str], None]
 
 
 def normalize_route(route: str | None) -> str:
@@ -98,6 +102,18 @@ def register_route_loader(
     loaders[normalize_route(base_route)] = loader
 
 
+def add_route_listener(page: ft.Page, listener: RouteListener) -> None:
+    _ROUTE_LISTENERS.setdefault(page, []).append(listener)
+
+
+def notify_route_change(page: ft.Page, route: str) -> None:
+    for listener in list(_ROUTE_LISTENERS.get(page, ())):
+        try:
+            listener(route)
+        except Exception:
+            logger.exception("Route listener failed route=%s", route)
+
+
 def refresh_route(page: ft.Page, route: str) -> None:
     base_route, params = resolve_route_target(route)
     loaders = _ROUTE_LOADERS.get(page, {})
@@ -118,6 +134,7 @@ class RouterCoordinator:
     def on_route_change(self, e: ft.RouteChangeEvent) -> None:
         self.route = normalize_route(e.route)
         page = e.page or ft.context.page
+        notify_route_change(page, self.route)
         if self.pending_refresh == self.route:
             self.pending_refresh = None
             return
@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Callable
 
 if __package__:
-    from .firestore_service import init_firestore
+    from .firestore_service import era_descendants_query, init_firestore
 else:
-    from firestore_service import init_firestore
+    from firestore_service import era_descendants_query, init_firestore
+
+DeleteProgress = Callable[[int], None]
 
 
 @dataclass(frozen=True)
@@ -17,42 +20,40 @@ class EraTreeCounts:
     num_incursions: int
     num_sessions: int
 
+    @property
+    def total(self) -> int:
+        return int(self.era_exists) + self.num_periods + self.num_incursions + self.num_sessions
+
+
+def _aggregate_count(query) -> int:
+    results = query.count(alias="count").get()
+    return int(results[0][0].value) if results and results[0] else 0
+
 
 def count_era_tree(era_id: str) -> EraTreeCounts:
     db = init_firestore()
     era_ref = db.collection("eras").document(era_id)
-    era_snapshot = era_ref.get()
-
-    num_periods = 0
-    num_incursions = 0
-    num_sessions = 0
-
-    for period_snapshot in era_ref.collection("periods").stream():
-        num_periods += 1
-        for incursion_snapshot in period_snapshot.reference.collection("incursions").stream():
-            num_incursions += 1
-            for _ in incursion_snapshot.reference.collection("sessions").stream():
-                num_sessions += 1
 
     return EraTreeCounts(
-        era_exists=era_snapshot.exists,
-        num_periods=num_periods,
-        num_incursions=num_incursions,
-        num_sessions=num_sessions,
+        era_exists=era_ref.get(field_paths=[]).exists,
+        num_periods=_aggregate_count(era_ref.collection("periods")),
+        num_incursions=_aggregate_count(era_descendants_query(db, era_ref, "incursions")),
+        num_sessions=_aggregate_count(era_descendants_query(db, era_ref, "sessions")),
     )
 
 
-def delete_era_tree(era_id: str) -> None:
+def delete_era_tree(era_id: str, on_progress: DeleteProgress | None = None) -> int:
     db = init_firestore()
     era_ref = db.collection("eras").document(era_id)
+    bulk_writer = db.bulk_writer()
+    if on_progress is not None:
+        deleted = 0
+
+        def handle_write_result(*_args) -> None:
+            nonlocal deleted
+            deleted += 1
+            on_progress(deleted)
 
-    for period_snapshot in era_ref.collection("periods").stream():
-        period_ref = period_snapshot.reference
-        for incursion_snapshot in period_ref.collection("incursions").stream():
-            incursion_ref = incursion_snapshot.reference
-            for session_snapshot in incursion_ref.collection("sessions").stream():
-                session_snapshot.reference.delete()
-            incursion_ref.delete()
-        period_ref.delete()
+        bulk_writer.on_write_result(handle_write_result)
 
-    era_ref.delete()
+    return db.recursive_delete(era_ref, bulk_writer=bulk_writer)
@@ -0,0 +1,105 @@
+"""Concurrent per-era jobs with JSON-friendly summaries for the scriptable CLI."""
+
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Iterable, Sequence, TextIO
+
+DEFAULT_MAX_WORKERS = 4
+GLOB_CHARS = frozenset("*?[")
+
+EraJob = Callable[[str], dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class EraJobResult:
+    era_id: str
+    ok: bool
+    elapsed_ms: float
+    details: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+
+def is_era_pattern(value: str) -> bool:
+    return any(char in GLOB_CHARS for char in value)
+
+
+def expand_era_ids(patterns: Sequence[str], existing_ids: Iterable[str]) -> list[str]:
+    existing = sorted(existing_ids)
+    expanded: list[str] = []
+    seen: set[str] = set()
+    for pattern in patterns:
+        if is_era_pattern(pattern):
+            matches = [era_id for era_id in existing if fnmatchcase(era_id, pattern)]
+        else:
+            matches = [pattern]
+        for era_id in matches:
+            if era_id not in seen:
+                seen.add(era_id)
+                expanded.append(era_id)
+    return expanded
+
+
+def _run_job(job: EraJob, era_id: str, describe_error: Callable[[Exception], str]) -> EraJobResult:
+    started = time.perf_counter()
+    try:
+        details = job(era_id)
+    except Exception as exc:
+        return EraJobResult(
+            era_id=era_id,
+            ok=False,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+            error=describe_error(exc),
+        )
+    return EraJobResult(
+        era_id=era_id,
+        ok=True,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+        details=details,
+    )
+
+
+def run_era_jobs(
+    era_ids: Sequence[str],
+    job: EraJob,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    describe_error: Callable[[Exception], str] = str,
+) -> list[EraJobResult]:
+    if not era_ids:
+        return []
+    workers = max(1, min(max_workers, len(era_ids)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="era-job") as executor:
+        return list(
+            executor.map(lambda era_id: _run_job(job, era_id, describe_error), era_ids)
+        )
+
+
+def build_summary(
+    command: str,
+    results: Sequence[EraJobResult],
+    elapsed_ms: float,
+    **extra: Any,
+) -> dict[str, Any]:
+    return {
+        "command": command,
+        "ok": all(result.ok for result in results),
+        "elapsed_ms": round(elapsed_ms, 1),
+        **extra,
+        "results": [asdict(result) for result in results],
+    }
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def write_json(payload: Any, stream: TextIO) -> None:
+    json.dump(payload, stream, ensure_ascii=False, indent=2, default=_json_default)
+    stream.write("\n")
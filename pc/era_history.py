@@ -0,0 +1,155 @@
+"""Local cross-era index of played pairings, refreshed incrementally from Firestore."""
+
+from __future__ import annotations
+
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+if __package__:
+    from .firestore_service import list_era_ids, stream_incursion_changes
+else:
+    from firestore_service import list_era_ids, stream_incursion_changes
+
+HISTORY_VERSION = 1
+DEFAULT_HISTORY_PATH = Path("pc/data/cache/era_history.json")
+HISTORY_FIELDS = (
+    "spirit_1_id",
+    "spirit_2_id",
+    "board_1",
+    "board_2",
+    "board_layout",
+    "adversary_id",
+    "updated_at",
+)
+
+
+@dataclass(frozen=True)
+class HistoryEntry:
+    era_id: str
+    spirit_1_id: str
+    spirit_2_id: str
+    board_1: str
+    board_2: str
+    board_layout: str
+    adversary_id: str | None = None
+
+    @property
+    def pair(self) -> tuple[str, str]:
+        return tuple(sorted((self.spirit_1_id, self.spirit_2_id)))
+
+    @property
+    def boards(self) -> tuple[str, str]:
+        return tuple(sorted((self.board_1, self.board_2)))
+
+
+@dataclass
+class HistoryIndex:
+    entries: dict[str, HistoryEntry] = field(default_factory=dict)
+    synced_at: datetime | None = None
+
+    @property
+    def era_ids(self) -> set[str]:
+        return {entry.era_id for entry in self.entries.values()}
+
+    def iter_entries(self, exclude_era_id: str | None = None) -> Iterable[HistoryEntry]:
+        return (
+            entry for entry in self.entries.values() if entry.era_id != exclude_era_id
+        )
+
+    def pair_counts(self) -> dict[tuple[str, str], Counter]:
+        counts: dict[tuple[str, str], Counter] = {}
+        for entry in self.entries.values():
+            counts.setdefault(entry.pair, Counter())[
+                (entry.boards, entry.board_layout, entry.adversary_id)
+            ] += 1
+        return counts
+
+    def apply(self, path: str, data: dict[str, Any]) -> bool:
+        entry = entry_from_document(path, data)
+        if entry is None:
+            return False
+        self.entries[path] = entry
+        updated_at = data.get("updated_at")
+        if isinstance(updated_at, datetime) and (
+            self.synced_at is None or updated_at > self.synced_at
+        ):
+            self.synced_at = updated_at
+        return True
+
+    def prune(self, era_ids: set[str]) -> int:
+        stale = [path for path, entry in self.entries.items() if entry.era_id not in era_ids]
+        for path in stale:
+            del self.entries[path]
+        return len(stale)
+
+
+def entry_from_document(path: str, data: dict[str, Any]) -> HistoryEntry | None:
+    parts = path.split("/")
+    if len(parts) < 2 or parts[0] != "eras":
+        return None
+    values = [data.get(name) for name in HISTORY_FIELDS[:5]]
+    if not all(isinstance(value, str) and value for value in values):
+        return None
+    return HistoryEntry(parts[1], *values, adversary_id=data.get("adversary_id") or None)
+
+
+def load_history_index(path: Path = DEFAULT_HISTORY_PATH) -> HistoryIndex:
+    if not path.exists():
+        return HistoryIndex()
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return HistoryIndex()
+    if not isinstance(payload, dict) or payload.get("version") != HISTORY_VERSION:
+        return HistoryIndex()
+
+    synced_at = payload.get("synced_at")
+    entries = {
+        doc_path: HistoryEntry(*values)
+        for doc_path, values in (payload.get("entries") or {}).items()
+    }
+    return HistoryIndex(
+        entries=entries,
+        synced_at=datetime.fromisoformat(synced_at) if synced_at else None,
+    )
+
+
+def save_history_index(index: HistoryIndex, path: Path = DEFAULT_HISTORY_PATH) -> None:
+    payload = {
+        "version": HISTORY_VERSION,
+        "synced_at": index.synced_at.isoformat() if index.synced_at else None,
+        "entries": {
+            doc_path: [
+                entry.era_id,
+                entry.spirit_1_id,
+                entry.spirit_2_id,
+                entry.board_1,
+                entry.board_2,
+                entry.board_layout,
+                entry.adversary_id,
+            ]
+            for doc_path, entry in sorted(index.entries.items())
+        },
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def refresh_history_index(path: Path = DEFAULT_HISTORY_PATH) -> HistoryIndex:
+    index = load_history_index(path)
+    refreshed_at = datetime.now(timezone.utc)
+    for doc_path, data in stream_incursion_changes(index.synced_at, HISTORY_FIELDS):
+        index.apply(doc_path, data)
+    if index.synced_at is None:
+        # Legacy incursions carry no updated_at; without this every run would
+        # repeat the full collection-group scan.
+        index.synced_at = refreshed_at
+    index.prune(list_era_ids())
+    save_history_index(index, path)
+    return index
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""Balance report for generated or stored eras using co-occurrence matrices."""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+if __package__:
+    from .firestore_service import list_era_incursions
+    from .generate_era import EraCatalogs, EraPlan, load_catalogs, plan_era, require_columns
+else:
+    from firestore_service import list_era_incursions
+    from generate_era import EraCatalogs, EraPlan, load_catalogs, plan_era, require_columns
+
+INCURSION_FIELDS = (
+    "spirit_1_id",
+    "spirit_2_id",
+    "board_1",
+    "board_2",
+    "board_layout",
+    "adversary_id",
+)
+
+
+@dataclass(frozen=True)
+class IncursionRows:
+    """Column-oriented incursions of one or more eras; missing values are ""."""
+
+    spirit_1: tuple[str, ...]
+    spirit_2: tuple[str, ...]
+    board_1: tuple[str, ...]
+    board_2: tuple[str, ...]
+    layout: tuple[str, ...]
+    adversary: tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.spirit_1)
+
+
+@dataclass(frozen=True)
+class EraMatrices:
+    spirit_ids: tuple[str, ...]
+    board_ids: tuple[str, ...]
+    layout_ids: tuple[str, ...]
+    adversary_ids: tuple[str, ...]
+    spirit_spirit: np.ndarray
+    spirit_board: np.ndarray
+    spirit_layout: np.ndarray
+    board_board: np.ndarray
+    spirit_adversary: np.ndarray
+
+
+@dataclass(frozen=True)
+class MatrixStats:
+    name: str
+    cells: int
+    total: int
+    mean: float
+    variance: float
+    max_repeat: int
+    spread: int
+    coverage_gaps: int
+
+
+def load_adversary_ids(path: Path) -> tuple[str, ...]:
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        reader = csv.DictReader(handle, delimiter="\t")
+        require_columns(reader.fieldnames, ["adversary_id"], path)
+        ids = {row["adversary_id"].strip() for row in reader if row.get("adversary_id")}
+    return tuple(sorted(ids))
+
+
+def rows_from_plans(plans: Iterable[EraPlan]) -> IncursionRows:
+    incursions = [
+        incursion
+        for plan in plans
+        for period in plan.periods
+        for incursion in period.incursions
+    ]
+    return IncursionRows(
+        spirit_1=tuple(incursion.spirit_1_id for incursion in incursions),
+        spirit_2=tuple(incursion.spirit_2_id for incursion in incursions),
+        board_1=tuple(incursion.board_1 for incursion in incursions),
+        board_2=tuple(incursion.board_2 for incursion in incursions),
+        layout=tuple(incursion.board_layout for incursion in incursions),
+        adversary=("",) * len(incursions),
+    )
+
+
+def rows_from_documents(documents: Sequence[dict[str, Any]]) -> IncursionRows:
+    def column(field: str) -> tuple[str, ...]:
+        return tuple(str(document.get(field) or "") for document in documents)
+
+    return IncursionRows(
+        spirit_1=column("spirit_1_id"),
+        spirit_2=column("spirit_2_id"),
+        board_1=column("board_1"),
+        board_2=column("board_2"),
+        layout=column("board_layout"),
+        adversary=column("adversary_id"),
+    )
+
+
+def load_firestore_rows(era_ids: Sequence[str]) -> IncursionRows:
+    documents: list[dict[str, Any]] = []
+    for era_id in era_ids:
+        documents.extend(list_era_incursions(era_id, INCURSION_FIELDS))
+    return rows_from_documents(documents)
+
+
+def _axis(catalog_ids: Sequence[str], *columns: Sequence[str]) -> tuple[str, ...]:
+    known = set(catalog_ids)
+    extra = {value for column in columns for value in column if value and value not in known}
+    return tuple(catalog_ids) + tuple(sorted(extra))
+
+
+def _encode(values: Sequence[str], axis: Sequence[str]) -> np.ndarray:
+    # Missing values map to -1 so callers can mask them out.
+    lookup = {value: index for index, value in enumerate(axis)}
+    return np.fromiter(
+        (lookup.get(value, -1) for value in values), dtype=np.intp, count=len(values)
+    )
+
+
+def _cross(
+    rows_index: Sequence[np.ndarray],
+    cols_index: Sequence[np.ndarray],
+    shape: tuple[int, int],
+) -> np.ndarray:
+    matrix = np.zeros(shape, dtype=np.int64)
+    for row_index, col_index in zip(rows_index, cols_index):
+        mask = (row_index >= 0) & (col_index >= 0)
+        np.add.at(matrix, (row_index[mask], col_index[mask]), 1)
+    return matrix
+
+
+def build_era_matrices(
+    rows: IncursionRows,
+    catalogs: EraCatalogs,
+    adversary_ids: Sequence[str] = (),
+) -> EraMatrices:
+    spirit_ids = _axis(
+        [spirit.spirit_id for spirit in catalogs.spirits], rows.spirit_1, rows.spirit_2
+    )
+    board_ids = _axis([board.board_id for board in catalogs.boards], rows.board_1, rows.board_2)
+    layout_ids = _axis([layout.layout_id for layout in catalogs.layouts], rows.layout)
+    adversary_axis = _axis(adversary_ids, rows.adversary)
+
+    spirit_1 = _encode(rows.spirit_1, spirit_ids)
+    spirit_2 = _encode(rows.spirit_2, spirit_ids)
+    board_1 = _encode(rows.board_1, board_ids)
+    board_2 = _encode(rows.board_2, board_ids)
+    layout = _encode(rows.layout, layout_ids)
+    adversary = _encode(rows.adversary, adversary_axis)
+
+    spirits = len(spirit_ids)
+    boards = len(board_ids)
+    return EraMatrices(
+        spirit_ids=spirit_ids,
+        board_ids=board_ids,
+        layout_ids=layout_ids,
+        adversary_ids=adversary_axis,
+        spirit_spirit=_cross((spirit_1, spirit_2), (spirit_2, spirit_1), (spirits, spirits)),
+        spirit_board=_cross((spirit_1, spirit_2), (board_1, board_2), (spirits, boards)),
+        spirit_layout=_cross((spirit_1, spirit_2), (layout, layout), (spirits, len(layout_ids))),
+        board_board=_cross((board_1, board_2), (board_2, board_1), (boards, boards)),
+        spirit_adversary=_cross(
+            (spirit_1, spirit_2), (adversary, adversary), (spirits, len(adversary_axis))
+        ),
+    )
+
+
+def compute_matrix_stats(name: str, matrix: np.ndarray, symmetric: bool = False) -> MatrixStats:
+    if symmetric:
+        values = matrix[np.triu_indices_from(matrix, k=1)]
+    else:
+        values = matrix.ravel()
+    if values.size == 0:
+        return MatrixStats(name, 0, 0, 0.0, 0.0, 0, 0, 0)
+    return MatrixStats(
+        name=name,
+        cells=int(values.size),
+        total=int(values.sum()),
+        mean=float(values.mean()),
+        variance=float(values.var()),
+        max_repeat=int(values.max()),
+        spread=int(values.max() - values.min()),
+        coverage_gaps=int(np.count_nonzero(values == 0)),
+    )
+
+
+def compute_era_stats(matrices: EraMatrices) -> list[MatrixStats]:
+    stats = [
+        compute_matrix_stats("spirit_spirit", matrices.spirit_spirit, symmetric=True),
+        compute_matrix_stats("spirit_board", matrices.spirit_board),
+        compute_matrix_stats("spirit_layout", matrices.spirit_layout),
+        compute_matrix_stats("board_board", matrices.board_board, symmetric=True),
+    ]
+    if matrices.spirit_adversary.any():
+        stats.append(compute_matrix_stats("spirit_adversary", matrices.spirit_adversary))
+    return stats
+
+
+def format_era_stats(stats: Sequence[MatrixStats]) -> list[str]:
+    return [
+        f"{entry.name}: cells={entry.cells} total={entry.total} "
+        f"mean={entry.mean:.2f} var={entry.variance:.2f} "
+        f"max={entry.max_repeat} spread={entry.spread} gaps={entry.coverage_gaps}"
+        for entry in stats
+    ]
+
+
+def write_report_json(path: Path, matrices: EraMatrices, stats: Sequence[MatrixStats]) -> None:
+    payload = {
+        "stats": [asdict(entry) for entry in stats],
+        "axes": {
+            "spirits": list(matrices.spirit_ids),
+            "boards": list(matrices.board_ids),
+            "layouts": list(matrices.layout_ids),
+            "adversaries": list(matrices.adversary_ids),
+        },
+        "matrices": {
+            "spirit_spirit": matrices.spirit_spirit.tolist(),
+            "spirit_board": matrices.spirit_board.tolist(),
+            "spirit_layout": matrices.spirit_layout.tolist(),
+            "board_board": matrices.board_board.tolist(),
+            "spirit_adversary": matrices.spirit_adversary.tolist(),
+        },
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, ensure_ascii=False, indent=2)
+        handle.write("\n")
+
+
+def write_report_npz(path: Path, matrices: EraMatrices) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        path,
+        spirit_ids=np.array(matrices.spirit_ids),
+        board_ids=np.array(matrices.board_ids),
+        layout_ids=np.array(matrices.layout_ids),
+        adversary_ids=np.array(matrices.adversary_ids),
+        spirit_spirit=matrices.spirit_spirit,
+        spirit_board=matrices.spirit_board,
+        spirit_layout=matrices.spirit_layout,
+        board_board=matrices.board_board,
+        spirit_adversary=matrices.spirit_adversary,
+    )
+
+
+def run_era_report(
+    spirits_path: Path,
+    boards_path: Path,
+    adversaries_path: Path,
+    layouts_path: Path,
+    era_ids: Sequence[str] = (),
+    seeds: Sequence[int] = (),
+    json_path: Path | None = None,
+    npz_path: Path | None = None,
+) -> list[MatrixStats]:
+    if not era_ids and not seeds:
+        raise ValueError("At least one era_id or seed is required")
+
+    catalogs = load_catalogs(spirits_path, boards_path, adversaries_path, layouts_path)
+    if era_ids:
+        rows = load_firestore_rows(era_ids)
+    else:
+        rows = rows_from_plans(plan_era(seed, catalogs) for seed in seeds)
+
+    matrices = build_era_matrices(rows, catalogs, load_adversary_ids(adversaries_path))
+    stats = compute_era_stats(matrices)
+    for line in format_era_stats(stats):
+        print(line)
+    if json_path is not None:
+        write_report_json(json_path, matrices, stats)
+    if npz_path is not None:
+        write_report_npz(npz_path, matrices)
+    return stats
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Report co-occurrence balance statistics for one or more eras."
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--era-id",
+        action="append",
+        dest="era_ids",
+        help="Era stored in Firestore (repeat to aggregate several eras).",
+    )
+    source.add_argument(
+        "--seed",
+        action="append",
+        type=int,
+        dest="seeds",
+        help="Plan an era in memory with this seed (repeat to aggregate several).",
+    )
+    parser.add_argument(
+        "--spirits",
+        type=Path,
+        default=Path("pc/data/input/spirits.tsv"),
+        help="Path to the spirits TSV.",
+    )
+    parser.add_argument(
+        "--boards",
+        type=Path,
+        default=Path("pc/data/input/boards.tsv"),
+        help="Path to the boards TSV.",
+    )
+    parser.add_argument(
+        "--adversaries",
+        type=Path,
+        default=Path("pc/data/input/adversaries.tsv"),
+        help="Path to the adversaries TSV.",
+    )
+    parser.add_argument(
+        "--layouts",
+        type=Path,
+        default=Path("pc/data/input/layouts.tsv"),
+        help="Path to the layouts TSV.",
+    )
+    parser.add_argument("--json", type=Path, help="Optional JSON export path.")
+    parser.add_argument("--npz", type=Path, help="Optional NumPy .npz export path.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    run_era_report(
+        spirits_path=args.spirits,
+        boards_path=args.boards,
+        adversaries_path=args.adversaries,
+        layouts_path=args.layouts,
+        era_ids=args.era_ids or (),
+        seeds=args.seeds or (),
+        json_path=args.json,
+        npz_path=args.npz,
+    )
+
+
+if __name__ == "__main__":
+    main()
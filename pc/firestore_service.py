@@ -1,10 +1,35 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import Any
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterator, Sequence
 
 import firebase_admin
 from firebase_admin import firestore
+from google.api_core.exceptions import AlreadyExists
+from google.cloud.firestore_v1.field_path import FieldPath
+
+MAX_BATCH_WRITES = 500
+ERA_LIST_FIELDS = ("created_at", "updated_at", "is_active")
+PRESERVED_FIELDS = frozenset({"created_at"})
+
+
+@dataclass(frozen=True)
+class EraResetSummary:
+    created: int
+    updated: int
+    unchanged: int
+    deleted: int
+    sessions_deleted: int
+    full_rewrite_writes: int
+
+    @property
+    def writes(self) -> int:
+        return self.created + self.updated + self.deleted + self.sessions_deleted
+
+    @property
+    def writes_saved(self) -> int:
+        return self.full_rewrite_writes - self.writes
 
 
 def init_firestore() -> firestore.Client:
@@ -13,76 +38,214 @@ def init_firestore() -> firestore.Client:
     return firestore.client()
 
 
-def _resolve_sort_timestamp(data: dict[str, Any]) -> datetime:
-    for field_name in ("updated_at", "created_at"):
-        value = data.get(field_name)
-        if isinstance(value, datetime):
-            return value
-    return datetime.min.replace(tzinfo=timezone.utc)
-
-
-def list_eras(limit: int = 50) -> list[dict[str, Any]]:
+def list_eras(
+    limit: int = 50,
+    start_after: str | None = None,
+    fields: Sequence[str] = ERA_LIST_FIELDS,
+) -> list[dict[str, Any]]:
     db = init_firestore()
-    rows: list[dict[str, Any]] = []
+    eras_ref = db.collection("eras")
+    # Newest first, as before paging; the document id breaks created_at ties
+    # so cursors stay stable. Eras without created_at are not listed.
+    query = (
+        eras_ref.select(list(fields))
+        .order_by("created_at", direction=firestore.Query.DESCENDING)
+        .order_by(FieldPath.document_id(), direction=firestore.Query.DESCENDING)
+        .limit(limit)
+    )
+    if start_after is not None:
+        cursor = eras_ref.document(start_after).get(field_paths=["created_at"])
+        if not cursor.exists:
+            raise ValueError(f"Era not found: {start_after}")
+        query = query.start_after(cursor)
 
-    for era_snapshot in db.collection("eras").stream():
-        data = era_snapshot.to_dict() or {}
+    rows: list[dict[str, Any]] = []
+    for era_snapshot in query.stream():
         row: dict[str, Any] = {"era_id": era_snapshot.id}
-        row.update(data)
+        row.update(era_snapshot.to_dict() or {})
         rows.append(row)
-
-    has_timestamp = any(
-        isinstance(row.get("updated_at"), datetime) or isinstance(row.get("created_at"), datetime)
-        for row in rows
-    )
-
-    if has_timestamp:
-        rows.sort(
-            key=lambda row: (
-                _resolve_sort_timestamp(row),
-                row["era_id"],
-            ),
-            reverse=True,
-        )
-    else:
-        rows.sort(key=lambda row: row["era_id"])
-
-    return rows[:limit]
+    return rows
 
 
-def era_exists(era_id: str) -> bool:
+def list_era_incursions(
+    era_id: str, fields: Sequence[str] | None = None
+) -> list[dict[str, Any]]:
     db = init_firestore()
-    return db.collection("eras").document(era_id).get().exists
+    era_ref = db.collection("eras").document(era_id)
+    if not era_ref.get().exists:
+        raise ValueError(f"Era not found: {era_id}")
 
-
-def create_era(era_id: str) -> None:
-    db = init_firestore()
-    db.collection("eras").document(era_id).set(
-        {
-            "is_active": True,
-            "created_at": firestore.SERVER_TIMESTAMP,
+    query = era_descendants_query(db, era_ref, "incursions")
+    if fields is not None:
+        query = query.select(list(fields))
+    rows: list[dict[str, Any]] = []
+    for incursion_snapshot in query.stream():
+        row: dict[str, Any] = {
+            "period_id": incursion_snapshot.reference.parent.parent.id,
+            "incursion_id": incursion_snapshot.id,
         }
+        row.update(incursion_snapshot.to_dict() or {})
+        rows.append(row)
+    return rows
+
+
+def era_descendants_query(db: firestore.Client, era_ref, collection_id: str):
+    # Document names sort segment by segment, so "<era path>\0" is the first
+    # name after every descendant of this era (and before sibling eras).
+    document_id = FieldPath.document_id()
+    return (
+        db.collection_group(collection_id)
+        .order_by(document_id)
+        .start_at({document_id: era_ref})
+        .end_before({document_id: db.document(f"{era_ref.path}\0")})
     )
 
 
-def create_period(era_id: str, period_id: str, index: int) -> None:
+def list_era_ids() -> set[str]:
     db = init_firestore()
-    db.collection("eras").document(era_id).collection("periods").document(period_id).set(
-        {
-            "index": index,
-            "created_at": firestore.SERVER_TIMESTAMP,
-        }
-    )
+    return {era_ref.id for era_ref in db.collection("eras").list_documents()}
 
 
-def create_incursion(era_id: str, period_id: str, incursion_id: str, data: dict[str, Any]) -> None:
+def stream_incursion_changes(
+    since: datetime | None = None, fields: Sequence[str] | None = None
+) -> Iterator[tuple[str, dict[str, Any]]]:
+    db = init_firestore()
+    query = db.collection_group("incursions")
+    if since is not None:
+        query = query.where("updated_at", ">", since)
+    if fields is not None:
+        query = query.select(list(fields))
+    for incursion_snapshot in query.stream():
+        path = incursion_snapshot.reference.path
+        if path.startswith("eras/"):
+            yield path, incursion_snapshot.to_dict() or {}
+
+
+def era_document_data() -> dict[str, Any]:
+    return {
+        "is_active": True,
+        "created_at": firestore.SERVER_TIMESTAMP,
+    }
+
+
+def period_document_data(index: int) -> dict[str, Any]:
+    return {
+        "index": index,
+        "created_at": firestore.SERVER_TIMESTAMP,
+    }
+
+
+def write_era_tree(
+    era_id: str,
+    documents: Sequence[tuple[str, dict[str, Any]]],
+) -> int:
+    db = init_firestore()
+    era_ref = db.collection("eras").document(era_id)
+    refs = [(db.document(f"eras/{era_id}/{path}"), data) for path, data in documents]
+    try:
+        if len(refs) + 1 <= MAX_BATCH_WRITES:
+            batch = db.batch()
+            batch.create(era_ref, era_document_data())
+            for ref, data in refs:
+                batch.set(ref, data)
+            batch.commit()
+            return 1
+
+        era_ref.create(era_document_data())
+    except AlreadyExists as exc:
+        raise ValueError(f"Era already exists: {era_id}") from exc
+
+    bulk_writer = db.bulk_writer()
+    for ref, data in refs:
+        bulk_writer.set(ref, data)
+    bulk_writer.close()
+    return 2
+
+
+def document_changes(existing: dict[str, Any], target: dict[str, Any]) -> dict[str, Any]:
+    changes: dict[str, Any] = {}
+    stamps: dict[str, Any] = {}
+    for key, value in target.items():
+        if key in PRESERVED_FIELDS and key in existing:
+            continue
+        if value is firestore.SERVER_TIMESTAMP:
+            stamps[key] = value
+            if key not in existing:
+                changes[key] = value
+        elif key not in existing or existing[key] != value:
+            changes[key] = value
+    for key in existing.keys() - target.keys():
+        changes[key] = firestore.DELETE_FIELD
+    if changes:
+        changes.update(stamps)
+    return changes
+
+
+def reset_era_tree(
+    era_id: str,
+    documents: Sequence[tuple[str, dict[str, Any]]],
+    dry_run: bool = False,
+) -> EraResetSummary:
     db = init_firestore()
-    (
-        db.collection("eras")
-        .document(era_id)
-        .collection("periods")
-        .document(period_id)
-        .collection("incursions")
-        .document(incursion_id)
-        .set(data)
+    era_ref = db.collection("eras").document(era_id)
+    prefix = f"{era_ref.path}/"
+
+    era_snapshot = era_ref.get()
+    if not era_snapshot.exists:
+        # Reset rewrites an existing era; creating one is the job of generate.
+        raise ValueError(f"Era not found: {era_id} (use generate to create it)")
+    existing: dict[str, dict[str, Any]] = {}
+    for snapshot in era_ref.collection("periods").stream():
+        existing[snapshot.reference.path.removeprefix(prefix)] = snapshot.to_dict() or {}
+    for snapshot in era_descendants_query(db, era_ref, "incursions").stream():
+        existing[snapshot.reference.path.removeprefix(prefix)] = snapshot.to_dict() or {}
+    session_refs = [
+        snapshot.reference
+        for snapshot in era_descendants_query(db, era_ref, "sessions")
+        .select([FieldPath.document_id()])
+        .stream()
+    ]
+
+    creates: list[tuple[Any, dict[str, Any]]] = []
+    updates: list[tuple[Any, dict[str, Any]]] = []
+    unchanged = 0
+    targets = [("", era_document_data()), *documents]
+    for path, data in targets:
+        ref = db.document(f"{prefix}{path}") if path else era_ref
+        current = era_snapshot.to_dict() if not path and era_snapshot.exists else existing.get(path)
+        if current is None:
+            creates.append((ref, data))
+            continue
+        changes = document_changes(current, data)
+        if changes:
+            updates.append((ref, changes))
+        else:
+            unchanged += 1
+    target_paths = {path for path, _ in documents}
+    deletes = [db.document(f"{prefix}{path}") for path in existing if path not in target_paths]
+    deletes.extend(session_refs)
+
+    write_count = len(creates) + len(updates) + len(deletes)
+    if not dry_run:
+        use_batch = write_count <= MAX_BATCH_WRITES
+        writer = db.batch() if use_batch else db.bulk_writer()
+        for ref, data in creates:
+            writer.set(ref, data)
+        for ref, changes in updates:
+            writer.update(ref, changes)
+        for ref in deletes:
+            writer.delete(ref)
+        if not use_batch:
+            writer.close()
+        elif write_count:
+            writer.commit()
+
+    existing_total = int(era_snapshot.exists) + len(existing) + len(session_refs)
+    return EraResetSummary(
+        created=len(creates),
+        updated=len(updates),
+        unchanged=unchanged,
+        deleted=len(deletes) - len(session_refs),
+        sessions_deleted=len(session_refs),
+        full_rewrite_writes=existing_total + len(targets),
     )
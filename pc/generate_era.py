@@ -5,18 +5,37 @@ from __future__ import annotations
 
 import argparse
 import csv
+import json
+import os
 import random
-from dataclasses import dataclass
-from itertools import cycle
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from multiprocessing import freeze_support
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Callable, Iterable, Iterator, Sequence, TextIO
 
 if __package__:
-    from .firestore_service import create_era, create_incursion, create_period, era_exists
+    from .era_history import DEFAULT_HISTORY_PATH, HistoryEntry, refresh_history_index
+    from .firestore_service import (
+        EraResetSummary,
+        period_document_data,
+        reset_era_tree,
+        write_era_tree,
+    )
 else:
-    from firestore_service import create_era, create_incursion, create_period, era_exists
+    from era_history import DEFAULT_HISTORY_PATH, HistoryEntry, refresh_history_index
+    from firestore_service import (
+        EraResetSummary,
+        period_document_data,
+        reset_era_tree,
+        write_era_tree,
+    )
 
 from dotenv import load_dotenv
+from firebase_admin import firestore
 
 load_dotenv()
 
@@ -38,6 +57,58 @@ class Layout:
     is_active: int
 
 
+@dataclass(frozen=True)
+class EraCatalogs:
+    spirits: tuple[Spirit, ...]
+    boards: tuple[Board, ...]
+    layouts: tuple[Layout, ...]
+
+
+@dataclass(frozen=True)
+class IncursionPlan:
+    index: int
+    spirit_1_id: str
+    spirit_2_id: str
+    board_1: str
+    board_2: str
+    board_layout: str
+
+    @property
+    def incursion_id(self) -> str:
+        return f"i{self.index:02d}"
+
+
+@dataclass(frozen=True)
+class PeriodPlan:
+    index: int
+    incursions: tuple[IncursionPlan, ...]
+    bye_spirit_id: str | None = None
+
+    @property
+    def period_id(self) -> str:
+        return f"p{self.index:02d}"
+
+
+@dataclass(frozen=True)
+class EraPlan:
+    seed: int
+    periods: tuple[PeriodPlan, ...]
+
+
+EraPlanSink = Callable[[str, EraPlan], None]
+
+PLAN_COLUMNS = [
+    "era_id",
+    "period_index",
+    "incursion_index",
+    "spirit_1_id",
+    "spirit_2_id",
+    "board_1",
+    "board_2",
+    "board_layout",
+]
+
+
 def require_columns(
     fieldnames: Sequence[str] | None, required: Iterable[str], path: Path
 ) -> None:
@@ -99,24 +170,40 @@ def load_layouts(path: Path) -> list[Layout]:
     return layouts
 
 
+def load_catalogs(
+    spirits_path: Path,
+    boards_path: Path,
+    adversaries_path: Path,
+    layouts_path: Path,
+) -> EraCatalogs:
+    validate_adversaries(adversaries_path)
+    return EraCatalogs(
+        spirits=tuple(load_spirits(spirits_path)),
+        boards=tuple(load_boards(boards_path)),
+        layouts=tuple(select_layouts(load_layouts(layouts_path))),
+    )
+
+
 def generate_round_robin(
     spirits: Sequence[Spirit],
 ) -> list[list[tuple[Spirit, Spirit]]]:
     total = len(spirits)
     if total < 2:
         raise ValueError("At least 2 spirits are required to generate rounds")
-    if total % 2 != 0:
-        raise ValueError("The number of spirits must be even to form pairs")
 
-    order = list(spirits)
+    order: list[Spirit | None] = list(spirits)
+    if total % 2 != 0:
+        order.append(None)
+    slots = len(order)
     rounds: list[list[tuple[Spirit, Spirit]]] = []
 
-    for _ in range(total - 1):
+    for _ in range(slots - 1):
         pairs: list[tuple[Spirit, Spirit]] = []
-        for idx in range(total // 2):
+        for idx in range(slots // 2):
             spirit_1 = order[idx]
-            spirit_2 = order[total - 1 - idx]
-            pairs.append((spirit_1, spirit_2))
+            spirit_2 = order[slots - 1 - idx]
+            if spirit_1 is not None and spirit_2 is not None:
+                pairs.append((spirit_1, spirit_2))
         rounds.append(pairs)
 
         fixed = order[0]
@@ -127,211 +214,689 @@ def generate_round_robin(
     return rounds
 
 
-def generate_board_rounds(boards: Sequence[Board]) -> list[list[tuple[Board, Board]]]:
-    total = len(boards)
-    if total < 2:
-        raise ValueError("At least 2 boards are required to generate rounds")
-    if total % 2 != 0:
-        raise ValueError("The number of boards must be even to form pairs")
+def select_layouts(layouts: Sequence[Layout]) -> list[Layout]:
+    filtered = [
+        layout
+        for layout in layouts
+        if layout.player_count == 2 and layout.is_active == 1
+    ]
+    if not filtered:
+        raise ValueError("No active layouts found for 2 players")
+    return filtered
 
-    order = list(boards)
-    rounds: list[list[tuple[Board, Board]]] = []
 
-    for _ in range(total - 1):
-        pairs: list[tuple[Board, Board]] = []
-        for idx in range(total // 2):
-            board_1 = order[idx]
-            board_2 = order[total - 1 - idx]
-            pairs.append((board_1, board_2))
-        rounds.append(pairs)
+@dataclass(frozen=True)
+class BalanceWeights:
+    spirit_board: float = 2.0
+    spirit_layout: float = 2.0
+    pair_layout: float = 2.0
+    board_pair_layout: float = 0.5
+    period_board: float = 6.0
+    period_layout: float = 6.0
+
+
+@dataclass
+class BalanceCounters:
+    spirit_board: Counter = field(default_factory=Counter)
+    spirit_layout: Counter = field(default_factory=Counter)
+    pair_layout: Counter = field(default_factory=Counter)
+    board_pair_layout: Counter = field(default_factory=Counter)
+
+    def copy(self) -> BalanceCounters:
+        return BalanceCounters(
+            spirit_board=Counter(self.spirit_board),
+            spirit_layout=Counter(self.spirit_layout),
+            pair_layout=Counter(self.pair_layout),
+            board_pair_layout=Counter(self.board_pair_layout),
+        )
 
-        fixed = order[0]
-        remaining = order[1:]
-        remaining = [remaining[-1]] + remaining[:-1]
-        order = [fixed] + remaining
 
-    return rounds
+@dataclass(frozen=True)
+class PlanMetrics:
+    cost: float
+    spirit_board_max: int
+    spirit_board_spread: int
+    spirit_layout_max: int
+    spirit_layout_spread: int
+    pair_layout_repeats: int
+    board_pair_layout_max: int
+    period_board_spread: int
+    period_layout_repeats: int
+    seat_spread: int
+    byes: int
+
+    def rank_key(self) -> tuple[float, ...]:
+        return (
+            self.period_board_spread,
+            self.spirit_board_spread,
+            self.spirit_layout_spread,
+            self.period_layout_repeats,
+            self.pair_layout_repeats,
+            self.seat_spread,
+            self.cost,
+        )
+
+
+@dataclass(frozen=True)
+class SeedCandidate:
+    seed: int
+    metrics: PlanMetrics
+
+
+def _pair_key(first: str, second: str) -> tuple[str, str]:
+    return (first, second) if first <= second else (second, first)
+
+
+@dataclass
+class _Slot:
+    period: int
+    spirit_1: str
+    spirit_2: str
+    choice: tuple[str, str, str] | None = None
+
+    @property
+    def pair(self) -> tuple[str, str]:
+        return _pair_key(self.spirit_1, self.spirit_2)
+
+
+Choice = tuple[str, str, str]
+
+SWAP_PARTNERS = 6
+
+
+class EraPlanner:
+    """Greedy construction plus local search over a squared-count balance objective."""
+
+    def __init__(
+        self,
+        catalogs: EraCatalogs,
+        rng: random.Random,
+        weights: BalanceWeights | None = None,
+        history: BalanceCounters | None = None,
+        max_sweeps: int = 8,
+    ) -> None:
+        if len(catalogs.boards) < 2:
+            raise ValueError("At least 2 boards are required to assign per incursion")
+        if not catalogs.layouts:
+            raise ValueError("No active layouts found for 2 players")
+        self.rng = rng
+        self.weights = weights or BalanceWeights()
+        self.counters = history.copy() if history is not None else BalanceCounters()
+        self.period_board: Counter = Counter()
+        self.period_layout: Counter = Counter()
+        self.max_sweeps = max_sweeps
+        self.board_ids = [board.board_id for board in catalogs.boards]
+        self.layout_ids = [layout.layout_id for layout in catalogs.layouts]
+        self.board_orders = [
+            (board_1, board_2, _pair_key(board_1, board_2))
+            for board_1 in self.board_ids
+            for board_2 in self.board_ids
+            if board_1 != board_2
+        ]
 
+    def _terms(self, slot: _Slot, choice: Choice) -> list[tuple[float, Counter, tuple]]:
+        board_1, board_2, layout = choice
+        weights = self.weights
+        counters = self.counters
+        return [
+            (weights.spirit_board, counters.spirit_board, (slot.spirit_1, board_1)),
+            (weights.spirit_board, counters.spirit_board, (slot.spirit_2, board_2)),
+            (weights.spirit_layout, counters.spirit_layout, (slot.spirit_1, layout)),
+            (weights.spirit_layout, counters.spirit_layout, (slot.spirit_2, layout)),
+            (weights.pair_layout, counters.pair_layout, (slot.pair, layout)),
+            (
+                weights.board_pair_layout,
+                counters.board_pair_layout,
+                (_pair_key(board_1, board_2), layout),
+            ),
+            (weights.period_board, self.period_board, (slot.period, board_1)),
+            (weights.period_board, self.period_board, (slot.period, board_2)),
+            (weights.period_layout, self.period_layout, (slot.period, layout)),
+        ]
 
-def assign_boards(
-    boards: Sequence[Board],
-    match_count: int,
-    rng: random.Random,
-) -> list[tuple[Board, Board]]:
-    if len(boards) < 2:
-        raise ValueError("At least 2 boards are required to assign per incursion")
-    slots = match_count * 2
-    if slots < len(boards):
-        raise ValueError("Not enough incursions to use all boards in the period")
-    if slots % len(boards) != 0:
-        raise ValueError("Boards cannot be perfectly balanced in the period")
-
-    repetitions = slots // len(boards)
-    rounds = generate_board_rounds(boards)
-    round_pool = list(rounds)
-    rng.shuffle(round_pool)
-
-    selected_rounds: list[list[tuple[Board, Board]]] = []
-    if repetitions <= len(round_pool):
-        selected_rounds = round_pool[:repetitions]
-    else:
-        for board_round in cycle(round_pool):
-            selected_rounds.append(board_round)
-            if len(selected_rounds) >= repetitions:
+    def _apply(self, slot: _Slot, choice: Choice, delta: int) -> None:
+        for _, counter, key in self._terms(slot, choice):
+            counter[key] += delta
+
+    def _choice_cost(self, slot: _Slot, choice: Choice) -> float:
+        return sum(
+            weight * (2 * counter[key] + 1)
+            for weight, counter, key in self._terms(slot, choice)
+        )
+
+    @staticmethod
+    def _transfer(weight: float, counter: Counter, out_key: tuple, in_key: tuple) -> float:
+        if out_key == in_key:
+            return 0.0
+        return weight * (2 * (counter[in_key] - counter[out_key]) + 2)
+
+    def _layout_swap_delta(self, first: _Slot, second: _Slot) -> float:
+        # Period counts are unchanged by a swap within the period, and the two
+        # slots never share a spirit, so only these transfers move the cost.
+        weights = self.weights
+        counters = self.counters
+        board_1, board_2, layout = first.choice
+        other_1, other_2, other_layout = second.choice
+        delta = 0.0
+        for spirit in (first.spirit_1, first.spirit_2):
+            delta += self._transfer(
+                weights.spirit_layout,
+                counters.spirit_layout,
+                (spirit, layout),
+                (spirit, other_layout),
+            )
+        for spirit in (second.spirit_1, second.spirit_2):
+            delta += self._transfer(
+                weights.spirit_layout,
+                counters.spirit_layout,
+                (spirit, other_layout),
+                (spirit, layout),
+            )
+        delta += self._transfer(
+            weights.pair_layout,
+            counters.pair_layout,
+            (first.pair, layout),
+            (first.pair, other_layout),
+        )
+        delta += self._transfer(
+            weights.pair_layout,
+            counters.pair_layout,
+            (second.pair, other_layout),
+            (second.pair, layout),
+        )
+        board_pair = _pair_key(board_1, board_2)
+        other_board_pair = _pair_key(other_1, other_2)
+        if board_pair != other_board_pair:
+            delta += self._transfer(
+                weights.board_pair_layout,
+                counters.board_pair_layout,
+                (board_pair, layout),
+                (board_pair, other_layout),
+            )
+            delta += self._transfer(
+                weights.board_pair_layout,
+                counters.board_pair_layout,
+                (other_board_pair, other_layout),
+                (other_board_pair, layout),
+            )
+        return delta
+
+    def _board_swap_delta(self, first: _Slot, second: _Slot) -> float:
+        weights = self.weights
+        counters = self.counters
+        board_1, board_2, layout = first.choice
+        other_1, other_2, other_layout = second.choice
+        delta = (
+            self._transfer(
+                weights.spirit_board,
+                counters.spirit_board,
+                (first.spirit_1, board_1),
+                (first.spirit_1, other_1),
+            )
+            + self._transfer(
+                weights.spirit_board,
+                counters.spirit_board,
+                (first.spirit_2, board_2),
+                (first.spirit_2, other_2),
+            )
+            + self._transfer(
+                weights.spirit_board,
+                counters.spirit_board,
+                (second.spirit_1, other_1),
+                (second.spirit_1, board_1),
+            )
+            + self._transfer(
+                weights.spirit_board,
+                counters.spirit_board,
+                (second.spirit_2, other_2),
+                (second.spirit_2, board_2),
+            )
+        )
+        board_pair = _pair_key(board_1, board_2)
+        other_board_pair = _pair_key(other_1, other_2)
+        if board_pair != other_board_pair and layout != other_layout:
+            delta += self._transfer(
+                weights.board_pair_layout,
+                counters.board_pair_layout,
+                (board_pair, layout),
+                (other_board_pair, layout),
+            )
+            delta += self._transfer(
+                weights.board_pair_layout,
+                counters.board_pair_layout,
+                (other_board_pair, other_layout),
+                (board_pair, other_layout),
+            )
+        return delta
+
+    def _best_choice(self, slot: _Slot) -> tuple[float, Choice]:
+        # Adding one to a squared count c costs 2c + 1, so each candidate is
+        # scored from current counts without recomputing the whole objective.
+        weights = self.weights
+        counters = self.counters
+        period_board = {
+            board: weights.period_board * (2 * self.period_board[(slot.period, board)] + 1)
+            for board in self.board_ids
+        }
+        board_cost_1 = {
+            board: weights.spirit_board
+            * (2 * counters.spirit_board[(slot.spirit_1, board)] + 1)
+            + period_board[board]
+            for board in self.board_ids
+        }
+        board_cost_2 = {
+            board: weights.spirit_board
+            * (2 * counters.spirit_board[(slot.spirit_2, board)] + 1)
+            + period_board[board]
+            for board in self.board_ids
+        }
+        pair = slot.pair
+        layout_cost = {
+            layout: weights.spirit_layout
+            * (
+                2 * counters.spirit_layout[(slot.spirit_1, layout)]
+                + 2 * counters.spirit_layout[(slot.spirit_2, layout)]
+                + 2
+            )
+            + weights.pair_layout * (2 * counters.pair_layout[(pair, layout)] + 1)
+            + weights.period_layout * (2 * self.period_layout[(slot.period, layout)] + 1)
+            for layout in self.layout_ids
+        }
+
+        best_cost = float("inf")
+        best: list[Choice] = []
+        for board_1, board_2, board_pair in self.board_orders:
+            base = board_cost_1[board_1] + board_cost_2[board_2]
+            for layout in self.layout_ids:
+                cost = (
+                    base
+                    + layout_cost[layout]
+                    + weights.board_pair_layout
+                    * (2 * counters.board_pair_layout[(board_pair, layout)] + 1)
+                )
+                if cost < best_cost - 1e-9:
+                    best_cost = cost
+                    best = [(board_1, board_2, layout)]
+                elif cost <= best_cost + 1e-9:
+                    best.append((board_1, board_2, layout))
+        return best_cost, self.rng.choice(best)
+
+    def _swap(self, first: _Slot, second: _Slot, first_choice: Choice, second_choice: Choice) -> None:
+        for slot, new_choice in ((first, first_choice), (second, second_choice)):
+            self._apply(slot, slot.choice, -1)
+            self._apply(slot, new_choice, 1)
+            slot.choice = new_choice
+
+    def _swap_pass(self, period_slots: list[_Slot]) -> bool:
+        # Swapping layouts or boards between two incursions of the same period
+        # keeps the per-period balance intact, which single-slot moves cannot.
+        improved = False
+        for idx, first in enumerate(period_slots):
+            partners = period_slots[idx + 1 :]
+            if len(partners) > SWAP_PARTNERS:
+                partners = self.rng.sample(partners, SWAP_PARTNERS)
+            for second in partners:
+                board_1, board_2, layout = first.choice
+                other_1, other_2, other_layout = second.choice
+                if layout != other_layout and self._layout_swap_delta(first, second) < -1e-9:
+                    self._swap(
+                        first,
+                        second,
+                        (board_1, board_2, other_layout),
+                        (other_1, other_2, layout),
+                    )
+                    improved = True
+                board_1, board_2, layout = first.choice
+                other_1, other_2, other_layout = second.choice
+                if (board_1, board_2) != (other_1, other_2) and (
+                    self._board_swap_delta(first, second) < -1e-9
+                ):
+                    self._swap(
+                        first,
+                        second,
+                        (other_1, other_2, layout),
+                        (board_1, board_2, other_layout),
+                    )
+                    improved = True
+        return improved
+
+    def solve(self, slots: list[_Slot]) -> None:
+        for slot in slots:
+            _, slot.choice = self._best_choice(slot)
+            self._apply(slot, slot.choice, 1)
+
+        by_period: dict[int, list[_Slot]] = {}
+        for slot in slots:
+            by_period.setdefault(slot.period, []).append(slot)
+
+        order = list(slots)
+        for _ in range(self.max_sweeps):
+            improved = False
+            self.rng.shuffle(order)
+            for slot in order:
+                self._apply(slot, slot.choice, -1)
+                best_cost, best_choice = self._best_choice(slot)
+                if best_cost < self._choice_cost(slot, slot.choice) - 1e-9:
+                    slot.choice = best_choice
+                    improved = True
+                self._apply(slot, slot.choice, 1)
+            for period_slots in by_period.values():
+                improved |= self._swap_pass(period_slots)
+            if not improved:
                 break
 
-    pairs: list[tuple[Board, Board]] = []
-    for board_round in selected_rounds:
-        pairs.extend(board_round)
 
-    return pairs
+def _count_pairings(pairings: Iterable[HistoryEntry | IncursionPlan]) -> BalanceCounters:
+    counters = BalanceCounters()
+    for item in pairings:
+        layout = item.board_layout
+        counters.spirit_board[(item.spirit_1_id, item.board_1)] += 1
+        counters.spirit_board[(item.spirit_2_id, item.board_2)] += 1
+        counters.spirit_layout[(item.spirit_1_id, layout)] += 1
+        counters.spirit_layout[(item.spirit_2_id, layout)] += 1
+        counters.pair_layout[(_pair_key(item.spirit_1_id, item.spirit_2_id), layout)] += 1
+        counters.board_pair_layout[(_pair_key(item.board_1, item.board_2), layout)] += 1
+    return counters
+
+
+def history_counters(entries: Iterable[HistoryEntry]) -> BalanceCounters:
+    return _count_pairings(entries)
+
+
+def plan_era(
+    seed: int,
+    catalogs: EraCatalogs,
+    weights: BalanceWeights | None = None,
+    history: BalanceCounters | None = None,
+) -> EraPlan:
+    rng = random.Random(seed)
+    rounds = generate_round_robin(catalogs.spirits)
+    rng.shuffle(rounds)
+
+    slots_by_period: list[list[_Slot]] = []
+    for period_index, pairs in enumerate(rounds, start=1):
+        period_pairs = list(pairs)
+        rng.shuffle(period_pairs)
+        period_slots: list[_Slot] = []
+        for spirit_1, spirit_2 in period_pairs:
+            if rng.random() < 0.5:
+                spirit_1, spirit_2 = spirit_2, spirit_1
+            period_slots.append(
+                _Slot(
+                    period=period_index,
+                    spirit_1=spirit_1.spirit_id,
+                    spirit_2=spirit_2.spirit_id,
+                )
+            )
+        slots_by_period.append(period_slots)
+
+    planner = EraPlanner(catalogs, rng, weights=weights, history=history)
+    planner.solve([slot for period_slots in slots_by_period for slot in period_slots])
+
+    spirit_ids = [spirit.spirit_id for spirit in catalogs.spirits]
+    periods: list[PeriodPlan] = []
+    for period_index, period_slots in enumerate(slots_by_period, start=1):
+        playing = {slot.spirit_1 for slot in period_slots} | {
+            slot.spirit_2 for slot in period_slots
+        }
+        bye = next((spirit_id for spirit_id in spirit_ids if spirit_id not in playing), None)
+        incursions = tuple(
+            IncursionPlan(
+                index=incursion_index,
+                spirit_1_id=slot.spirit_1,
+                spirit_2_id=slot.spirit_2,
+                board_1=slot.choice[0],
+                board_2=slot.choice[1],
+                board_layout=slot.choice[2],
+            )
+            for incursion_index, slot in enumerate(period_slots, start=1)
+        )
+        periods.append(
+            PeriodPlan(index=period_index, incursions=incursions, bye_spirit_id=bye)
+        )
 
+    return EraPlan(seed=seed, periods=tuple(periods))
 
-def select_layouts(layouts: Sequence[Layout]) -> list[Layout]:
-    filtered = [
-        layout
-        for layout in layouts
-        if layout.player_count == 2 and layout.is_active == 1
-    ]
-    if not filtered:
-        raise ValueError("No active layouts found for 2 players")
-    return filtered
 
+def count_plan_balance(plan: EraPlan) -> BalanceCounters:
+    return _count_pairings(
+        incursion for period in plan.periods for incursion in period.incursions
+    )
 
-def assign_layouts(
-    layouts: Sequence[Layout],
-    match_count: int,
-    period_index: int,
-) -> list[Layout]:
-    if match_count <= 0:
-        return []
-    shift = (period_index - 1) % len(layouts)
-    permutation = list(layouts[shift:]) + list(layouts[:shift])
-    if match_count <= len(layouts):
-        return permutation[:match_count]
-    selection: list[Layout] = []
-    for layout in cycle(permutation):
-        selection.append(layout)
-        if len(selection) >= match_count:
-            break
-    return selection
-
-
-def write_era_tsv(
-    path: Path,
-    era_id: str,
-    rounds: Sequence[Sequence[tuple[Spirit, Spirit]]],
-    boards: Sequence[Board],
-    layouts: Sequence[Layout],
-    rng: random.Random,
-) -> None:
-    headers = [
-        "era_id",
-        "period_index",
-        "incursion_index",
-        "spirit_1_id",
-        "spirit_2_id",
-        "board_1",
-        "board_2",
-        "board_layout",
+
+def _grid_spread(counter: Counter, rows: Sequence[str], columns: Sequence[str]) -> int:
+    values = [counter[(row, column)] for row in rows for column in columns]
+    return max(values) - min(values) if values else 0
+
+
+def compute_plan_metrics(
+    plan: EraPlan,
+    catalogs: EraCatalogs,
+    weights: BalanceWeights | None = None,
+) -> PlanMetrics:
+    resolved_weights = weights or BalanceWeights()
+    counters = count_plan_balance(plan)
+    spirit_ids = [spirit.spirit_id for spirit in catalogs.spirits]
+    board_ids = [board.board_id for board in catalogs.boards]
+    layout_ids = [layout.layout_id for layout in catalogs.layouts]
+
+    seats: Counter = Counter()
+    period_board_spread = 0
+    period_layout_repeats = 0
+    period_cost = 0.0
+    for period in plan.periods:
+        for incursion in period.incursions:
+            seats[incursion.spirit_1_id] += 1
+            seats[incursion.spirit_2_id] -= 1
+        board_counts = Counter(
+            board
+            for incursion in period.incursions
+            for board in (incursion.board_1, incursion.board_2)
+        )
+        layout_counts = Counter(incursion.board_layout for incursion in period.incursions)
+        values = [board_counts[board_id] for board_id in board_ids]
+        period_board_spread = max(period_board_spread, max(values) - min(values))
+        period_layout_repeats += sum(count - 1 for count in layout_counts.values())
+        period_cost += resolved_weights.period_board * sum(
+            count**2 for count in board_counts.values()
+        )
+        period_cost += resolved_weights.period_layout * sum(
+            count**2 for count in layout_counts.values()
+        )
+
+    def square_sum(counter: Counter) -> int:
+        return sum(count**2 for count in counter.values())
+
+    cost = (
+        period_cost
+        + resolved_weights.spirit_board * square_sum(counters.spirit_board)
+        + resolved_weights.spirit_layout * square_sum(counters.spirit_layout)
+        + resolved_weights.pair_layout * square_sum(counters.pair_layout)
+        + resolved_weights.board_pair_layout * square_sum(counters.board_pair_layout)
+    )
+    return PlanMetrics(
+        cost=cost,
+        spirit_board_max=max(counters.spirit_board.values(), default=0),
+        spirit_board_spread=_grid_spread(counters.spirit_board, spirit_ids, board_ids),
+        spirit_layout_max=max(counters.spirit_layout.values(), default=0),
+        spirit_layout_spread=_grid_spread(
+            counters.spirit_layout, spirit_ids, layout_ids
+        ),
+        pair_layout_repeats=sum(
+            count - 1 for count in counters.pair_layout.values() if count > 1
+        ),
+        board_pair_layout_max=max(counters.board_pair_layout.values(), default=0),
+        period_board_spread=period_board_spread,
+        period_layout_repeats=period_layout_repeats,
+        seat_spread=max((abs(balance) for balance in seats.values()), default=0),
+        byes=sum(1 for period in plan.periods if period.bye_spirit_id),
+    )
+
+
+def format_plan_metrics(metrics: PlanMetrics) -> list[str]:
+    return [
+        f"cost={metrics.cost:g}",
+        f"spirit x board: max={metrics.spirit_board_max} "
+        f"spread={metrics.spirit_board_spread}",
+        f"spirit x layout: max={metrics.spirit_layout_max} "
+        f"spread={metrics.spirit_layout_spread}",
+        f"pair x layout repeats={metrics.pair_layout_repeats}",
+        f"board pair x layout max={metrics.board_pair_layout_max}",
+        f"period boards spread={metrics.period_board_spread}",
+        f"period layout repeats={metrics.period_layout_repeats}",
+        f"seat spread={metrics.seat_spread}",
+        f"byes={metrics.byes}",
     ]
 
+
+def evaluate_seed(
+    seed: int, catalogs: EraCatalogs, history: BalanceCounters | None = None
+) -> SeedCandidate:
+    plan = plan_era(seed, catalogs, history=history)
+    return SeedCandidate(seed=seed, metrics=compute_plan_metrics(plan, catalogs))
+
+
+def search_seeds(
+    catalogs: EraCatalogs,
+    seeds: Sequence[int],
+    top_k: int = 5,
+    max_workers: int | None = None,
+    history: BalanceCounters | None = None,
+) -> list[SeedCandidate]:
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(seeds) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        candidates = list(
+            executor.map(
+                partial(evaluate_seed, catalogs=catalogs, history=history),
+                seeds,
+                chunksize=chunksize,
+            )
+        )
+    candidates.sort(key=lambda candidate: (candidate.metrics.rank_key(), candidate.seed))
+    return candidates[:top_k]
+
+
+def iter_plan_rows(era_id: str, plan: EraPlan) -> Iterator[list[str | int]]:
+    for period in plan.periods:
+        for incursion in period.incursions:
+            yield [
+                era_id,
+                period.index,
+                incursion.index,
+                incursion.spirit_1_id,
+                incursion.spirit_2_id,
+                incursion.board_1,
+                incursion.board_2,
+                incursion.board_layout,
+            ]
+
+
+def write_era_tsv(path: Path, era_id: str, plan: EraPlan) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8", newline="") as handle:
         writer = csv.writer(handle, delimiter="\t")
-        writer.writerow(headers)
-
-        shuffled_rounds = list(rounds)
-        rng.shuffle(shuffled_rounds)
-
-        for period_index, pairs in enumerate(shuffled_rounds, start=1):
-            board_pairs = assign_boards(boards, len(pairs), rng)
-            period_layouts = assign_layouts(layouts, len(pairs), period_index)
-            rng.shuffle(period_layouts)
-
-            incursion_entries = list(zip(pairs, board_pairs))
-            rng.shuffle(incursion_entries)
-
-            for incursion_index, (
-                ((spirit_1, spirit_2), (board_1, board_2)),
-                layout,
-            ) in enumerate(
-                zip(incursion_entries, period_layouts),
-                start=1,
-            ):
-                if rng.random() < 0.5:
-                    spirit_1, spirit_2 = spirit_2, spirit_1
-                if rng.random() < 0.5:
-                    board_1, board_2 = board_2, board_1
-                writer.writerow(
-                    [
-                        era_id,
-                        period_index,
-                        incursion_index,
-                        spirit_1.spirit_id,
-                        spirit_2.spirit_id,
-                        board_1.board_id,
-                        board_2.board_id,
-                        layout.layout_id,
-                    ]
-                )
+        writer.writerow(PLAN_COLUMNS)
+        writer.writerows(iter_plan_rows(era_id, plan))
+
+
+def write_era_json(path: Path, era_id: str, plan: EraPlan) -> None:
+    payload = {
+        "era_id": era_id,
+        "seed": plan.seed,
+        "periods": [
+            {
+                "period_id": period.period_id,
+                "index": period.index,
+                "bye_spirit_id": period.bye_spirit_id,
+                "incursions": [
+                    {"incursion_id": incursion.incursion_id, **asdict(incursion)}
+                    for incursion in period.incursions
+                ],
+            }
+            for period in plan.periods
+        ],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def print_era_plan(era_id: str, plan: EraPlan, stream: TextIO | None = None) -> None:
+    output = stream or sys.stdout
+    print(f"era_id={era_id} seed={plan.seed}", file=output)
+    for period in plan.periods:
+        bye = f" (bye: {period.bye_spirit_id})" if period.bye_spirit_id else ""
+        print(f"{period.period_id}:{bye}", file=output)
+        for incursion in period.incursions:
+            print(
+                f"  {incursion.incursion_id} "
+                f"{incursion.spirit_1_id} + {incursion.spirit_2_id} | "
+                f"{incursion.board_1} + {incursion.board_2} | "
+                f"{incursion.board_layout}",
+                file=output,
+            )
 
 
-def write_era_firestore(
-    era_id: str,
-    rounds: Sequence[Sequence[tuple[Spirit, Spirit]]],
-    boards: Sequence[Board],
-    layouts: Sequence[Layout],
-    rng: random.Random,
-) -> None:
-    if era_exists(era_id):
-        raise ValueError(f"Era already exists: {era_id}")
+def incursion_document_data(incursion: IncursionPlan) -> dict:
+    return {
+        "index": incursion.index,
+        "spirit_1_id": incursion.spirit_1_id,
+        "spirit_2_id": incursion.spirit_2_id,
+        "board_1": incursion.board_1,
+        "board_2": incursion.board_2,
+        "board_layout": incursion.board_layout,
+        "adversary_id": None,
+        "started_at": None,
+        "ended_at": None,
+        "exported": False,
+        "updated_at": firestore.SERVER_TIMESTAMP,
+    }
+
+
+def era_plan_documents(plan: EraPlan) -> list[tuple[str, dict]]:
+    documents: list[tuple[str, dict]] = []
+    for period in plan.periods:
+        documents.append(
+            (f"periods/{period.period_id}", period_document_data(period.index))
+        )
+        documents.extend(
+            (
+                f"periods/{period.period_id}/incursions/{incursion.incursion_id}",
+                incursion_document_data(incursion),
+            )
+            for incursion in period.incursions
+        )
+    return documents
 
-    create_era(era_id)
 
-    shuffled_rounds = list(rounds)
-    rng.shuffle(shuffled_rounds)
+def write_era_firestore(era_id: str, plan: EraPlan) -> None:
+    write_era_tree(era_id, era_plan_documents(plan))
 
-    for period_index, pairs in enumerate(shuffled_rounds, start=1):
-        period_id = f"p{period_index:02d}"
-        create_period(era_id, period_id, period_index)
 
-        board_pairs = assign_boards(boards, len(pairs), rng)
-        period_layouts = assign_layouts(layouts, len(pairs), period_index)
-        rng.shuffle(period_layouts)
+def format_reset_summary(summary: EraResetSummary) -> list[str]:
+    return [
+        f"created={summary.created} updated={summary.updated} "
+        f"unchanged={summary.unchanged} deleted={summary.deleted} "
+        f"sessions deleted={summary.sessions_deleted}",
+        f"writes={summary.writes} (delete + recreate: {summary.full_rewrite_writes}, "
+        f"saved: {summary.writes_saved})",
+    ]
 
-        incursion_entries = list(zip(pairs, board_pairs))
-        rng.shuffle(incursion_entries)
 
-        for incursion_index, (
-            ((spirit_1, spirit_2), (board_1, board_2)),
-            layout,
-        ) in enumerate(
-            zip(incursion_entries, period_layouts),
-            start=1,
-        ):
-            if rng.random() < 0.5:
-                spirit_1, spirit_2 = spirit_2, spirit_1
-            if rng.random() < 0.5:
-                board_1, board_2 = board_2, board_1
-            incursion_id = f"i{incursion_index:02d}"
-            create_incursion(
-                era_id,
-                period_id,
-                incursion_id,
-                {
-                    "index": incursion_index,
-                    "spirit_1_id": spirit_1.spirit_id,
-                    "spirit_2_id": spirit_2.spirit_id,
-                    "board_1": board_1.board_id,
-                    "board_2": board_2.board_id,
-                    "board_layout": layout.layout_id,
-                    "adversary_id": None,
-                    "started_at": None,
-                    "ended_at": None,
-                    "exported": False,
-                },
-            )
+def reset_era_firestore(era_id: str, plan: EraPlan) -> None:
+    summary = reset_era_tree(era_id, era_plan_documents(plan))
+    for line in format_reset_summary(summary):
+        print(line)
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1 (got {number})")
+    return number
 
 
 def parse_args() -> argparse.Namespace:
@@ -371,6 +936,54 @@ def parse_args() -> argparse.Namespace:
         type=Path,
         help="Optional TSV debug output path.",
     )
+    parser.add_argument(
+        "--json",
+        type=Path,
+        help="Optional JSON output path for the generated plan.",
+    )
+    parser.add_argument(
+        "--preview",
+        action="store_true",
+        help="Print the generated plan to stdout.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Plan the era without writing to Firestore.",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Print the balance metrics of the generated plan.",
+    )
+    parser.add_argument(
+        "--search",
+        type=_positive_int,
+        metavar="N",
+        help="Evaluate N candidate seeds in parallel and keep the best-balanced one.",
+    )
+    parser.add_argument(
+        "--top-k",
+        type=_positive_int,
+        default=5,
+        help="Number of ranked seeds printed by --search.",
+    )
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        help="Penalize pairings already played in previous eras (refreshes the local index).",
+    )
+    parser.add_argument(
+        "--history-cache",
+        type=Path,
+        default=DEFAULT_HISTORY_PATH,
+        help="Path to the local cross-era history index.",
+    )
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Reset an existing era in place, writing only what differs from the new plan.",
+    )
     return parser.parse_args()
 
 
@@ -385,29 +998,61 @@ def run_generate_era(
     debug_tsv_path: Path | None = None,
     write_firestore: bool = True,
     write_tsv: bool | None = None,
+    json_path: Path | None = None,
+    preview: bool = False,
+    report_metrics: bool = False,
+    search: int | None = None,
+    search_top_k: int = 5,
+    history_path: Path | None = None,
+    reset_existing: bool = False,
     print_generated_seed: bool = False,
 ) -> int:
     resolved_seed = seed
     if resolved_seed is None:
         resolved_seed = random.SystemRandom().randint(0, 2**32 - 1)
+        if print_generated_seed and not search:
+            print(resolved_seed)
+
+    catalogs = load_catalogs(spirits_path, boards_path, adversaries_path, layouts_path)
+    history = None
+    if history_path is not None:
+        history_index = refresh_history_index(history_path)
+        history = history_counters(history_index.iter_entries(exclude_era_id=era_id))
+    if search:
+        seed_rng = random.Random(resolved_seed)
+        candidate_seeds = [seed_rng.randint(0, 2**32 - 1) for _ in range(search)]
+        ranked = search_seeds(
+            catalogs, candidate_seeds, top_k=search_top_k, history=history
+        )
+        for position, candidate in enumerate(ranked, start=1):
+            print(f"#{position} seed={candidate.seed}")
+            for line in format_plan_metrics(candidate.metrics):
+                print(f"  {line}")
+        resolved_seed = ranked[0].seed
         if print_generated_seed:
             print(resolved_seed)
+    plan = plan_era(resolved_seed, catalogs, history=history)
 
-    rng = random.Random(resolved_seed)
-    spirits = load_spirits(spirits_path)
-    boards = load_boards(boards_path)
-    validate_adversaries(adversaries_path)
-    layouts = select_layouts(load_layouts(layouts_path))
-    rounds = generate_round_robin(spirits)
+    should_write_tsv = write_tsv if write_tsv is not None else debug_tsv_path is not None
+    if should_write_tsv and debug_tsv_path is None:
+        raise ValueError("debug_tsv_path is required when write_tsv is enabled")
 
+    sinks: list[EraPlanSink] = []
     if write_firestore:
-        write_era_firestore(era_id, rounds, boards, layouts, rng)
-
-    should_write_tsv = write_tsv if write_tsv is not None else debug_tsv_path is not None
+        sinks.append(reset_era_firestore if reset_existing else write_era_firestore)
     if should_write_tsv:
-        if debug_tsv_path is None:
-            raise ValueError("debug_tsv_path is required when write_tsv is enabled")
-        write_era_tsv(debug_tsv_path, era_id, rounds, boards, layouts, rng)
+        sinks.append(partial(write_era_tsv, debug_tsv_path))
+    if json_path is not None:
+        sinks.append(partial(write_era_json, json_path))
+    if preview:
+        sinks.append(print_era_plan)
+
+    for sink in sinks:
+        sink(era_id, plan)
+
+    if report_metrics:
+        for line in format_plan_metrics(compute_plan_metrics(plan, catalogs)):
+            print(line)
 
     return resolved_seed
 
@@ -422,11 +1067,19 @@ def main() -> None:
         adversaries_path=args.adversaries,
         layouts_path=args.layouts,
         debug_tsv_path=args.debug_tsv,
-        write_firestore=True,
+        write_firestore=not args.dry_run,
         write_tsv=None,
+        json_path=args.json,
+        preview=args.preview,
+        report_metrics=args.metrics,
+        search=args.search,
+        search_top_k=args.top_k,
+        history_path=args.history_cache if args.history else None,
+        reset_existing=args.reset,
         print_generated_seed=True,
     )
 
 
 if __name__ == "__main__":
+    freeze_support()
     main()
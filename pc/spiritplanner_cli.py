@@ -3,10 +3,15 @@
 
 from __future__ import annotations
 
+import argparse
 import os
+import random
 import sys
+import time
 import warnings
+from dataclasses import asdict
 from datetime import datetime
+from multiprocessing import freeze_support
 from pathlib import Path
 from typing import Any, Optional
 
@@ -21,6 +26,12 @@ EXECUTABLE_DIR = (
     Path(sys.executable).resolve().parent if IS_FROZEN else REPO_ROOT
 )
 
+DELETE_PROGRESS_STEP = 50
+DEFAULT_SCRIPT_WORKERS = 4
+ERA_SELECT_PAGE_SIZE = 20
+DEFAULT_EXPORT_DIR = Path("exports")
+DESTRUCTIVE_COMMANDS = frozenset({"delete", "reset"})
+
 CATALOG_FILENAMES: dict[str, str] = {
     "spirits": "spirits.tsv",
     "boards": "boards.tsv",
@@ -249,15 +260,241 @@ def _load_list_eras_function() -> Any:
     return list_eras
 
 
-def _print_help() -> None:
-    print("Uso: spiritplanner [--help]")
-    print()
-    print("Herramienta PC de SpiritPlanner en modo interactivo.")
-    print("Ejecucion normal (menu numerico):")
-    print("- python -m pc.spiritplanner_cli")
-    print()
-    print("Opciones:")
-    print("- -h, --help    Muestra esta ayuda breve y termina.")
+def _load_era_report_module() -> Any:
+    # NumPy is only needed by the report; keep it out of the other commands.
+    if __package__:
+        from . import era_report
+    else:
+        import era_report
+    return era_report
+
+
+def _load_script_modules() -> tuple[Any, Any, Any, Any]:
+    if __package__:
+        from . import era_admin, era_batch, firestore_service, generate_era
+    else:
+        import era_admin
+        import era_batch
+        import firestore_service
+        import generate_era
+    return era_admin, era_batch, firestore_service, generate_era
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="spiritplanner",
+        description=(
+            "Herramienta PC de SpiritPlanner. Sin argumentos abre el menu "
+            "interactivo; con un subcomando se ejecuta sin preguntas y "
+            "escribe un resumen JSON en stdout."
+        ),
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="COMANDO")
+
+    eras = argparse.ArgumentParser(add_help=False)
+    eras.add_argument(
+        "eras",
+        nargs="+",
+        metavar="ERA",
+        help="era_id o patron glob sobre las eras existentes (p. ej. 'prueba-*').",
+    )
+    eras.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_SCRIPT_WORKERS,
+        help=f"Eras procesadas en paralelo (por defecto {DEFAULT_SCRIPT_WORKERS}).",
+    )
+    seeded = argparse.ArgumentParser(add_help=False)
+    seeded.add_argument(
+        "--seed",
+        type=int,
+        help="Seed base; la era en la posicion i usa seed + i.",
+    )
+    confirm = argparse.ArgumentParser(add_help=False)
+    confirm.add_argument(
+        "--yes", action="store_true", help="Confirma la operacion destructiva."
+    )
+    dry_run = argparse.ArgumentParser(add_help=False)
+    dry_run.add_argument(
+        "--dry-run", action="store_true", help="Calcula el resultado sin escribir."
+    )
+
+    list_parser = subparsers.add_parser("list", help="Lista las eras existentes.")
+    list_parser.add_argument("--limit", type=int, default=50, help="Eras por pagina.")
+    list_parser.add_argument(
+        "--start-after",
+        metavar="ERA",
+        help="Cursor: devuelve la pagina que sigue a esta era (ver next_cursor).",
+    )
+    subparsers.add_parser("count", parents=[eras], help="Cuenta documentos por era.")
+    subparsers.add_parser(
+        "generate", parents=[eras, seeded, dry_run], help="Genera eras nuevas."
+    )
+    subparsers.add_parser(
+        "delete", parents=[eras, confirm, dry_run], help="Elimina eras completas."
+    )
+    subparsers.add_parser(
+        "reset",
+        parents=[eras, seeded, confirm, dry_run],
+        help="Reinicia eras en sitio con un plan nuevo.",
+    )
+    export_parser = subparsers.add_parser(
+        "export", parents=[eras], help="Exporta las incursiones de cada era a JSON."
+    )
+    export_parser.add_argument(
+        "--output",
+        type=Path,
+        default=DEFAULT_EXPORT_DIR,
+        help="Carpeta de salida (un fichero <era_id>.json por era).",
+    )
+    subparsers.add_parser(
+        "report",
+        parents=[eras],
+        help="Informe de equilibrio (matrices de co-ocurrencia) de cada era.",
+    )
+    return parser
+
+
+def _write_script_error(command: str, message: str) -> None:
+    _, era_batch, _, _ = _load_script_modules()
+    era_batch.write_json({"command": command, "ok": False, "error": message}, sys.stdout)
+
+
+def _script_seed(base_seed: int | None, position: int) -> int:
+    if base_seed is None:
+        return random.SystemRandom().randint(0, 2**32 - 1)
+    return base_seed + position
+
+
+def _build_script_job(args: argparse.Namespace, era_ids: list[str]) -> Any:
+    era_admin, era_batch, firestore_service, generate_era = _load_script_modules()
+
+    if args.command == "count":
+        def count_job(era_id: str) -> dict[str, Any]:
+            counts = era_admin.count_era_tree(era_id)
+            return {**asdict(counts), "total": counts.total}
+
+        return count_job
+
+    if args.command == "delete":
+        def delete_job(era_id: str) -> dict[str, Any]:
+            if args.dry_run:
+                return {"would_delete": era_admin.count_era_tree(era_id).total}
+            return {"deleted": era_admin.delete_era_tree(era_id)}
+
+        return delete_job
+
+    if args.command == "export":
+        def export_job(era_id: str) -> dict[str, Any]:
+            rows = firestore_service.list_era_incursions(era_id)
+            output_path = args.output / f"{era_id}.json"
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with output_path.open("w", encoding="utf-8") as handle:
+                era_batch.write_json({"era_id": era_id, "incursions": rows}, handle)
+            return {"path": str(output_path), "incursions": len(rows)}
+
+        return export_job
+
+    catalog_paths = resolve_catalog_paths(EXECUTABLE_DIR)
+    missing = [
+        filename
+        for catalog_key, filename in CATALOG_FILENAMES.items()
+        if catalog_key not in catalog_paths
+    ]
+    if missing:
+        raise ValueError(f"Faltan catalogos: {', '.join(missing)}")
+    catalogs = generate_era.load_catalogs(
+        catalog_paths["spirits"],
+        catalog_paths["boards"],
+        catalog_paths["adversaries"],
+        catalog_paths["layouts"],
+    )
+    if args.command == "report":
+        era_report = _load_era_report_module()
+        adversary_ids = era_report.load_adversary_ids(catalog_paths["adversaries"])
+
+        def report_job(era_id: str) -> dict[str, Any]:
+            rows = era_report.load_firestore_rows([era_id])
+            matrices = era_report.build_era_matrices(rows, catalogs, adversary_ids)
+            stats = era_report.compute_era_stats(matrices)
+            return {"incursions": len(rows), "stats": [asdict(entry) for entry in stats]}
+
+        return report_job
+
+    seeds = {era_id: _script_seed(args.seed, index) for index, era_id in enumerate(era_ids)}
+
+    def plan_job(era_id: str) -> dict[str, Any]:
+        plan = generate_era.plan_era(seeds[era_id], catalogs)
+        documents = generate_era.era_plan_documents(plan)
+        details: dict[str, Any] = {"seed": plan.seed}
+        if args.command == "reset":
+            summary = firestore_service.reset_era_tree(era_id, documents, dry_run=args.dry_run)
+            details.update(
+                asdict(summary), writes=summary.writes, writes_saved=summary.writes_saved
+            )
+        else:
+            metrics = generate_era.compute_plan_metrics(plan, catalogs)
+            details["metrics"] = asdict(metrics)
+            if not args.dry_run:
+                details["commits"] = firestore_service.write_era_tree(era_id, documents)
+        return details
+
+    return plan_job
+
+
+def _run_script_command(args: argparse.Namespace) -> int:
+    _, era_batch, firestore_service, _ = _load_script_modules()
+    command = args.command
+    started = time.perf_counter()
+
+    if command in DESTRUCTIVE_COMMANDS and not (args.yes or args.dry_run):
+        _write_script_error(
+            command, "Operacion destructiva: usa --yes para confirmar o --dry-run para simular."
+        )
+        return 2
+    if not (command == "generate" and args.dry_run) and not _has_credentials_configured():
+        _write_script_error(
+            command, "No se encontraron credenciales (GOOGLE_APPLICATION_CREDENTIALS)."
+        )
+        return 1
+
+    try:
+        if command == "list":
+            rows = firestore_service.list_eras(limit=args.limit, start_after=args.start_after)
+            next_cursor = rows[-1]["era_id"] if len(rows) == args.limit else None
+            era_batch.write_json(
+                {
+                    "command": command,
+                    "ok": True,
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                    "eras": rows,
+                    "next_cursor": next_cursor,
+                },
+                sys.stdout,
+            )
+            return 0
+
+        existing_ids: set[str] = set()
+        if any(era_batch.is_era_pattern(pattern) for pattern in args.eras):
+            existing_ids = firestore_service.list_era_ids()
+        era_ids = era_batch.expand_era_ids(args.eras, existing_ids)
+        job = _build_script_job(args, era_ids)
+    except Exception as exc:
+        _write_script_error(command, _format_operation_error(exc))
+        return 1
+
+    results = era_batch.run_era_jobs(
+        era_ids, job, max_workers=args.workers, describe_error=_format_operation_error
+    )
+    summary = era_batch.build_summary(
+        command,
+        results,
+        (time.perf_counter() - started) * 1000,
+        dry_run=getattr(args, "dry_run", False),
+        workers=args.workers,
+    )
+    era_batch.write_json(summary, sys.stdout)
+    return 0 if summary["ok"] else 1
 
 
 def _print_counts(era_id: str, counts: Any) -> None:
@@ -274,9 +511,15 @@ def _count_era(era_id: str) -> Any:
     return count_era_tree(era_id)
 
 
-def _delete_era(era_id: str) -> None:
+def _delete_era(era_id: str, expected_total: int = 0) -> None:
     _, delete_era_tree = _load_era_admin_functions()
-    delete_era_tree(era_id)
+
+    def report_progress(deleted: int) -> None:
+        if deleted % DELETE_PROGRESS_STEP == 0 or deleted == expected_total:
+            print(f"\rDocumentos borrados: {deleted}/{expected_total}", end="", flush=True)
+
+    deleted = delete_era_tree(era_id, on_progress=report_progress)
+    print(f"\rDocumentos borrados: {deleted}/{expected_total}")
 
 
 def _prompt_text(prompt: str, *, default: str | None = None, required: bool = False) -> str:
@@ -303,6 +546,20 @@ def _prompt_seed() -> int | None:
             print("Seed invalida: debe ser un numero entero.")
 
 
+def _prompt_search() -> int | None:
+    while True:
+        value = input("Seeds candidatas a evaluar (opcional, Enter para no buscar): ").strip()
+        if not value:
+            return None
+        try:
+            count = int(value)
+        except ValueError:
+            count = 0
+        if count > 0:
+            return count
+        print("Valor invalido: debe ser un numero entero positivo.")
+
+
 def _confirm_delete(era_id: str) -> bool:
     confirmation = input(
         f"Escribe exactamente '{era_id}' para confirmar: "
@@ -361,27 +618,46 @@ def select_era_interactively(action_label_es: str) -> Optional[str]:
     if not _ensure_credentials_configured():
         return None
 
+    # Cursor (last era_id of the previous page) for each visited page.
+    page_cursors: list[str | None] = [None]
     while True:
         try:
             list_eras = _load_list_eras_function()
-            rows: list[dict[str, Any]] = list_eras()
+            rows: list[dict[str, Any]] = list_eras(
+                limit=ERA_SELECT_PAGE_SIZE, start_after=page_cursors[-1]
+            )
         except Exception as exc:
             _print_error("No se pudo cargar la lista de eras", exc)
             return None
 
-        if not rows:
+        if not rows and len(page_cursors) == 1:
             print("No hay eras en Firestore.")
             return None
 
-        print(f"\nSelecciona una era para {action_label_es}:")
+        has_next = len(rows) == ERA_SELECT_PAGE_SIZE
+        has_previous = len(page_cursors) > 1
+        print(
+            f"\nSelecciona una era para {action_label_es} "
+            f"(pagina {len(page_cursors)}):"
+        )
         for index, row in enumerate(rows, start=1):
             print(f"{index}) {_build_era_row_label(row)}")
+        if has_next:
+            print("S) Pagina siguiente")
+        if has_previous:
+            print("A) Pagina anterior")
         print("0) Cancelar")
         print("R) Refrescar lista")
 
         option = input("Elige una opcion: ").strip()
         if option.lower() == "r":
             continue
+        if option.lower() == "s" and has_next:
+            page_cursors.append(str(rows[-1]["era_id"]))
+            continue
+        if option.lower() == "a" and has_previous:
+            page_cursors.pop()
+            continue
         if option == "0":
             print("Operacion cancelada.")
             return None
@@ -390,7 +666,7 @@ def select_era_interactively(action_label_es: str) -> Optional[str]:
             if 1 <= selected_index <= len(rows):
                 return str(rows[selected_index - 1]["era_id"])
 
-        print("Opcion invalida. Escribe un numero de la lista, 0 o R.")
+        print("Opcion invalida. Escribe un numero de la lista, S, A, 0 o R.")
 
 
 def _run_generate_flow() -> None:
@@ -404,6 +680,7 @@ def _run_generate_flow() -> None:
 
     era_id = _prompt_text("Era ID", default="1")
     seed = _prompt_seed()
+    search = _prompt_search()
 
     try:
         run_generate_era = _load_generate_function()
@@ -417,6 +694,7 @@ def _run_generate_flow() -> None:
             debug_tsv_path=None,
             write_firestore=True,
             write_tsv=False,
+            search=search,
             print_generated_seed=False,
         )
     except Exception as exc:
@@ -447,7 +725,7 @@ def _run_delete_flow() -> None:
         return
 
     try:
-        _delete_era(era_id)
+        _delete_era(era_id, counts.total)
     except Exception as exc:
         print("Error durante el borrado. La era puede haber quedado eliminada de forma parcial.")
         print(f"Detalle: {_format_operation_error(exc)}")
@@ -497,13 +775,6 @@ def _run_reset_flow() -> None:
 
     seed = _prompt_seed()
 
-    try:
-        _delete_era(era_id)
-    except Exception as exc:
-        print("Error durante el borrado. La era puede haber quedado eliminada de forma parcial.")
-        print(f"Detalle: {_format_operation_error(exc)}")
-        return
-
     try:
         run_generate_era = _load_generate_function()
         resolved_seed = run_generate_era(
@@ -516,10 +787,11 @@ def _run_reset_flow() -> None:
             debug_tsv_path=None,
             write_firestore=True,
             write_tsv=False,
+            reset_existing=True,
             print_generated_seed=False,
         )
     except Exception as exc:
-        print("Error al regenerar la era despues del borrado.")
+        print("Error al reiniciar la era. Si superaba 500 escrituras puede haber quedado a medias.")
         print(f"Detalle: {_format_operation_error(exc)}")
         return
 
@@ -541,7 +813,7 @@ def _show_menu() -> None:
     print("========================================")
     print("1) Generar era")
     print("2) Eliminar era (con recuento previo)")
-    print("3) Reiniciar era (eliminar + generar)")
+    print("3) Reiniciar era (en sitio, con recuento previo)")
     print("0) Salir")
 
 
@@ -582,14 +854,13 @@ def main(argv: list[str] | None = None) -> int:
     try:
         if interactive_mode:
             _run_interactive_menu()
-        else:
-            if len(args) == 1 and args[0] in ("-h", "--help"):
-                _print_help()
-                return 0
-            print("Error: argumentos no soportados.")
-            print("Usa --help para ver la ayuda.")
+            return 0
+        parser = _build_arg_parser()
+        parsed = parser.parse_args(args)
+        if parsed.command is None:
+            parser.print_help()
             return 2
-        return 0
+        return _run_script_command(parsed)
     except KeyboardInterrupt:
         print("\nOperacion cancelada por el usuario.")
         return 130
@@ -599,4 +870,5 @@ def main(argv: list[str] | None = None) -> int:
 
 
 if __name__ == "__main__":
+    freeze_support()
     raise SystemExit(main())
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+import flet as ft  # noqa: E402
+
+from utils.observable import BatchedObservable, batched  # noqa: E402
+
+
+@ft.observable
+class _SampleViewModel(BatchedObservable):
+    def __init__(self) -> None:
+        self.loading = False
+        self.items: list[int] = []
+        self.version = 0
+
+    @batched
+    def load(self) -> None:
+        self.loading = True
+        self.items = [1, 2]
+        self.items.append(3)
+        self.nested()
+        self.loading = False
+
+    @batched
+    def nested(self) -> None:
+        self.version += 1
+
+
+class BatchedObservableTests(unittest.TestCase):
+    def _listen(self, view_model: BatchedObservable) -> list[str | None]:
+        fields: list[str | None] = []
+        self._listener = lambda _sender, field: fields.append(field)
+        view_model.subscribe(self._listener)
+        return fields
+
+    def test_batched_method_notifies_once(self) -> None:
+        view_model = _SampleViewModel()
+        fields = self._listen(view_model)
+        view_model.load()
+        self.assertEqual(fields, [None])
+        self.assertEqual(view_model.items, [1, 2, 3])
+
+    def test_unbatched_assignment_notifies_per_field(self) -> None:
+        view_model = _SampleViewModel()
+        fields = self._listen(view_model)
+        view_model.loading = True
+        view_model.version = 2
+        self.assertEqual(fields, ["loading", "version"])
+
+    def test_batch_without_changes_is_silent(self) -> None:
+        view_model = _SampleViewModel()
+        fields = self._listen(view_model)
+        with view_model.batch_update():
+            view_model.loading = False
+        self.assertEqual(fields, [])
+
+    def test_batch_flushes_after_exception(self) -> None:
+        view_model = _SampleViewModel()
+        fields = self._listen(view_model)
+        with self.assertRaises(RuntimeError):
+            with view_model.batch_update():
+                view_model.version = 5
+                raise RuntimeError("boom")
+        self.assertEqual(fields, [None])
+        view_model.version = 6
+        self.assertEqual(fields, [None, "version"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+from pc.era_batch import build_summary, expand_era_ids, run_era_jobs  # noqa: E402
+
+
+class ExpandEraIdsTests(unittest.TestCase):
+    def test_globs_match_existing_and_literals_pass_through(self) -> None:
+        existing = {"test-2", "test-1", "main"}
+        self.assertEqual(
+            expand_era_ids(["test-*", "new", "test-1"], existing),
+            ["test-1", "test-2", "new"],
+        )
+        self.assertEqual(expand_era_ids(["nothing-*"], existing), [])
+
+
+class RunEraJobsTests(unittest.TestCase):
+    def test_results_keep_order_and_capture_failures(self) -> None:
+        threads: set[str] = set()
+
+        def job(era_id: str) -> dict:
+            threads.add(threading.current_thread().name)
+            if era_id == "bad":
+                raise ValueError("Era not found: bad")
+            return {"size": len(era_id)}
+
+        results = run_era_jobs(["a", "bad", "ccc"], job, max_workers=2)
+        self.assertEqual([result.era_id for result in results], ["a", "bad", "ccc"])
+        self.assertEqual(results[2].details, {"size": 3})
+        self.assertFalse(results[1].ok)
+        self.assertEqual(results[1].error, "Era not found: bad")
+        self.assertTrue(all(name.startswith("era-job") for name in threads))
+
+        summary = build_summary("count", results, 12.34, workers=2)
+        self.assertFalse(summary["ok"])
+        self.assertEqual(summary["elapsed_ms"], 12.3)
+        self.assertEqual(len(summary["results"]), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+from pc.era_history import (  # noqa: E402
+    HistoryEntry,
+    HistoryIndex,
+    load_history_index,
+    save_history_index,
+)
+from pc.generate_era import history_counters, load_catalogs, plan_era  # noqa: E402
+
+INPUT_DIR = ROOT / "pc" / "data" / "input"
+
+
+def _catalogs():
+    return load_catalogs(
+        INPUT_DIR / "spirits.tsv",
+        INPUT_DIR / "boards.tsv",
+        INPUT_DIR / "adversaries.tsv",
+        INPUT_DIR / "layouts.tsv",
+    )
+
+
+def _plan_entries(era_id: str, plan) -> list[HistoryEntry]:
+    return [
+        HistoryEntry(
+            era_id,
+            incursion.spirit_1_id,
+            incursion.spirit_2_id,
+            incursion.board_1,
+            incursion.board_2,
+            incursion.board_layout,
+        )
+        for period in plan.periods
+        for incursion in period.incursions
+    ]
+
+
+def _document(layout: str, adversary_id: str | None = None, **extra) -> dict:
+    return {
+        "spirit_1_id": "river",
+        "spirit_2_id": "lightning",
+        "board_1": "a",
+        "board_2": "b",
+        "board_layout": layout,
+        "adversary_id": adversary_id,
+        **extra,
+    }
+
+
+class HistoryIndexTests(unittest.TestCase):
+    def test_apply_tracks_latest_update_and_prunes_deleted_eras(self) -> None:
+        index = HistoryIndex()
+        first = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        second = datetime(2026, 2, 1, tzinfo=timezone.utc)
+        self.assertTrue(
+            index.apply("eras/1/periods/p01/incursions/i01", _document("x", updated_at=second))
+        )
+        index.apply("eras/2/periods/p01/incursions/i01", _document("y", "england", updated_at=first))
+        index.apply("eras/1/periods/p01/incursions/i01", _document("z", updated_at=first))
+        self.assertFalse(index.apply("eras/3/periods/p01/incursions/i01", {"board_1": "a"}))
+
+        self.assertEqual(index.synced_at, second)
+        self.assertEqual(index.entries["eras/1/periods/p01/incursions/i01"].board_layout, "z")
+        counts = index.pair_counts()[("lightning", "river")]
+        self.assertEqual(counts[(("a", "b"), "y", "england")], 1)
+
+        self.assertEqual(index.prune({"2"}), 1)
+        self.assertEqual(index.era_ids, {"2"})
+
+    def test_cache_round_trip(self) -> None:
+        index = HistoryIndex(synced_at=datetime(2026, 3, 1, tzinfo=timezone.utc))
+        index.apply("eras/1/periods/p01/incursions/i01", _document("x", "england"))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "cache" / "history.json"
+            save_history_index(index, path)
+            loaded = load_history_index(path)
+        self.assertEqual(loaded.entries, index.entries)
+        self.assertEqual(loaded.synced_at, index.synced_at)
+
+    def test_history_steers_planner_away_from_played_layouts(self) -> None:
+        catalogs = _catalogs()
+        previous = plan_era(3, catalogs)
+        history = history_counters(_plan_entries("1", previous))
+        played = {
+            (frozenset((entry.spirit_1_id, entry.spirit_2_id)), entry.board_layout)
+            for entry in _plan_entries("1", previous)
+        }
+
+        def repeats(plan) -> int:
+            return sum(
+                (frozenset((entry.spirit_1_id, entry.spirit_2_id)), entry.board_layout)
+                in played
+                for entry in _plan_entries("2", plan)
+            )
+
+        fresh = plan_era(3, catalogs, history=history)
+        self.assertEqual(repeats(plan_era(3, catalogs)), len(played))
+        self.assertLess(repeats(fresh), len(played) // 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import csv
+import io
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+from pc.generate_era import (  # noqa: E402
+    EraCatalogs,
+    Spirit,
+    compute_plan_metrics,
+    evaluate_seed,
+    load_catalogs,
+    plan_era,
+    print_era_plan,
+    search_seeds,
+    write_era_tsv,
+)
+
+INPUT_DIR = ROOT / "pc" / "data" / "input"
+
+
+def _catalogs():
+    return load_catalogs(
+        INPUT_DIR / "spirits.tsv",
+        INPUT_DIR / "boards.tsv",
+        INPUT_DIR / "adversaries.tsv",
+        INPUT_DIR / "layouts.tsv",
+    )
+
+
+class EraPlanTests(unittest.TestCase):
+    def test_plan_is_deterministic_for_seed(self) -> None:
+        catalogs = _catalogs()
+        self.assertEqual(plan_era(11, catalogs), plan_era(11, catalogs))
+        self.assertNotEqual(plan_era(11, catalogs), plan_era(12, catalogs))
+
+    def test_every_spirit_pair_plays_once(self) -> None:
+        catalogs = _catalogs()
+        plan = plan_era(3, catalogs)
+        pairs = Counter(
+            frozenset((incursion.spirit_1_id, incursion.spirit_2_id))
+            for period in plan.periods
+            for incursion in period.incursions
+        )
+        spirit_count = len(catalogs.spirits)
+        self.assertEqual(len(plan.periods), spirit_count - 1)
+        self.assertEqual(len(pairs), spirit_count * (spirit_count - 1) // 2)
+        self.assertEqual(set(pairs.values()), {1})
+
+    def test_default_catalog_is_balanced(self) -> None:
+        catalogs = _catalogs()
+        metrics = compute_plan_metrics(plan_era(3, catalogs), catalogs)
+        self.assertEqual(metrics.period_board_spread, 0)
+        self.assertEqual(metrics.period_layout_repeats, 0)
+        self.assertLessEqual(metrics.spirit_board_spread, 1)
+        self.assertLessEqual(metrics.spirit_layout_spread, 2)
+
+    def test_odd_catalog_gives_each_spirit_one_bye(self) -> None:
+        base = _catalogs()
+        catalogs = EraCatalogs(
+            spirits=tuple(Spirit(spirit_id=f"s{idx:02d}") for idx in range(9)),
+            boards=base.boards,
+            layouts=base.layouts,
+        )
+        plan = plan_era(8, catalogs)
+        byes = [period.bye_spirit_id for period in plan.periods]
+        self.assertEqual(len(plan.periods), 9)
+        self.assertEqual(sorted(byes), [spirit.spirit_id for spirit in catalogs.spirits])
+        self.assertTrue(all(len(period.incursions) == 4 for period in plan.periods))
+
+    def test_large_catalog_stays_balanced(self) -> None:
+        base = _catalogs()
+        catalogs = EraCatalogs(
+            spirits=tuple(Spirit(spirit_id=f"s{idx:02d}") for idx in range(36)),
+            boards=base.boards,
+            layouts=base.layouts,
+        )
+        metrics = compute_plan_metrics(plan_era(1, catalogs), catalogs)
+        self.assertLessEqual(metrics.spirit_board_spread, 2)
+        self.assertLessEqual(metrics.period_board_spread, 1)
+        self.assertEqual(metrics.pair_layout_repeats, 0)
+
+    def test_seed_search_ranks_candidates(self) -> None:
+        catalogs = _catalogs()
+        seeds = [3, 5, 8, 13]
+        ranked = search_seeds(catalogs, seeds, top_k=2, max_workers=2)
+        expected = sorted(
+            (evaluate_seed(seed, catalogs) for seed in seeds),
+            key=lambda candidate: (candidate.metrics.rank_key(), candidate.seed),
+        )
+        self.assertEqual(ranked, expected[:2])
+
+    def test_tsv_sink_streams_the_same_plan(self) -> None:
+        plan = plan_era(5, _catalogs())
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "era.tsv"
+            write_era_tsv(path, "era-x", plan)
+            with path.open(encoding="utf-8", newline="") as handle:
+                rows = list(csv.DictReader(handle, delimiter="\t"))
+        first = plan.periods[0].incursions[0]
+        self.assertEqual(len(rows), sum(len(p.incursions) for p in plan.periods))
+        self.assertEqual(rows[0]["spirit_1_id"], first.spirit_1_id)
+        self.assertEqual(rows[0]["board_layout"], first.board_layout)
+
+        preview = io.StringIO()
+        print_era_plan("era-x", plan, preview)
+        self.assertIn(f"seed={plan.seed}", preview.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+from pc.era_report import (  # noqa: E402
+    build_era_matrices,
+    compute_era_stats,
+    rows_from_documents,
+    rows_from_plans,
+)
+from pc.generate_era import compute_plan_metrics, load_catalogs, plan_era  # noqa: E402
+
+INPUT_DIR = ROOT / "pc" / "data" / "input"
+
+
+def _catalogs():
+    return load_catalogs(
+        INPUT_DIR / "spirits.tsv",
+        INPUT_DIR / "boards.tsv",
+        INPUT_DIR / "adversaries.tsv",
+        INPUT_DIR / "layouts.tsv",
+    )
+
+
+class EraReportTests(unittest.TestCase):
+    def test_plan_matrices_match_plan_metrics(self) -> None:
+        catalogs = _catalogs()
+        plan = plan_era(3, catalogs)
+        matrices = build_era_matrices(rows_from_plans([plan]), catalogs)
+        stats = {entry.name: entry for entry in compute_era_stats(matrices)}
+        metrics = compute_plan_metrics(plan, catalogs)
+
+        self.assertEqual(stats["spirit_spirit"].max_repeat, 1)
+        self.assertEqual(stats["spirit_spirit"].coverage_gaps, 0)
+        self.assertEqual(stats["spirit_board"].spread, metrics.spirit_board_spread)
+        self.assertEqual(stats["spirit_layout"].spread, metrics.spirit_layout_spread)
+        self.assertNotIn("spirit_adversary", stats)
+        self.assertTrue((matrices.spirit_spirit == matrices.spirit_spirit.T).all())
+
+    def test_documents_include_adversaries_and_unknown_ids(self) -> None:
+        catalogs = _catalogs()
+        spirit_ids = [spirit.spirit_id for spirit in catalogs.spirits]
+        documents = [
+            {
+                "spirit_1_id": spirit_ids[0],
+                "spirit_2_id": spirit_ids[1],
+                "board_1": "a",
+                "board_2": "b",
+                "board_layout": "retired_layout",
+                "adversary_id": "england",
+            },
+            {
+                "spirit_1_id": spirit_ids[0],
+                "spirit_2_id": spirit_ids[2],
+                "board_1": "a",
+                "board_2": "c",
+                "board_layout": None,
+                "adversary_id": None,
+            },
+        ]
+        matrices = build_era_matrices(rows_from_documents(documents), catalogs, ("england",))
+        self.assertIn("retired_layout", matrices.layout_ids)
+        self.assertEqual(int(matrices.spirit_layout.sum()), 2)
+        self.assertEqual(int(matrices.spirit_adversary[0].sum()), 1)
+        self.assertEqual(int(matrices.spirit_spirit[0].sum()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
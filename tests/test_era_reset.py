@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+from firebase_admin import firestore
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+import pc.firestore_service as firestore_service  # noqa: E402
+from pc.firestore_service import EraResetSummary, document_changes  # noqa: E402
+
+
+class _MissingEraDb:
+    path = "eras/missing"
+    exists = False
+
+    def __init__(self) -> None:
+        self.writes = 0
+
+    def collection(self, name: str) -> "_MissingEraDb":
+        return self
+
+    def document(self, doc_id: str) -> "_MissingEraDb":
+        return self
+
+    def get(self) -> "_MissingEraDb":
+        return self
+
+    def batch(self):
+        self.writes += 1
+        raise AssertionError("reset must not write")
+
+
+class DocumentChangesTests(unittest.TestCase):
+    def test_unchanged_document_needs_no_write(self) -> None:
+        existing = {"index": 1, "created_at": "2026-01-01", "updated_at": "2026-01-02"}
+        target = {
+            "index": 1,
+            "created_at": firestore.SERVER_TIMESTAMP,
+            "updated_at": firestore.SERVER_TIMESTAMP,
+        }
+        self.assertEqual(document_changes(existing, target), {})
+
+    def test_changes_reset_state_and_keep_created_at(self) -> None:
+        existing = {
+            "board_1": "a",
+            "adversary_id": "england",
+            "score": 12,
+            "created_at": "2026-01-01",
+        }
+        target = {
+            "board_1": "b",
+            "adversary_id": None,
+            "created_at": firestore.SERVER_TIMESTAMP,
+            "updated_at": firestore.SERVER_TIMESTAMP,
+        }
+        self.assertEqual(
+            document_changes(existing, target),
+            {
+                "board_1": "b",
+                "adversary_id": None,
+                "score": firestore.DELETE_FIELD,
+                "updated_at": firestore.SERVER_TIMESTAMP,
+            },
+        )
+
+    def test_reset_refuses_to_create_a_missing_era(self) -> None:
+        db = _MissingEraDb()
+        original = firestore_service.init_firestore
+        firestore_service.init_firestore = lambda: db
+        self.addCleanup(setattr, firestore_service, "init_firestore", original)
+
+        with self.assertRaisesRegex(ValueError, "generate"):
+            firestore_service.reset_era_tree("missing", [("periods/p01", {"index": 1})])
+        self.assertEqual(db.writes, 0)
+
+    def test_summary_counts_saved_writes(self) -> None:
+        summary = EraResetSummary(
+            created=0,
+            updated=10,
+            unchanged=25,
+            deleted=0,
+            sessions_deleted=3,
+            full_rewrite_writes=74,
+        )
+        self.assertEqual(summary.writes, 13)
+        self.assertEqual(summary.writes_saved, 61)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+import pc.firestore_service as pc_firestore_service  # noqa: E402
+from screens.eras.eras_viewmodel import ERAS_PAGE_SIZE, ErasViewModel  # noqa: E402
+from services.firestore_records import EraDoc  # noqa: E402
+
+
+class _EraSnapshot:
+    def __init__(self, era_id: str, data: dict | None) -> None:
+        self.id = era_id
+        self.exists = data is not None
+        self._data = data or {}
+
+    def to_dict(self) -> dict:
+        return dict(self._data)
+
+
+class _ErasDb:
+    """Just enough of a Firestore query to page eras newest first."""
+
+    def __init__(self, docs: dict[str, dict]) -> None:
+        self.docs = docs
+        self.ordered_by: list[str] = []
+        self._limit: int | None = None
+        self._cursor: _EraSnapshot | None = None
+        self._cursor_id: str | None = None
+
+    def collection(self, name: str) -> "_ErasDb":
+        return self
+
+    def select(self, field_paths: list[str]) -> "_ErasDb":
+        return self
+
+    def order_by(self, field_path, direction=None) -> "_ErasDb":
+        self.ordered_by.append(str(field_path))
+        return self
+
+    def limit(self, count: int) -> "_ErasDb":
+        self._limit = count
+        return self
+
+    def start_after(self, snapshot: _EraSnapshot) -> "_ErasDb":
+        self._cursor = snapshot
+        return self
+
+    def document(self, era_id: str) -> "_ErasDb":
+        self._cursor_id = era_id
+        return self
+
+    def get(self, field_paths=None) -> _EraSnapshot:
+        return _EraSnapshot(self._cursor_id, self.docs.get(self._cursor_id))
+
+    def stream(self):
+        def key(era_id: str):
+            return (self.docs[era_id]["created_at"], era_id)
+
+        ordered = sorted(
+            (era_id for era_id in self.docs if "created_at" in self.docs[era_id]),
+            key=key,
+            reverse=True,
+        )
+        if self._cursor is not None:
+            ordered = [era_id for era_id in ordered if key(era_id) < key(self._cursor.id)]
+        for era_id in ordered[: self._limit]:
+            yield _EraSnapshot(era_id, self.docs[era_id])
+
+
+class _PagedService:
+    def __init__(self, total: int) -> None:
+        self.era_ids = [f"{index:03d}" for index in range(total)]
+        self.calls: list[tuple[int | None, str | None]] = []
+
+    def list_eras(self, limit=None, start_after=None):
+        self.calls.append((limit, start_after))
+        start = self.era_ids.index(start_after) + 1 if start_after else 0
+        return [EraDoc(era_id, is_active=True) for era_id in self.era_ids[start : start + limit]]
+
+    def active_incursion_from_era(self, era):
+        return None
+
+    def list_periods(self, era_id, fields=None):
+        return []
+
+    def list_incursions(self, era_id, period_id, fields=None):
+        return []
+
+
+class ErasPagingTests(unittest.TestCase):
+    def test_pages_are_requested_with_cursor(self) -> None:
+        service = _PagedService(ERAS_PAGE_SIZE + 5)
+        view_model = ErasViewModel()
+
+        view_model.load_eras(service)
+        self.assertEqual(len(view_model.eras), ERAS_PAGE_SIZE)
+        self.assertTrue(view_model.has_more)
+
+        view_model.load_more_eras(service)
+        self.assertEqual(len(view_model.eras), ERAS_PAGE_SIZE + 5)
+        self.assertFalse(view_model.has_more)
+        self.assertEqual(
+            service.calls,
+            [(ERAS_PAGE_SIZE, None), (ERAS_PAGE_SIZE, service.era_ids[ERAS_PAGE_SIZE - 1])],
+        )
+        self.assertEqual(
+            [card.index for card in view_model.eras],
+            list(range(1, ERAS_PAGE_SIZE + 6)),
+        )
+
+        view_model.load_more_eras(service)
+        self.assertEqual(len(service.calls), 2)
+
+
+class PcErasListingTests(unittest.TestCase):
+    def test_pc_pages_newest_first_with_id_tiebreak(self) -> None:
+        older = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        newer = datetime(2026, 2, 1, tzinfo=timezone.utc)
+        db = _ErasDb(
+            {
+                "a": {"created_at": older},
+                "b": {"created_at": newer},
+                "c": {"created_at": newer},
+                "d": {"created_at": older},
+            }
+        )
+        original = pc_firestore_service.init_firestore
+        pc_firestore_service.init_firestore = lambda: db
+        self.addCleanup(setattr, pc_firestore_service, "init_firestore", original)
+
+        first = pc_firestore_service.list_eras(limit=3)
+        second = pc_firestore_service.list_eras(limit=3, start_after=first[-1]["era_id"])
+
+        self.assertEqual([row["era_id"] for row in first], ["c", "b", "d"])
+        self.assertEqual([row["era_id"] for row in second], ["a"])
+        self.assertEqual(db.ordered_by[:2], ["created_at", "__name__"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+from services.firestore_records import (  # noqa: E402
+    IncursionDoc,
+    PeriodDoc,
+    SessionDoc,
+    normalize_timestamp,
+)
+
+
+class FirestoreRecordTests(unittest.TestCase):
+    def test_timestamps_are_normalized_to_utc(self) -> None:
+        naive = datetime(2026, 2, 18, 10, 0)
+        local = datetime(2026, 2, 18, 11, 0, tzinfo=timezone(timedelta(hours=1)))
+        expected = datetime(2026, 2, 18, 10, 0, tzinfo=timezone.utc)
+
+        self.assertEqual(normalize_timestamp(naive), expected)
+        self.assertEqual(normalize_timestamp(local).tzinfo, timezone.utc)
+        self.assertEqual(normalize_timestamp(local), expected)
+        self.assertIsNone(normalize_timestamp("2026-02-18"))
+
+        session = SessionDoc.from_data("s1", {"started_at": naive, "ended_at": None})
+        self.assertEqual(session.started_at, expected)
+        self.assertIsNone(session.ended_at)
+
+    def test_incursion_decoding_skips_invalid_values(self) -> None:
+        incursion = IncursionDoc.from_data(
+            "i01",
+            {"index": 2, "score": True, "difficulty": 3.0, "adversary_id": "", "result": "win"},
+        )
+        self.assertEqual(incursion.index, 2)
+        self.assertIsNone(incursion.score)
+        self.assertEqual(incursion.difficulty, 3)
+        self.assertIsNone(incursion.adversary_id)
+        self.assertTrue(incursion.is_finished)
+
+    def test_period_incursion_count_accepts_legacy_list(self) -> None:
+        self.assertEqual(PeriodDoc.from_data("p1", {"incursions": ["a", "b"]}).incursions_count, 2)
+        self.assertEqual(PeriodDoc.from_data("p1", {"incursions_count": 4}).incursions_count, 4)
+        self.assertIsNone(PeriodDoc.from_data("p1", {}).incursions_count)
+
+    def test_records_are_slotted(self) -> None:
+        self.assertFalse(hasattr(IncursionDoc("i01"), "__dict__"))
+
+
+if __name__ == "__main__":
+    unittest.main()
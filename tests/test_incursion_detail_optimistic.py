@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+from screens.incursion_detail.incursion_detail_model import (  # noqa: E402
+    SESSION_STATE_BETWEEN_SESSIONS,
+    SESSION_STATE_FINALIZED,
+    SESSION_STATE_IN_SESSION,
+    SESSION_STATE_NOT_STARTED,
+    IncursionDetailModel,
+)
+from screens.incursion_detail.incursion_detail_viewmodel import (  # noqa: E402
+    IncursionDetailViewModel,
+)
+from services.firestore_records import IncursionDoc, PeriodDoc, SessionDoc  # noqa: E402
+from services.score_service import calculate_score  # noqa: E402
+
+
+class _Service:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict]] = []
+        self.fail_with: Exception | None = None
+        self.reloads = 0
+        self.incursion = IncursionDoc(
+            id="i1",
+            index=1,
+            adversary_id="brandenburg_prussia",
+            adversary_level="1",
+            difficulty=3,
+        )
+        self.sessions: list[SessionDoc] = []
+
+    def _record(self, name: str, **kwargs) -> None:
+        if self.fail_with is not None:
+            raise self.fail_with
+        self.calls.append((name, kwargs))
+
+    def _close_sessions(self, at) -> None:
+        self.sessions = [
+            replace(session, ended_at=at) if session.ended_at is None else session
+            for session in self.sessions
+        ]
+
+    def start_session(self, era_id, period_id, incursion_id, **kwargs):
+        self._record("start_session", **kwargs)
+        if kwargs.get("adversary_level") is not None:
+            self.incursion = replace(
+                self.incursion,
+                adversary_level=kwargs["adversary_level"],
+                difficulty=kwargs["difficulty"],
+            )
+        self.sessions.append(
+            SessionDoc(id=f"s{len(self.sessions)}", started_at=kwargs["at"])
+        )
+
+    def update_incursion_adversary_level(self, **kwargs):
+        self._record("update_incursion_adversary_level", **kwargs)
+        self.incursion = replace(
+            self.incursion,
+            adversary_level=kwargs["adversary_level"],
+            difficulty=kwargs["difficulty"],
+        )
+
+    def end_session(self, era_id, period_id, incursion_id, at=None):
+        self._record("end_session", at=at)
+        self._close_sessions(at)
+
+    def finalize_incursion(self, **kwargs):
+        self._record("finalize_incursion", **kwargs)
+        self._close_sessions(kwargs["at"])
+        self.incursion = replace(
+            self.incursion,
+            ended_at=kwargs["at"],
+            result=kwargs["result"],
+            score=calculate_score(
+                difficulty=self.incursion.difficulty or 0,
+                result=kwargs["result"],
+                dahan_alive=kwargs["dahan_alive"],
+                blight_on_island=kwargs["blight_on_island"],
+                player_count=kwargs["player_count"],
+                invader_cards_remaining=kwargs["invader_cards_remaining"],
+                invader_cards_out_of_deck=kwargs["invader_cards_out_of_deck"],
+            ),
+            dahan_alive=kwargs["dahan_alive"],
+            blight_on_island=kwargs["blight_on_island"],
+            player_count=kwargs["player_count"],
+            invader_cards_remaining=kwargs["invader_cards_remaining"],
+            invader_cards_out_of_deck=kwargs["invader_cards_out_of_deck"],
+        )
+
+    def list_incursions(self, era_id, period_id, fields=None):
+        self.reloads += 1
+        return [self.incursion]
+
+    def list_periods(self, era_id, fields=None):
+        return [PeriodDoc(id="p1", index=1)]
+
+    def iter_sessions(self, era_id, period_id, incursion_id, fields=None):
+        return iter(list(self.sessions))
+
+
+def _detail() -> IncursionDetailModel:
+    return IncursionDetailModel(
+        incursion_id="i1",
+        index=1,
+        spirit_1_name="A",
+        spirit_2_name="B",
+        layout_id="",
+        board_1_name="",
+        board_2_name="",
+        layout_name="",
+        board_1_id="",
+        board_2_id="",
+        adversary_id="brandenburg_prussia",
+        adversary_name="Adversario",
+        adversary_level="1",
+        difficulty=3,
+        period_label="Periodo 1",
+        result=None,
+        score=None,
+        dahan_alive=None,
+        blight_on_island=None,
+        player_count=None,
+        invader_cards_remaining=None,
+        invader_cards_out_of_deck=None,
+    )
+
+
+class IncursionDetailOptimisticTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.service = _Service()
+        self.view_model = IncursionDetailViewModel()
+        self.view_model.restore_snapshot(None, "era", "p1", "i1")
+        self.view_model._apply_bundle(_detail(), [], SESSION_STATE_NOT_STARTED)
+        self.pending: list = []
+
+    def test_session_toggle_renders_before_write_and_reuses_timestamp(self) -> None:
+        self.view_model.handle_session_action(self.service, self.pending.append)
+
+        self.assertEqual(self.view_model.session_state, SESSION_STATE_IN_SESSION)
+        self.assertTrue(self.view_model.timer_running)
+        self.assertTrue(self.view_model.saving)
+        self.assertEqual(self.service.calls, [])
+        self.assertEqual(self.service.reloads, 0)
+
+        self.pending.pop()()
+        started_at = self.view_model.sessions[0].started_at
+        self.assertEqual(self.service.calls[0][1]["at"], started_at)
+        self.assertEqual(self.service.reloads, 1)
+        self.assertFalse(self.view_model.saving)
+
+        self.view_model.handle_session_action(self.service)
+        self.assertEqual(self.view_model.session_state, SESSION_STATE_BETWEEN_SESSIONS)
+        self.assertIsNotNone(self.view_model.sessions[0].ended_at)
+
+    def test_failed_write_rolls_back_with_toast(self) -> None:
+        self.service.fail_with = ValueError("Ya existe una incursion activa en esta Era.")
+        self.view_model.handle_session_action(self.service, self.pending.append)
+        self.assertEqual(len(self.view_model.sessions), 1)
+
+        self.pending.pop()()
+
+        self.assertEqual(self.view_model.session_state, SESSION_STATE_NOT_STARTED)
+        self.assertEqual(list(self.view_model.sessions), [])
+        self.assertFalse(self.view_model.saving)
+        self.assertEqual(self.service.reloads, 0)
+        self.assertEqual(
+            self.view_model.toast_message, "Ya existe una incursion activa en esta Era."
+        )
+
+    def test_finalize_applies_calculated_score(self) -> None:
+        self.view_model.handle_session_action(self.service)
+        self.view_model.update_finalize_field("result", "win")
+        self.view_model.update_finalize_field("dahan_alive", "4")
+        self.view_model.update_finalize_field("blight_on_island", "1")
+        self.view_model.update_finalize_field("invader_cards_remaining", "2")
+
+        self.view_model.finalize_incursion(self.service)
+
+        expected = calculate_score(3, "win", 4, 1, 2, 2, None)
+        self.assertEqual(self.view_model.detail.score, expected)
+        self.assertEqual(self.view_model.session_state, SESSION_STATE_FINALIZED)
+        self.assertFalse(self.view_model.timer_running)
+        self.assertEqual(
+            [name for name, _ in self.service.calls],
+            ["start_session", "finalize_incursion"],
+        )
+        self.assertEqual(
+            self.service.calls[1][1]["at"], self.view_model.sessions[0].ended_at
+        )
+
+    def test_successful_write_reconciles_with_server_state(self) -> None:
+        self.view_model.handle_session_action(self.service, self.pending.append)
+        self.service.incursion = replace(self.service.incursion, difficulty=4)
+
+        self.pending.pop()()
+
+        self.assertEqual(self.view_model.detail.difficulty, 4)
+        self.assertEqual(self.view_model.session_state, SESSION_STATE_IN_SESSION)
+        self.assertEqual(len(self.view_model.sessions), 1)
+
+    def test_level_changes_are_coalesced_into_one_write(self) -> None:
+        for level in ("1", "2", "1"):
+            self.view_model.update_adversary_level(level)
+        stale_version = self.view_model.level_version - 1
+
+        self.view_model.flush_adversary_level(self.service, stale_version)
+        self.assertEqual(self.service.calls, [])
+        self.assertEqual(self.view_model.detail.difficulty, 2)
+
+        self.view_model.flush_adversary_level(self.service, self.view_model.level_version)
+        self.assertEqual(
+            [(name, kwargs["adversary_level"]) for name, kwargs in self.service.calls],
+            [("update_incursion_adversary_level", "1")],
+        )
+        self.assertIsNone(self.view_model.pending_level)
+
+    def test_pending_level_is_sent_with_session_start(self) -> None:
+        self.view_model.update_adversary_level("2")
+        difficulty = self.view_model.detail.difficulty
+
+        self.view_model.handle_session_action(self.service)
+        self.view_model.flush_adversary_level(self.service)
+
+        self.assertEqual(len(self.service.calls), 1)
+        name, kwargs = self.service.calls[0]
+        self.assertEqual(name, "start_session")
+        self.assertEqual((kwargs["adversary_level"], kwargs["difficulty"]), ("2", difficulty))
+        self.assertIsNone(self.view_model.pending_level)
+
+    def test_failed_start_keeps_level_pending(self) -> None:
+        self.view_model.update_adversary_level("2")
+        self.service.fail_with = ValueError("Ya existe una incursion activa en esta Era.")
+
+        self.view_model.handle_session_action(self.service)
+
+        self.assertEqual(self.view_model.pending_level.adversary_level, "2")
+        self.assertEqual(self.view_model.adversary_level, "2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import math
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+from screens.layout_geometry import (  # noqa: E402
+    SlotCalibration,
+    compute_board_placement,
+    compute_layout_placement,
+    load_layout_calibration,
+)
+
+
+class BoardPlacementTests(unittest.TestCase):
+    def test_centered_slot_fills_height_pct(self) -> None:
+        placement = compute_board_placement(
+            "a", SlotCalibration(), 2.0, width=200.0, height=100.0, board_height_pct=0.5
+        )
+        self.assertAlmostEqual(placement.height, 50.0)
+        self.assertAlmostEqual(placement.width, 100.0)
+        self.assertAlmostEqual(placement.left, 50.0)
+        self.assertAlmostEqual(placement.top, 25.0)
+        self.assertEqual(placement.rotation, 0.0)
+
+    def test_offsets_scale_with_board_height(self) -> None:
+        placement = compute_board_placement(
+            "a",
+            SlotCalibration(dx=0.5, dy=-0.5, rot_deg=90.0),
+            1.0,
+            width=200.0,
+            height=100.0,
+            board_height_pct=1.0,
+        )
+        self.assertAlmostEqual(placement.left, 100.0)
+        self.assertAlmostEqual(placement.top, -50.0)
+        self.assertAlmostEqual(placement.rotation, math.pi / 2)
+
+
+class LayoutPlacementTests(unittest.TestCase):
+    def test_missing_inputs_return_none(self) -> None:
+        self.assertIsNone(compute_layout_placement(None, ("a", "b"), 100.0, 50.0))
+        self.assertIsNone(compute_layout_placement("coastline_2p", ("a", None), 100.0, 50.0))
+        self.assertIsNone(compute_layout_placement("unknown_layout", ("a", "b"), 100.0, 50.0))
+
+    def test_placement_is_memoized(self) -> None:
+        layout_id = next(iter(load_layout_calibration()))
+        first = compute_layout_placement(layout_id, ("a", "b"), 188.0, 100.0)
+        second = compute_layout_placement(layout_id, ("a", "b"), 188.01, 100.0)
+        self.assertIsNotNone(first)
+        self.assertIs(first, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+from utils.lazy_list import is_near_end, next_window_size  # noqa: E402
+
+
+class LazyWindowTests(unittest.TestCase):
+    def test_window_grows_by_step_and_stops_at_total(self) -> None:
+        self.assertEqual(next_window_size(12, 40, step=12), 24)
+        self.assertEqual(next_window_size(36, 40, step=12), 40)
+        self.assertEqual(next_window_size(40, 40, step=12), 40)
+
+    def test_near_end_uses_remaining_extent(self) -> None:
+        self.assertTrue(is_near_end(900.0, 1200.0, threshold=400.0))
+        self.assertFalse(is_near_end(100.0, 1200.0, threshold=400.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+from screens.periods.periods_viewmodel import (  # noqa: E402
+    PERIOD_PREVIEW_INCURSION_FIELDS,
+    PERIOD_ROW_FIELDS,
+    PeriodsViewModel,
+)
+from services.firestore_records import IncursionDoc, PeriodDoc  # noqa: E402
+from services.firestore_service import FirestoreService  # noqa: E402
+
+
+class _Snapshot:
+    def __init__(self, doc_id: str, data: dict) -> None:
+        self.id = doc_id
+        self._data = data
+
+    def to_dict(self) -> dict:
+        return dict(self._data)
+
+
+class _Query:
+    def __init__(self, docs: dict[str, dict]) -> None:
+        self.docs = docs
+        self.selected: list[str] | None = None
+        self.ordered_by: str | None = None
+        self.last: int | None = None
+
+    def collection(self, name: str) -> "_Query":
+        return self
+
+    def document(self, doc_id: str) -> "_Query":
+        return self
+
+    def select(self, field_paths: list[str]) -> "_Query":
+        self.selected = field_paths
+        return self
+
+    def order_by(self, field_path: str) -> "_Query":
+        self.ordered_by = field_path
+        return self
+
+    def limit_to_last(self, count: int) -> "_Query":
+        self.last = count
+        return self
+
+    def get(self) -> list[_Snapshot]:
+        return list(self._snapshots())[-self.last :]
+
+    def stream(self):
+        if self.last is not None:
+            raise ValueError("limit_to_last queries cannot be streamed")
+        return self._snapshots()
+
+    def _snapshots(self):
+        items = self.docs.items()
+        if self.ordered_by is not None:
+            items = sorted(items, key=lambda item: item[1][self.ordered_by])
+        for doc_id, data in items:
+            if self.selected is not None:
+                data = {key: value for key, value in data.items() if key in self.selected}
+            yield _Snapshot(doc_id, data)
+
+
+def _service(query: _Query) -> FirestoreService:
+    service = FirestoreService.__new__(FirestoreService)
+    service.db = query
+    return service
+
+
+class ListProjectionTests(unittest.TestCase):
+    def test_projection_keeps_sort_key_and_id(self) -> None:
+        query = _Query(
+            {
+                "b": {"index": 2, "score": 10, "dahan_alive": 3},
+                "a": {"index": 1, "score": None, "dahan_alive": 5},
+            }
+        )
+        incursions = _service(query).list_incursions("era", "period", fields=("score",))
+
+        self.assertEqual(query.selected, ["index", "score"])
+        self.assertEqual(
+            incursions,
+            [IncursionDoc("a", index=1), IncursionDoc("b", index=2, score=10)],
+        )
+
+    def test_without_fields_full_documents_are_returned(self) -> None:
+        query = _Query({"p1": {"index": 1, "revealed_at": None}})
+        periods = _service(query).list_periods("era")
+
+        self.assertIsNone(query.selected)
+        self.assertEqual(periods, [PeriodDoc("p1", index=1)])
+
+    def test_sessions_are_streamed_in_server_order(self) -> None:
+        first = datetime(2026, 2, 18, 10, tzinfo=timezone.utc)
+        second = datetime(2026, 2, 18, 12, tzinfo=timezone.utc)
+        query = _Query(
+            {
+                "s2": {"started_at": second, "ended_at": None},
+                "s1": {"started_at": first, "ended_at": second},
+            }
+        )
+        sessions = _service(query).iter_sessions("era", "period", "incursion")
+
+        self.assertNotIsInstance(sessions, list)
+        self.assertEqual([session.id for session in sessions], ["s1", "s2"])
+        self.assertEqual(query.ordered_by, "started_at")
+
+    def test_unordered_sessions_include_legacy_documents(self) -> None:
+        query = _Query({"legacy": {"ended_at": None}})
+        sessions = list(
+            _service(query).iter_sessions("era", "period", "incursion", ordered=False)
+        )
+
+        self.assertEqual([session.id for session in sessions], ["legacy"])
+        self.assertIsNone(query.ordered_by)
+
+    def test_latest_session_uses_limit_to_last(self) -> None:
+        query = _Query(
+            {
+                "s1": {"started_at": datetime(2026, 2, 18, 10, tzinfo=timezone.utc)},
+                "s2": {"started_at": datetime(2026, 2, 18, 12, tzinfo=timezone.utc)},
+            }
+        )
+        sessions = list(
+            _service(query).iter_sessions(
+                "era", "period", "incursion", fields=(), limit_to_last=1
+            )
+        )
+
+        self.assertEqual([session.id for session in sessions], ["s2"])
+        self.assertEqual(query.selected, ["started_at"])
+
+    def test_periods_view_model_requests_declared_fields(self) -> None:
+        calls: list[tuple[str, tuple[str, ...] | None]] = []
+
+        class _Service:
+            def open_era(self, era_id):
+                calls.append(("open", None))
+
+            def list_periods(self, era_id, fields=None):
+                calls.append(("periods", fields))
+                return [PeriodDoc("p1", index=1, revealed_at=datetime.now(timezone.utc))]
+
+            def list_incursions(self, era_id, period_id, fields=None):
+                calls.append(("incursions", fields))
+                return []
+
+        view_model = PeriodsViewModel()
+        view_model.ensure_loaded(_Service(), "era")
+
+        self.assertEqual(
+            calls,
+            [
+                ("open", None),
+                ("periods", PERIOD_ROW_FIELDS),
+                ("incursions", PERIOD_PREVIEW_INCURSION_FIELDS),
+            ],
+        )
+        self.assertEqual(len(view_model.rows), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
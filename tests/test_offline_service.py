@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+from services.firestore_records import EraDoc, IncursionDoc, PeriodDoc  # noqa: E402
+from services.firestore_service import FirestoreService  # noqa: E402
+from services.local_store import LocalStore  # noqa: E402
+from services.offline_service import OfflineFirstService  # noqa: E402
+
+REVEALED = datetime(2026, 2, 18, 10, tzinfo=timezone.utc)
+
+
+class _Remote(FirestoreService):
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict]] = []
+        self.offline = False
+        self.reject: str | None = None
+
+    def get_era(self, era_id):
+        return EraDoc(era_id, is_active=True)
+
+    def list_periods(self, era_id, fields=None):
+        return [
+            PeriodDoc("p1", index=1, revealed_at=REVEALED, adversaries_assigned_at=REVEALED),
+            PeriodDoc("p2", index=2),
+        ]
+
+    def list_incursions(self, era_id, period_id, fields=None):
+        if period_id != "p1":
+            return []
+        return [
+            IncursionDoc(
+                f"i{index}",
+                index=index,
+                adversary_id=f"adv{index}",
+                adversary_level="1",
+                difficulty=2,
+            )
+            for index in range(1, 5)
+        ]
+
+    def iter_sessions(
+        self, era_id, period_id, incursion_id, fields=None, limit_to_last=None, ordered=True
+    ):
+        return iter(())
+
+    def _record(self, name: str, **kwargs) -> None:
+        if self.offline:
+            raise ConnectionError("offline")
+        if self.reject == name:
+            raise ValueError("conflict")
+        self.calls.append((name, kwargs))
+
+    def start_session(self, **kwargs):
+        self._record("start_session", **kwargs)
+
+    def end_session(self, **kwargs):
+        self._record("end_session", **kwargs)
+
+
+class OfflineFirstServiceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.store_path = Path(self.tmp.name) / "local.sqlite3"
+        self.remote = _Remote()
+        self.store = LocalStore(self.store_path)
+        self.service = OfflineFirstService(self.remote, self.store)
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_mutations_apply_locally_and_survive_restart(self) -> None:
+        self.service.mirror_era("era")
+        self.remote.offline = True
+
+        self.service.start_session("era", "p1", "i1")
+        sessions = list(self.service.iter_sessions("era", "p1", "i1"))
+        self.assertEqual(len(sessions), 1)
+        self.assertIsNone(sessions[0].ended_at)
+        active = self.service.get_active_incursion("era")
+        self.assertEqual((active.period_id, active.incursion_id), ("p1", "i1"))
+
+        self.assertEqual(self.service.sync_once(), 0)
+        self.store.close()
+        self.store = LocalStore(self.store_path)
+        restarted = OfflineFirstService(self.remote, self.store)
+        self.assertEqual([m.kind for m in self.store.pending_mutations()], ["start_session"])
+
+        self.remote.offline = False
+        retry_at = self.store.pending_mutations()[0].next_attempt_at
+        self.assertEqual(restarted.sync_once(now=retry_at), 1)
+        name, kwargs = self.remote.calls[0]
+        self.assertEqual(name, "start_session")
+        self.assertEqual(kwargs["session_id"], sessions[0].id)
+        self.assertEqual(kwargs["at"], sessions[0].started_at)
+        self.assertEqual(self.store.pending_mutations(), [])
+
+    def test_local_rules_reject_second_open_session(self) -> None:
+        self.service.start_session("era", "p1", "i1")
+        with self.assertRaisesRegex(ValueError, "incursion activa"):
+            self.service.start_session("era", "p1", "i2")
+        with self.assertRaisesRegex(ValueError, "sesión abierta"):
+            self.service.start_session("era", "p1", "i1")
+
+    def test_conflict_parks_mutation_and_refreshes_era(self) -> None:
+        conflicts = []
+        self.service.add_conflict_listener(conflicts.append)
+        self.service.start_session("era", "p1", "i1")
+        self.remote.reject = "start_session"
+
+        self.assertEqual(self.service.sync_once(), 0)
+
+        self.assertEqual(
+            [(item.era_id, item.kind, item.message) for item in conflicts],
+            [("era", "start_session", "conflict")],
+        )
+
+        self.assertEqual(self.store.pending_mutations(), [])
+        self.assertEqual(list(self.service.iter_sessions("era", "p1", "i1")), [])
+        self.assertIsNone(self.service.get_active_incursion("era"))
+
+    def test_refresh_keeps_mutation_queued_during_fan_out(self) -> None:
+        self.service.mirror_era("era")
+        list_periods = self.remote.list_periods
+
+        def list_periods_while_tapping(era_id, fields=None):
+            self.service.start_session("era", "p1", "i1")
+            return list_periods(era_id, fields)
+
+        self.remote.list_periods = list_periods_while_tapping
+        self.remote.offline = True
+        self.service._schedule_refresh("era")
+
+        self.service.sync_once()
+
+        self.assertEqual(len(list(self.service.iter_sessions("era", "p1", "i1"))), 1)
+        self.assertEqual(self.service._refresh_era_ids, {"era"})
+
+    def test_start_session_carries_buffered_level(self) -> None:
+        self.service.start_session("era", "p1", "i1", adversary_level="3", difficulty=5)
+
+        incursion = next(
+            item for item in self.service.list_incursions("era", "p1") if item.id == "i1"
+        )
+        self.assertEqual((incursion.adversary_level, incursion.difficulty), ("3", 5))
+        args = self.store.pending_mutations()[0].args
+        self.assertEqual((args["adversary_level"], args["difficulty"]), ("3", 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
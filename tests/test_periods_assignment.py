@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+from screens.periods.periods_model import (  # noqa: E402
+    available_adversary_ids,
+    collect_taken_adversaries,
+)
+from screens.periods.periods_viewmodel import PeriodsViewModel  # noqa: E402
+
+
+class AssignmentAvailabilityTests(unittest.TestCase):
+    def test_taken_adversaries_skip_empty_selections(self) -> None:
+        taken = collect_taken_adversaries({"i1": "prussia", "i2": None, "i3": ""})
+        self.assertEqual(taken, frozenset({"prussia"}))
+
+    def test_available_ids_keep_own_selection(self) -> None:
+        catalog = ["england", "prussia", "sweden"]
+        taken = frozenset({"prussia", "sweden"})
+        self.assertEqual(
+            available_adversary_ids(catalog, taken, "sweden"),
+            ["england", "sweden"],
+        )
+        self.assertEqual(available_adversary_ids(catalog, taken, None), ["england"])
+
+    def test_selection_updates_taken_set_and_clears_error(self) -> None:
+        view_model = PeriodsViewModel()
+        view_model.assignment_selections = {"i1": None, "i2": None}
+        view_model.assignment_errors = {"i1": True, "i2": True}
+        self.assertTrue(view_model.set_assignment_selection("i1", "prussia"))
+        self.assertFalse(view_model.set_assignment_selection("i1", "prussia"))
+        self.assertEqual(view_model.assignment_taken, frozenset({"prussia"}))
+        self.assertEqual(dict(view_model.assignment_errors), {"i2": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
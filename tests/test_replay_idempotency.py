@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+from firebase_admin import firestore  # noqa: E402
+from services.firestore_service import FirestoreService  # noqa: E402
+from services.local_store import LocalStore  # noqa: E402
+from services.offline_service import OfflineFirstService  # noqa: E402
+
+REVEALED = datetime(2026, 2, 18, 10, tzinfo=timezone.utc)
+STARTED = datetime(2026, 2, 18, 11, tzinfo=timezone.utc)
+FINISHED = datetime(2026, 2, 18, 13, tzinfo=timezone.utc)
+
+
+class _Snapshot:
+    def __init__(self, reference: "_Document", data: dict | None) -> None:
+        self.id = reference.id
+        self.reference = reference
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self) -> dict | None:
+        return dict(self._data) if self._data is not None else None
+
+
+class _Document:
+    def __init__(self, db: "_MemoryDb", path: str) -> None:
+        self.db = db
+        self.path = path
+        self.id = path.rsplit("/", 1)[1]
+
+    def collection(self, name: str) -> "_Collection":
+        return _Collection(self.db, f"{self.path}/{name}")
+
+    def get(self, field_paths=None) -> _Snapshot:
+        return _Snapshot(self, self.db.docs.get(self.path))
+
+    def update(self, data: dict) -> None:
+        self.db.write([("update", self.path, data)])
+
+    def set(self, data: dict) -> None:
+        self.db.write([("set", self.path, data)])
+
+
+class _Collection:
+    def __init__(self, db: "_MemoryDb", path: str) -> None:
+        self.db = db
+        self.path = path
+        self.filters: list[tuple[str, object]] = []
+        self.max_count: int | None = None
+
+    def document(self, doc_id: str) -> _Document:
+        return _Document(self.db, f"{self.path}/{doc_id}")
+
+    def select(self, field_paths) -> "_Collection":
+        return self
+
+    def order_by(self, field_path, direction=None) -> "_Collection":
+        return self
+
+    def where(self, field: str, op: str, value) -> "_Collection":
+        self.filters.append((field, value))
+        return self
+
+    def limit(self, count: int) -> "_Collection":
+        self.max_count = count
+        return self
+
+    def stream(self):
+        prefix = f"{self.path}/"
+        matches = [
+            _Snapshot(_Document(self.db, path), data)
+            for path, data in sorted(self.db.docs.items())
+            if path.startswith(prefix)
+            and "/" not in path[len(prefix) :]
+            and all(field in data and data[field] == value for field, value in self.filters)
+        ]
+        return iter(matches[: self.max_count])
+
+
+class _Batch:
+    def __init__(self, db: "_MemoryDb") -> None:
+        self.db = db
+        self.writes: list[tuple[str, str, dict]] = []
+
+    def update(self, reference: _Document, data: dict) -> None:
+        self.writes.append(("update", reference.path, data))
+
+    def set(self, reference: _Document, data: dict) -> None:
+        self.writes.append(("set", reference.path, data))
+
+    def commit(self) -> None:
+        self.db.write(self.writes)
+        self.db.commits += 1
+        if self.db.lose_next_ack:
+            self.db.lose_next_ack = False
+            raise ConnectionError("response lost after commit")
+
+
+class _MemoryDb:
+    def __init__(self) -> None:
+        self.docs: dict[str, dict] = {}
+        self.commits = 0
+        self.lose_next_ack = False
+
+    def collection(self, name: str) -> _Collection:
+        return _Collection(self, name)
+
+    def batch(self) -> _Batch:
+        return _Batch(self)
+
+    def write(self, writes: list[tuple[str, str, dict]]) -> None:
+        for kind, path, data in writes:
+            current = {} if kind == "set" else dict(self.docs[path])
+            for key, value in data.items():
+                if value is firestore.DELETE_FIELD:
+                    current.pop(key, None)
+                else:
+                    current[key] = value
+            self.docs[path] = current
+
+
+def _seed(db: _MemoryDb) -> None:
+    db.docs["eras/era"] = {"is_active": True}
+    db.docs["eras/era/periods/p1"] = {
+        "index": 1,
+        "revealed_at": REVEALED,
+        "adversaries_assigned_at": REVEALED,
+        "ended_at": None,
+    }
+    for index in range(1, 5):
+        db.docs[f"eras/era/periods/p1/incursions/i{index}"] = {
+            "index": index,
+            "adversary_id": f"adv{index}",
+            "adversary_level": "1",
+            "difficulty": 2,
+            "ended_at": None,
+        }
+
+
+class ReplayIdempotencyTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.db = _MemoryDb()
+        _seed(self.db)
+        remote = FirestoreService.__new__(FirestoreService)
+        remote.db = self.db
+        self.store = LocalStore()
+        self.service = OfflineFirstService(remote, self.store)
+        self.conflicts: list = []
+        self.service.add_conflict_listener(self.conflicts.append)
+        self.service.open_era("era")
+
+    def tearDown(self) -> None:
+        self.store.close()
+
+    def _sessions(self) -> dict[str, dict]:
+        prefix = "eras/era/periods/p1/incursions/i1/sessions/"
+        return {
+            path: data for path, data in self.db.docs.items() if path.startswith(prefix)
+        }
+
+    def _replay_with_lost_ack(self) -> None:
+        self.db.lose_next_ack = True
+        self.assertEqual(self.service.replay_pending(now=0), 0)
+        self.assertEqual(len(self.store.pending_mutations()), 1)
+        self.assertEqual(self.service.replay_pending(now=1000), 1)
+
+    def test_start_session_retry_after_landed_commit_is_not_a_conflict(self) -> None:
+        self.service.start_session("era", "p1", "i1", at=STARTED)
+
+        self._replay_with_lost_ack()
+
+        self.assertEqual(self.conflicts, [])
+        self.assertEqual(self.store.pending_mutations(), [])
+        self.assertEqual(self.db.commits, 1)
+        self.assertEqual(
+            list(self._sessions().values()), [{"started_at": STARTED, "ended_at": None}]
+        )
+        self.assertEqual(self.db.docs["eras/era"]["active_incursion_id"], "p1::i1")
+
+    def test_finalize_retry_after_landed_commit_is_not_a_conflict(self) -> None:
+        self.service.start_session("era", "p1", "i1", at=STARTED)
+        self.service.replay_pending(now=0)
+        self.service.finalize_incursion(
+            "era",
+            "p1",
+            "i1",
+            result="win",
+            dahan_alive=4,
+            blight_on_island=1,
+            invader_cards_remaining=2,
+            at=FINISHED,
+        )
+
+        self._replay_with_lost_ack()
+
+        self.assertEqual(self.conflicts, [])
+        self.assertEqual(self.store.pending_mutations(), [])
+        self.assertEqual(self.db.commits, 2)
+        incursion = self.db.docs["eras/era/periods/p1/incursions/i1"]
+        self.assertEqual((incursion["ended_at"], incursion["result"]), (FINISHED, "win"))
+        self.assertEqual(
+            [data["ended_at"] for data in self._sessions().values()], [FINISHED]
+        )
+        self.assertNotIn("active_incursion_id", self.db.docs["eras/era"])
+
+    def test_finalize_by_someone_else_is_still_a_conflict(self) -> None:
+        self.service.finalize_incursion(
+            "era",
+            "p1",
+            "i1",
+            result="loss",
+            dahan_alive=1,
+            blight_on_island=3,
+            invader_cards_out_of_deck=2,
+            at=FINISHED,
+        )
+        self.db.docs["eras/era/periods/p1/incursions/i1"]["ended_at"] = STARTED
+
+        self.service.replay_pending(now=0)
+
+        self.assertEqual([conflict.kind for conflict in self.conflicts], ["finalize_incursion"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+from utils.resize_broker import (  # noqa: E402
+    ResizeBroker,
+    ViewportSize,
+    quantize,
+)
+
+
+class _FakePage:
+    def __init__(self) -> None:
+        self.width = 800.0
+        self.height = 600.0
+        self.on_resize = None
+        self.tasks: list = []
+
+    def run_task(self, handler) -> None:
+        self.tasks.append(handler)
+
+
+class BucketHelperTests(unittest.TestCase):
+    def test_quantize_floors_to_step(self) -> None:
+        self.assertEqual(quantize(1013.7, 16.0), 1008.0)
+        self.assertEqual(quantize(-5.0, 16.0), 0.0)
+        self.assertEqual(quantize(12.5, 0.0), 12.5)
+
+
+class ResizeBrokerTests(unittest.TestCase):
+    def test_resize_burst_schedules_single_flush(self) -> None:
+        page = _FakePage()
+        broker = ResizeBroker(page)
+        self.assertEqual(page.on_resize, broker.handle_resize)
+        for width in (810.0, 820.0, 830.0):
+            broker.handle_resize(ViewportSize(width=width, height=600.0))
+        self.assertEqual(len(page.tasks), 1)
+
+    def test_publish_skips_unchanged_size(self) -> None:
+        broker = ResizeBroker(_FakePage())
+        received: list[ViewportSize] = []
+        unsubscribe = broker.subscribe(received.append)
+        broker.publish(ViewportSize(width=800.0, height=600.0))
+        broker.publish(ViewportSize(width=1024.0, height=600.0))
+        unsubscribe()
+        broker.publish(ViewportSize(width=1280.0, height=600.0))
+        self.assertEqual(received, [ViewportSize(width=1024.0, height=600.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
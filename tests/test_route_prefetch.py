@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+from screens.eras.eras_viewmodel import ErasViewModel  # noqa: E402
+from screens.prefetch import RoutePrefetcher  # noqa: E402
+from services.firestore_records import IncursionDoc, PeriodDoc  # noqa: E402
+from services.firestore_service import ActiveIncursion  # noqa: E402
+from services.snapshot_store import SnapshotStore  # noqa: E402
+
+DETAIL_ROUTE = "/eras/era/periods/p1/incursions/i1"
+PERIOD_ROUTE = "/eras/era/periods/p1"
+
+
+class _Service:
+    def __init__(self) -> None:
+        self.reads: list[str] = []
+
+    def list_periods(self, era_id, fields=None):
+        self.reads.append("list_periods")
+        return [PeriodDoc("p1", index=1)]
+
+    def list_incursions(self, era_id, period_id, fields=None):
+        self.reads.append("list_incursions")
+        return [IncursionDoc("i1", index=1, is_active=True)]
+
+    def iter_sessions(
+        self, era_id, period_id, incursion_id, fields=None, limit_to_last=None, ordered=True
+    ):
+        self.reads.append("iter_sessions")
+        return iter(())
+
+    def start_session(self, *args, **kwargs):
+        raise AssertionError("prefetch must not write")
+
+
+class RoutePrefetchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.service = _Service()
+        self.snapshots = SnapshotStore()
+
+    def _prefetcher(self, budget: int = 8) -> RoutePrefetcher:
+        return RoutePrefetcher(self.service, self.snapshots, read_budget=budget, idle_seconds=0)
+
+    def test_eras_suggest_active_incursion_first(self) -> None:
+        view_model = ErasViewModel()
+        self.assertEqual(view_model.prefetch_routes(), [])
+
+        class _Card:
+            active_incursion = ActiveIncursion("era", "p1", "i1")
+
+        view_model.eras = [_Card()]
+        self.assertEqual(
+            view_model.prefetch_routes(), [DETAIL_ROUTE, PERIOD_ROUTE, "/eras/era"]
+        )
+
+    def test_prefetch_warms_snapshots_for_candidates(self) -> None:
+        self._prefetcher().schedule([DETAIL_ROUTE, PERIOD_ROUTE])
+
+        detail, sessions, _ = self.snapshots.get(DETAIL_ROUTE)
+        self.assertEqual(detail.incursion_id, "i1")
+        self.assertEqual(sessions, [])
+        cards = self.snapshots.get(PERIOD_ROUTE)
+        self.assertTrue(cards[0].is_active)
+
+    def test_read_budget_stops_prefetch(self) -> None:
+        self._prefetcher(budget=2).schedule([DETAIL_ROUTE, PERIOD_ROUTE])
+
+        self.assertEqual(self.service.reads, ["list_incursions", "list_periods"])
+        self.assertIsNone(self.snapshots.get(DETAIL_ROUTE))
+        self.assertIsNone(self.snapshots.get(PERIOD_ROUTE))
+
+    def test_budget_counts_returned_documents(self) -> None:
+        self.service.list_incursions = lambda era_id, period_id, fields=None: [
+            IncursionDoc(f"i{index}", index=index) for index in range(1, 5)
+        ]
+
+        self._prefetcher(budget=3).schedule([PERIOD_ROUTE])
+
+        self.assertIsNone(self.snapshots.get(PERIOD_ROUTE))
+        self._prefetcher(budget=4).schedule([PERIOD_ROUTE])
+        self.assertEqual(len(self.snapshots.get(PERIOD_ROUTE)), 4)
+
+    def test_unmirrored_eras_are_not_prefetched(self) -> None:
+        mirrored: dict[str, float] = {}
+
+        class _Store:
+            def mirrored_at(self, era_id):
+                return mirrored.get(era_id)
+
+        self.service.store = _Store()
+        self._prefetcher().schedule([DETAIL_ROUTE, PERIOD_ROUTE])
+        self.assertEqual(self.service.reads, [])
+
+        mirrored["era"] = 1.0
+        self._prefetcher().schedule([PERIOD_ROUTE])
+        self.assertEqual(self.service.reads, ["list_incursions"])
+
+    def test_navigation_cancels_pending_prefetch(self) -> None:
+        queued: list = []
+        prefetcher = self._prefetcher()
+        prefetcher.schedule([PERIOD_ROUTE], lambda handler, *args: queued.append((handler, args)))
+
+        prefetcher.cancel()
+        handler, args = queued.pop()
+        handler(*args)
+
+        self.assertEqual(self.service.reads, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
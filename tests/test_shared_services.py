@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+import services.service_registry as service_registry  # noqa: E402
+from services.firestore_records import EraDoc, IncursionDoc, PeriodDoc  # noqa: E402
+from services.firestore_service import FirestoreService  # noqa: E402
+from services.local_store import LocalStore  # noqa: E402
+from services.offline_service import OfflineFirstService  # noqa: E402
+from services.snapshot_store import SnapshotStore  # noqa: E402
+
+REVEALED = datetime(2026, 2, 18, 10, tzinfo=timezone.utc)
+
+
+class _Remote(FirestoreService):
+    def __init__(self) -> None:
+        self.reads: list[str] = []
+        self.projections: list[tuple[str, tuple[str, ...] | None]] = []
+        self.delay = 0.0
+
+    def list_eras(self, limit=None, start_after=None, fields=None):
+        self.reads.append("list_eras")
+        return [EraDoc("era", is_active=True)]
+
+    def get_era(self, era_id):
+        self.reads.append("get_era")
+        time.sleep(self.delay)
+        return EraDoc(era_id, is_active=True)
+
+    def list_periods(self, era_id, fields=None):
+        self.projections.append(("list_periods", fields))
+        return [PeriodDoc("p1", index=1, revealed_at=REVEALED, adversaries_assigned_at=REVEALED)]
+
+    def list_incursions(self, era_id, period_id, fields=None):
+        self.projections.append(("list_incursions", fields))
+        return [
+            IncursionDoc(
+                f"i{index}",
+                index=index,
+                adversary_id=f"adv{index}",
+                adversary_level="1",
+                difficulty=2,
+            )
+            for index in range(1, 5)
+        ]
+
+    def iter_sessions(
+        self, era_id, period_id, incursion_id, fields=None, limit_to_last=None, ordered=True
+    ):
+        return iter(())
+
+
+class SharedServicesTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.remote = _Remote()
+        self.store = LocalStore()
+        self.service = OfflineFirstService(self.remote, self.store)
+
+    def tearDown(self) -> None:
+        service_registry._shared_services = None
+        self.store.close()
+
+    def test_sessions_attach_to_one_process_wide_bundle(self) -> None:
+        built: list[service_registry.SharedServices] = []
+
+        def factory() -> service_registry.SharedServices:
+            time.sleep(0.01)
+            built.append(service_registry.SharedServices(self.service, SnapshotStore()))
+            return built[-1]
+
+        sessions = [SimpleNamespace() for _ in range(4)]
+        threads = [
+            threading.Thread(
+                target=service_registry.attach_session_services, args=(session, factory)
+            )
+            for session in sessions
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(built), 1)
+        for session in sessions:
+            self.assertIs(service_registry.get_firestore_service(session), self.service)
+            self.assertIs(service_registry.get_snapshot_store(session), built[0].snapshots)
+
+    def test_concurrent_sessions_share_one_mirror_pass(self) -> None:
+        self.remote.delay = 0.05
+        threads = [
+            threading.Thread(target=self.service.open_era, args=("era",))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.remote.reads, ["get_era"])
+
+    def test_summary_reads_skip_the_mirror_until_the_era_is_opened(self) -> None:
+        self.service.list_periods("era", fields=("index",))
+        self.service.list_incursions("era", "p1", fields=("ended_at",))
+
+        self.assertIsNone(self.store.mirrored_at("era"))
+        self.assertEqual(
+            self.remote.projections,
+            [("list_periods", ("index",)), ("list_incursions", ("ended_at",))],
+        )
+
+        self.service.open_era("era")
+        self.remote.projections.clear()
+        self.assertEqual(len(self.service.list_incursions("era", "p1")), 4)
+        self.assertEqual(self.remote.projections, [])
+
+    def test_era_list_is_shared_until_a_local_write(self) -> None:
+        self.service.list_eras(limit=20)
+        self.service.list_eras(limit=20)
+        self.assertEqual(self.remote.reads, ["list_eras"])
+
+        self.service.start_session("era", "p1", "i1")
+        eras = self.service.list_eras(limit=20)
+
+        self.assertEqual(self.remote.reads.count("list_eras"), 2)
+        self.assertIsNotNone(eras[0].active_incursion_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import pickle
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "app"))
+
+from screens.eras.eras_viewmodel import ERAS_ROUTE, ErasViewModel  # noqa: E402
+from services.firestore_records import EraDoc  # noqa: E402
+from services.snapshot_store import SnapshotStore  # noqa: E402
+
+
+class _Service:
+    def __init__(self, era_ids: list[str]) -> None:
+        self.era_ids = era_ids
+        self.offline = False
+
+    def list_eras(self, limit=None, start_after=None):
+        if self.offline:
+            raise ConnectionError("offline")
+        return [EraDoc(era_id, is_active=True) for era_id in self.era_ids]
+
+    def active_incursion_from_era(self, era):
+        return None
+
+    def list_periods(self, era_id, fields=None):
+        return []
+
+    def list_incursions(self, era_id, period_id, fields=None):
+        return []
+
+
+class SnapshotStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "snapshots.pickle"
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_snapshots_survive_restart_and_skip_unchanged_writes(self) -> None:
+        store = SnapshotStore(self.path)
+        self.assertTrue(store.put("/eras", ["a"]))
+        written_at = self.path.stat().st_mtime_ns
+
+        self.assertFalse(store.put("/eras", ["a"]))
+        self.assertEqual(self.path.stat().st_mtime_ns, written_at)
+        self.assertEqual(SnapshotStore(self.path).get("/eras"), ["a"])
+
+    def test_oldest_routes_are_evicted(self) -> None:
+        store = SnapshotStore(self.path, max_routes=2)
+        for route in ("/a", "/b", "/c"):
+            store.put(route, route)
+
+        restored = SnapshotStore(self.path)
+        self.assertIsNone(restored.get("/a"))
+        self.assertEqual(restored.get("/c"), "/c")
+
+    def test_other_versions_and_corrupt_files_are_ignored(self) -> None:
+        self.path.write_bytes(pickle.dumps({"version": -1, "routes": {"/eras": 1}}))
+        self.assertIsNone(SnapshotStore(self.path).get("/eras"))
+
+        self.path.write_bytes(b"not a pickle")
+        self.assertIsNone(SnapshotStore(self.path).get("/eras"))
+
+    def test_view_model_renders_snapshot_then_revalidates(self) -> None:
+        service = _Service(["e1"])
+        first = ErasViewModel()
+        first.restore_snapshot(SnapshotStore(self.path))
+        self.assertTrue(first.loading)
+        first.load_eras(service)
+
+        view_model = ErasViewModel()
+        view_model.restore_snapshot(SnapshotStore(self.path))
+        cached = view_model.eras
+        self.assertFalse(view_model.loading)
+        self.assertEqual([card.era_id for card in cached], ["e1"])
+
+        view_model.load_eras(service)
+        self.assertIs(view_model.eras, cached)
+
+        service.offline = True
+        view_model.load_eras(service)
+        self.assertIs(view_model.eras, cached)
+        self.assertIsNone(view_model.error)
+
+        service.offline = False
+        service.era_ids = ["e1", "e2"]
+        view_model.load_eras(service)
+        self.assertEqual([card.era_id for card in view_model.eras], ["e1", "e2"])
+        stored_cards, _ = SnapshotStore(self.path).get(ERAS_ROUTE)
+        self.assertEqual(stored_cards, view_model.eras)
+
+
+if __name__ == "__main__":
+    unittest.main()
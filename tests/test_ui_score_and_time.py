@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import sys
 import unittest
+from datetime import datetime, timezone
 from pathlib import Path
 
 
@@ -18,6 +19,7 @@ from screens.periods.periods_model import (  # noqa: E402
     build_period_rows,
     compute_score_summary,
 )
+from services.firestore_records import IncursionDoc, PeriodDoc  # noqa: E402
 
 
 class DurationFormatTests(unittest.TestCase):
@@ -29,18 +31,18 @@ class DurationFormatTests(unittest.TestCase):
 
 class IncursionScoreLabelTests(unittest.TestCase):
     def test_get_score_label(self) -> None:
-        self.assertEqual(get_score_label({"score": 42}), "42")
-        self.assertEqual(get_score_label({"score": None}), "—")
-        self.assertEqual(get_score_label({}), "—")
+        self.assertEqual(get_score_label(IncursionDoc("i01", score=42)), "42")
+        self.assertEqual(get_score_label(IncursionDoc("i01", score=None)), "—")
+        self.assertEqual(get_score_label(IncursionDoc.from_data("i01", {})), "—")
 
 
 class PeriodScoreSummaryTests(unittest.TestCase):
     def test_compute_score_summary_partial(self) -> None:
         incursions = [
-            {"id": "i01", "score": 15},
-            {"id": "i02"},
-            {"id": "i03", "score": 25},
-            {"id": "i04", "score": None},
+            IncursionDoc("i01", score=15),
+            IncursionDoc("i02"),
+            IncursionDoc("i03", score=25),
+            IncursionDoc("i04", score=None),
         ]
         score_total, completed_incursions, score_average = compute_score_summary(
             incursions
@@ -51,13 +53,13 @@ class PeriodScoreSummaryTests(unittest.TestCase):
 
     def test_build_period_rows_includes_score_metrics(self) -> None:
         periods = [
-            {"id": "p01", "index": 1, "revealed_at": "2026-02-18T00:00:00Z"},
+            PeriodDoc("p01", index=1, revealed_at=datetime(2026, 2, 18, tzinfo=timezone.utc)),
         ]
         incursions_by_period = {
             "p01": [
-                {"id": "i01", "index": 1, "spirit_1_id": "s1", "spirit_2_id": "s2", "score": 10},
-                {"id": "i02", "index": 2, "spirit_1_id": "s3", "spirit_2_id": "s4"},
-                {"id": "i03", "index": 3, "spirit_1_id": "s5", "spirit_2_id": "s6", "score": 20},
+                IncursionDoc("i01", index=1, spirit_1_id="s1", spirit_2_id="s2", score=10),
+                IncursionDoc("i02", index=2, spirit_1_id="s3", spirit_2_id="s4"),
+                IncursionDoc("i03", index=3, spirit_1_id="s5", spirit_2_id="s6", score=20),
             ]
         }
         rows = build_period_rows(periods, incursions_by_period)
@@ -72,12 +74,12 @@ class EraScoreSummaryTests(unittest.TestCase):
     def test_compute_era_score_summary_multi_period(self) -> None:
         incursions_by_period = {
             "p01": [
-                {"id": "i01", "score": 10},
-                {"id": "i02"},
+                IncursionDoc("i01", score=10),
+                IncursionDoc("i02"),
             ],
             "p02": [
-                {"id": "i03", "score": 20},
-                {"id": "i04", "score": 30},
+                IncursionDoc("i03", score=20),
+                IncursionDoc("i04", score=30),
             ],
         }
         score_total, completed_incursions, score_average = compute_era_score_summary(
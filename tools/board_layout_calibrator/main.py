@@ -3,7 +3,7 @@ from __future__ import annotations
 import csv
 import json
 import math
-import struct
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -14,6 +14,15 @@ import flet as ft
 ASSETS_DIR = Path(__file__).resolve().parent / "assets"
 CALIBRATION_PATH = Path(__file__).resolve().parent / "calibration.json"
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(PROJECT_ROOT / "app"))
+
+from screens.layout_geometry import (  # noqa: E402
+    SlotCalibration,
+    compute_board_placement,
+    get_board_aspect,
+    safe_float,
+)
+
 PC_LAYOUTS_TSV_PATH = PROJECT_ROOT / "pc" / "data" / "input" / "layouts.tsv"
 BOARD_IDS = ["a", "b", "c", "d"]
 VIEWPORT_ASPECT_RATIO = 16 / 9
@@ -59,30 +68,6 @@ class SliderInputControl:
     decimals: int
 
 
-def _safe_float(value: Any, default: float) -> float:
-    try:
-        return float(value)
-    except (TypeError, ValueError):
-        return default
-
-
-def _read_png_size(path: Path) -> tuple[int, int]:
-    if not path.exists():
-        return (1, 1)
-
-    with path.open("rb") as file:
-        header = file.read(24)
-
-    png_sig = b"\x89PNG\r\n\x1a\n"
-    if len(header) < 24 or header[:8] != png_sig:
-        return (1, 1)
-
-    width, height = struct.unpack(">II", header[16:24])
-    if width <= 0 or height <= 0:
-        return (1, 1)
-    return width, height
-
-
 def _load_layout_ids_from_pc_tsv() -> list[str]:
     if not PC_LAYOUTS_TSV_PATH.exists():
         return []
@@ -553,7 +538,7 @@ class BoardLayoutCalibrator:
     ) -> None:
         if self._syncing_editor_values:
             return
-        raw_value = _safe_float(event.control.value, self._get_slot_value(slot, key))
+        raw_value = safe_float(event.control.value, self._get_slot_value(slot, key))
         self._set_slot_value(slot, key, raw_value)
         self._refresh_preview(update=True)
 
@@ -571,7 +556,7 @@ class BoardLayoutCalibrator:
     def _on_group_slider_change(self, key: str, event: ft.ControlEvent) -> None:
         if self._syncing_editor_values:
             return
-        raw_value = _safe_float(event.control.value, self.group_deltas[key])
+        raw_value = safe_float(event.control.value, self.group_deltas[key])
         self.group_deltas[key] = self._normalize_slot_value(key, raw_value)
         self._sync_group_editor_controls(update=True)
 
@@ -709,7 +694,7 @@ class BoardLayoutCalibrator:
 
     def _get_slot_value(self, slot: str, key: str) -> float:
         transform = self._active_slot_transform(slot)
-        return _safe_float(getattr(transform, key, 0.0), 0.0)
+        return safe_float(getattr(transform, key, 0.0), 0.0)
 
     def _set_slot_value(self, slot: str, key: str, value: float) -> None:
         transform = self._active_slot_transform(slot)
@@ -717,22 +702,21 @@ class BoardLayoutCalibrator:
 
     @property
     def board_height_pct(self) -> float:
-        value = _safe_float(
+        value = safe_float(
             self.board_size_slider.value, DEFAULT_BOARD_HEIGHT_PCT * 100
         )
         return value / 100.0
 
     @property
     def guide_opacity(self) -> float:
-        value = _safe_float(self.guide_opacity_slider.value, DEFAULT_GUIDE_OPACITY_PCT)
+        value = safe_float(self.guide_opacity_slider.value, DEFAULT_GUIDE_OPACITY_PCT)
         return max(0.0, min(1.0, value / 100.0))
 
     def _load_board_aspects(self) -> dict[str, float]:
-        aspects: dict[str, float] = {}
-        for board_id in BOARD_IDS:
-            width, height = _read_png_size(ASSETS_DIR / "boards" / f"{board_id}.png")
-            aspects[board_id] = width / height if height else 1.0
-        return aspects
+        return {
+            board_id: get_board_aspect(board_id, ASSETS_DIR / "boards") or 1.0
+            for board_id in BOARD_IDS
+        }
 
     def _active_slot_transform(self, slot: str) -> SlotTransform:
         return self.left_transform if slot == "left" else self.right_transform
@@ -878,28 +862,25 @@ class BoardLayoutCalibrator:
         )
         board_id = board_id if board_id in BOARD_IDS else BOARD_IDS[0]
 
-        board_aspect = self.board_aspects.get(board_id, 1.0)
-        board_base_height_px = self.viewport_height * self.board_height_pct
-
-        translate_x_px = transform.dx * board_base_height_px
-        translate_y_px = transform.dy * board_base_height_px
-
-        board_height_px = board_base_height_px
-        board_width_px = board_height_px * board_aspect
-
-        center_x = (self.viewport_width / 2) + translate_x_px
-        center_y = (self.viewport_height / 2) + translate_y_px
+        placement = compute_board_placement(
+            board_id,
+            SlotCalibration(
+                dx=transform.dx, dy=transform.dy, rot_deg=transform.rot_deg
+            ),
+            self.board_aspects.get(board_id, 1.0),
+            self.viewport_width,
+            self.viewport_height,
+            self.board_height_pct,
+        )
 
         return ft.Image(
             src=f"boards/{board_id}.png",
             fit=ft.BoxFit.CONTAIN,
-            width=board_width_px,
-            height=board_height_px,
-            left=center_x - (board_width_px / 2),
-            top=center_y - (board_height_px / 2),
-            rotate=ft.Rotate(
-                angle=math.radians(transform.rot_deg), alignment=CENTER_ALIGN
-            ),
+            width=placement.width,
+            height=placement.height,
+            left=placement.left,
+            top=placement.top,
+            rotate=ft.Rotate(angle=placement.rotation, alignment=CENTER_ALIGN),
         )
 
     def _build_grid_controls(self) -> list[ft.Control]:
@@ -1070,13 +1051,13 @@ class BoardLayoutCalibrator:
         slot = SlotTransform(**defaults)
         if isinstance(raw_slot, dict):
             slot.dx = self._normalize_slot_value(
-                "dx", _safe_float(raw_slot.get("dx"), slot.dx)
+                "dx", safe_float(raw_slot.get("dx"), slot.dx)
             )
             slot.dy = self._normalize_slot_value(
-                "dy", _safe_float(raw_slot.get("dy"), slot.dy)
+                "dy", safe_float(raw_slot.get("dy"), slot.dy)
             )
             slot.rot_deg = self._normalize_slot_value(
-                "rot_deg", _safe_float(raw_slot.get("rot_deg"), slot.rot_deg)
+                "rot_deg", safe_float(raw_slot.get("rot_deg"), slot.rot_deg)
             )
         return slot
 